@@ -0,0 +1,89 @@
+# Image loading through the shared asset manager:
+#   cold         every background and the tile sheet at each zoom, decoded and scaled
+#   repeat       the same requests again, served from the cache
+#   first frame  building all five screens and drawing the title screen, with every image
+#                fetched up front as the screens used to in their constructors ("eager"),
+#                and fetched on first draw while AssetManager.warm decodes the rest ("lazy")
+# Runs with SDL's dummy video driver unless SDL_VIDEODRIVER says otherwise.
+#
+#   python benchmarks/bench_assets.py [rounds]
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+os.chdir(ROOT) # images load from assets/ relative to the working directory
+
+import pygame
+from config import Configurations
+
+config = Configurations()
+
+BACKGROUNDS = ["backgrounds/title.png", "backgrounds/main_menu.png", "backgrounds/settings.png", "backgrounds/tutorial.png"]
+
+def run(rounds):
+    pygame.init()
+    surface = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    screen_size = surface.get_size()
+    from core.game_manager import GameManager
+    from core.level_loader import LevelLoader
+    from core.progress_manager import ProgressManager
+    from screens.game_play_screen import GamePlayScreen
+    from screens.main_menu_screen import MainMenuScreen
+    from screens.settings_screen import SettingsScreen
+    from screens.title_screen import TitleScreen
+    from screens.tutorial_screen import TutorialScreen
+    from ui_elements.asset_manager import assets
+
+    def fetch_all():
+        for path in BACKGROUNDS:
+            assets.scaled(path, screen_size)
+        for tile_size in config.CAMERA_ZOOM_TILE_SIZES:
+            assets.tile_sheet(tile_size)
+
+    def first_frame(eager):
+        game_manager = GameManager(LevelLoader(os.path.join(ROOT, "assets", "levels")),
+                                   ProgressManager(os.path.join(tempfile.mkdtemp(), "save_file.json")), None)
+        if eager:
+            fetch_all()
+        else:
+            warm = assets.warm(images=[(path, screen_size) for path in BACKGROUNDS],
+                               tile_sizes=config.CAMERA_ZOOM_TILE_SIZES)
+        screens = [TitleScreen(), TutorialScreen(), SettingsScreen(game_manager),
+                   MainMenuScreen(game_manager), GamePlayScreen(game_manager)]
+        screens[0].render(surface)
+        pygame.display.flip()
+        return None if eager else warm
+
+    print(f"{len(BACKGROUNDS)} backgrounds at {screen_size[0]}x{screen_size[1]}, "
+          f"tile sheets at {config.CAMERA_ZOOM_TILE_SIZES}, best of {rounds}")
+    timings = {"cold": [], "repeat": [], "eager": [], "lazy": []}
+    with redirect_stdout(io.StringIO()):
+        for _ in range(rounds):
+            assets.clear()
+            started = time.perf_counter()
+            fetch_all()
+            timings["cold"].append(time.perf_counter() - started)
+            started = time.perf_counter()
+            fetch_all()
+            timings["repeat"].append(time.perf_counter() - started)
+            for label in ("eager", "lazy"):
+                assets.clear()
+                started = time.perf_counter()
+                warm = first_frame(label == "eager")
+                timings[label].append(time.perf_counter() - started)
+                if warm is not None:
+                    warm.join() # the next round starts from an empty cache
+    print(f"  cold         {min(timings['cold']) * 1000:8.2f} ms")
+    print(f"  repeat       {min(timings['repeat']) * 1e6:8.2f} us")
+    print(f"  first frame  eager {min(timings['eager']) * 1000:8.2f} ms   lazy {min(timings['lazy']) * 1000:8.2f} ms")
+    pygame.quit()
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,78 @@
+# Frame times of the game loop while a big level loads: GameManager.load_and_start_level
+# blocks the loop for the whole load, GameManager.load_level_async keeps it ticking at
+# config.FPS while a worker thread parses the level and builds its distance fields.
+# Only the loading frames are timed; drawing the loaded map is not part of this benchmark.
+#
+#   python benchmarks/bench_async_loading.py [size]
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import pygame
+from config import Configurations
+from core.game_manager import GameManager
+from core.level_loader import LevelLoader
+from core.progress_manager import ProgressManager
+
+config = Configurations()
+
+def write_level(levels_directory, size):
+    rows = []
+    for y in range(size):
+        rows.append("".join("1" if x % 7 or y % 5 == 0 else "W" for x in range(size)))
+    rows[0] = "S" + rows[0][1:]
+    rows[-1] = rows[-1][:-1] + "D"
+    with open(os.path.join(levels_directory, "level_1.json"), 'w') as f:
+        json.dump({"level_name": "Big", "initial_fuel": 100_000, "hint_battery": 3, "map_grid": rows}, f)
+
+def frame(clock, surface, font, game_manager):
+    # a stand-in for the loading screen: one text render and a flip
+    clock.tick(config.FPS)
+    surface.fill((30, 30, 40))
+    stage, fraction = game_manager.get_loading_progress()
+    surface.blit(font.render(f"{stage} {fraction:.0%}", True, (200, 200, 200)), (20, 20))
+    pygame.display.flip()
+
+def run(size):
+    pygame.init()
+    surface = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    font = pygame.font.Font(None, 32)
+    clock = pygame.time.Clock()
+    levels_directory = tempfile.mkdtemp(prefix="bench_async_")
+    write_level(levels_directory, size)
+    print(f"{size}x{size} level, target {1000 / config.FPS:.1f} ms per frame")
+
+    for label in ("blocking", "async"):
+        game_manager = GameManager(LevelLoader(levels_directory, cache_size=0),
+                                   ProgressManager(os.path.join(levels_directory, "save_file.json")), None)
+        frame_times = []
+        started = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            if label == "blocking":
+                frame(clock, surface, font, game_manager)
+                game_manager.load_and_start_level(1)
+                frame_times.append(time.perf_counter() - started)
+            else:
+                game_manager.load_level_async(1)
+                while not game_manager.poll_level_load():
+                    frame_started = time.perf_counter()
+                    frame(clock, surface, font, game_manager)
+                    frame_times.append(time.perf_counter() - frame_started)
+        elapsed = time.perf_counter() - started
+        assert game_manager.is_level_loaded
+        frame_times.sort()
+        print(f"  {label:<9} load {elapsed:6.2f} s   frames {len(frame_times):5}   "
+              f"median {frame_times[len(frame_times) // 2] * 1000:7.1f} ms   worst {frame_times[-1] * 1000:8.1f} ms")
+    pygame.quit()
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000)
@@ -0,0 +1,49 @@
+# Steps per second of FleetSimulation against running simulate() once per agent, for
+# growing fleets of random walkers on every shipped level. Results are compared agent by agent.
+#
+#   python benchmarks/bench_fleet_simulation.py [ticks] [agents ...]
+import io
+import os
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from core.fleet_simulation import FleetSimulation
+from core.level_loader import LevelLoader
+from core.simulation import SimulationLevel, simulate
+
+def run(ticks, fleet_sizes):
+    level_loader = LevelLoader(os.path.join(ROOT, "assets", "levels"), prepare_routing=False)
+    rng = random.Random(0)
+    for level_id in range(1, level_loader.get_available_levels_count() + 1):
+        with redirect_stdout(io.StringIO()):
+            level_data = level_loader.load_level_by_number(level_id)
+        # enough fuel that most agents walk every tick
+        level_data.initial_fuel = ticks * 10
+        level = SimulationLevel(level_data)
+        print(level_data.name)
+        for agents in fleet_sizes:
+            logs = ["".join(rng.choice("wasd") for _ in range(ticks)) for _ in range(agents)]
+
+            started = time.perf_counter()
+            scalar_results = [simulate(level, log) for log in logs]
+            scalar_time = time.perf_counter() - started
+
+            fleet = FleetSimulation(level, agents)
+            started = time.perf_counter()
+            fleet.run(logs)
+            fleet_time = time.perf_counter() - started
+
+            assert fleet.results() == scalar_results, f"{level_data.name}: fleet results differ from simulate()"
+            steps = int(fleet.actions_used.sum())
+            print(f"  {agents:>6} agents   simulate {steps / scalar_time / 1e6:6.2f} M steps/s   "
+                  f"fleet {steps / fleet_time / 1e6:7.2f} M steps/s   x{scalar_time / fleet_time:5.1f}")
+
+if __name__ == "__main__":
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    fleet_sizes = [int(arg) for arg in sys.argv[2:]] or [100, 1_000, 10_000]
+    run(ticks, fleet_sizes)
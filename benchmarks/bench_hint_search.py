@@ -0,0 +1,123 @@
+# Time and memory of HintProvider.get_path on large open grids, compared with the
+# original Node-object A* it replaced.
+#
+#   python benchmarks/bench_hint_search.py [size ...]
+import heapq
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from core.hint_provider import HintProvider
+
+class LegacyNode:
+    # the per-push search node HintProvider used before the flat-array rework
+    def __init__(self, position, parent=None):
+        self.position = position
+        self.parent = parent
+        self.g = 0
+        self.h = 0
+        self.f = 0
+
+    def __lt__(self, other):
+        return self.f < other.f
+
+    def __eq__(self, other):
+        return isinstance(other, LegacyNode) and self.position == other.position
+
+    def __hash__(self):
+        return hash(self.position)
+
+def legacy_get_path(map_data, start_coords, end_coords, stats):
+    rows = len(map_data)
+    cols = len(map_data[0])
+    end_node = LegacyNode(end_coords)
+    open_set_heap = [LegacyNode(start_coords)]
+    open_set_dict = {start_coords: 0}
+    closed_set = set()
+    movements = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+
+    while open_set_heap:
+        stats["peak_open"] = max(stats["peak_open"], len(open_set_heap))
+        current_node = heapq.heappop(open_set_heap)
+        if current_node.position in closed_set:
+            continue
+        if current_node.position in open_set_dict and current_node.g > open_set_dict[current_node.position]:
+            continue
+        if current_node.position in open_set_dict:
+            del open_set_dict[current_node.position]
+        closed_set.add(current_node.position)
+        stats["expanded"] += 1
+
+        if current_node == end_node:
+            path = []
+            while current_node is not None:
+                path.append(current_node.position)
+                current_node = current_node.parent
+            return path[::-1]
+
+        for dx, dy in movements:
+            neighbor_pos = (current_node.position[0] + dx, current_node.position[1] + dy)
+            if not (0 <= neighbor_pos[0] < cols and 0 <= neighbor_pos[1] < rows):
+                continue
+            if map_data[neighbor_pos[1]][neighbor_pos[0]] == 'W':
+                continue
+            if neighbor_pos in closed_set:
+                continue
+            tentative_g_cost = current_node.g + 1
+            if neighbor_pos not in open_set_dict or tentative_g_cost < open_set_dict[neighbor_pos]:
+                neighbor_node = LegacyNode(neighbor_pos, current_node)
+                neighbor_node.g = tentative_g_cost
+                neighbor_node.h = abs(neighbor_pos[0] - end_coords[0]) + abs(neighbor_pos[1] - end_coords[1])
+                neighbor_node.f = neighbor_node.g + neighbor_node.h
+                heapq.heappush(open_set_heap, neighbor_node)
+                open_set_dict[neighbor_pos] = neighbor_node.g
+    return []
+
+def open_grid(size):
+    # open field split by a wall with a single gap at the far end
+    rows = ["1" * size for _ in range(size)]
+    wall_row = size // 2
+    rows[wall_row] = "W" * (size - 1) + "1"
+    rows[0] = "S" + rows[0][1:]
+    rows[-1] = rows[-1][:-1] + "D"
+    return rows
+
+def measure(label, search):
+    # timed without tracemalloc, which slows allocation-heavy code down a lot
+    started = time.perf_counter()
+    path, stats = search()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    search()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_expansion_us = elapsed / max(stats["expanded"], 1) * 1e6
+    print(f"  {label:<8} {elapsed * 1000:9.1f} ms  {stats['expanded']:>9} expanded  "
+          f"{per_expansion_us:6.2f} us/expansion  peak open {stats['peak_open']:>7}  "
+          f"peak mem {peak_bytes / 1e6:7.1f} MB  path {len(path)}")
+
+def run(size):
+    grid = open_grid(size)
+    start, end = (0, 0), (size - 1, size - 1)
+    print(f"{size}x{size} open grid, {start} -> {end}")
+
+    def legacy():
+        stats = {"expanded": 0, "peak_open": 0}
+        return legacy_get_path(grid, start, end, stats), stats
+
+    def current():
+        hint_provider = HintProvider()
+        path = hint_provider.get_path(grid, start, end)
+        return path, hint_provider.last_search_stats
+
+    measure("before", legacy)
+    measure("after", current)
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [200, 500, 1000]
+    for size in sizes:
+        run(size)
@@ -0,0 +1,62 @@
+# HPA* (HierarchicalPathfinder) against plain A* for fuel hints on the shipped levels,
+# scaled up by turning every tile into a k x k block of the same tile. "cold" is the first
+# query on a lazy hierarchy, which works out intra-cluster costs as it goes; "precompute" is
+# what LevelLoader spends at load so that in-game hints never pay that first-query cost.
+#
+#   python benchmarks/bench_hpa.py [scale ...]
+import glob
+import io
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from bench_jps import find_tiles, path_cost, scale_grid
+from core.hierarchical_pathfinder import HierarchicalPathfinder
+from core.hint_provider import HintProvider
+from core.level_loader import LevelData
+
+def timed(search):
+    started = time.perf_counter()
+    result = search()
+    return time.perf_counter() - started, result
+
+def run(scale):
+    print(f"scale {scale}")
+    for level_path in sorted(glob.glob(os.path.join(ROOT, "assets", "levels", "level_*.json"))):
+        with open(level_path) as f:
+            grid = scale_grid(json.load(f)["map_grid"], scale)
+        level = LevelData(os.path.basename(level_path), 0, 0, grid, None, [], 0, len(grid[0]), len(grid))
+        start = find_tiles(grid, "S")[0]
+        goals = find_tiles(grid, "D")[::scale * scale]
+
+        build_time, hierarchy = timed(lambda: HierarchicalPathfinder(level))
+        precompute_time, _ = timed(lambda: HierarchicalPathfinder(level).precompute(weighted=True))
+        astar_time = cold_time = warm_time = 0
+        astar_cost = hpa_cost = 0
+        hint_provider = HintProvider(use_jump_point_search=False)
+        for goal in goals:
+            with redirect_stdout(io.StringIO()):
+                elapsed, astar_path = timed(lambda: hint_provider.get_path(level, start, goal, weighted=True))
+            astar_time += elapsed
+            # the first query works out intra-cluster costs for the clusters it reaches
+            elapsed, (hpa_path, _, _) = timed(lambda: hierarchy.find_path(start, goal, weighted=True))
+            cold_time += elapsed
+            elapsed, _ = timed(lambda: hierarchy.find_path(start, goal, weighted=True))
+            warm_time += elapsed
+            astar_cost += path_cost(grid, astar_path, True)
+            hpa_cost += path_cost(grid, hpa_path, True)
+
+        print(f"  {level.name:<13} {len(grid[0]):>5}x{len(grid):<5} build {build_time * 1000:7.1f} ms   "
+              f"precompute {precompute_time * 1000:8.1f} ms   "
+              f"A* {astar_time * 1000:8.1f} ms   HPA* cold {cold_time * 1000:8.1f} ms "
+              f"warm {warm_time * 1000:7.1f} ms   fuel +{(hpa_cost / max(astar_cost, 1) - 1) * 100:4.1f}%")
+
+if __name__ == "__main__":
+    scales = [int(arg) for arg in sys.argv[1:]] or [32, 64, 128]
+    for scale in scales:
+        run(scale)
@@ -0,0 +1,77 @@
+# Jump Point Search against plain A* in HintProvider.get_path on the shipped levels,
+# scaled up by turning every tile into a k x k block of the same tile.
+#
+#   python benchmarks/bench_jps.py [scale ...]
+import glob
+import io
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from core.hint_provider import HintProvider
+from core.level_loader import LevelData
+from core.tile_rules import get_fuel_cost
+
+def scale_grid(grid, scale):
+    rows = []
+    for row in grid:
+        scaled_row = "".join(tile * scale for tile in row)
+        rows.extend([scaled_row] * scale)
+    return rows
+
+def find_tiles(grid, tile):
+    return [(x, y) for y, row in enumerate(grid) for x, tile_char in enumerate(row) if tile_char == tile]
+
+def path_cost(grid, path, weighted):
+    if not weighted:
+        return len(path) - 1
+    return sum(get_fuel_cost(grid[y][x]) for x, y in path[1:])
+
+def run_queries(hint_provider, level, queries, weighted):
+    grid = level.grid
+    total_expanded = 0
+    jps_queries = 0
+    costs = []
+    started = time.perf_counter()
+    for start, end in queries:
+        with redirect_stdout(io.StringIO()):
+            path = hint_provider.get_path(level, start, end, weighted)
+        total_expanded += hint_provider.last_search_stats["expanded"]
+        jps_queries += hint_provider.last_search_stats["method"] == "jps"
+        costs.append(path_cost(grid, path, weighted) if path else None)
+    return time.perf_counter() - started, total_expanded, jps_queries, costs
+
+def run(scale):
+    print(f"scale {scale}")
+    for level_path in sorted(glob.glob(os.path.join(ROOT, "assets", "levels", "level_*.json"))):
+        with open(level_path) as f:
+            grid = scale_grid(json.load(f)["map_grid"], scale)
+        level = LevelData(os.path.basename(level_path), 0, 0, grid, None, [], 0, len(grid[0]), len(grid))
+        # hint from the start tile (top-left tile of its block) to every destination block
+        start = find_tiles(grid, "S")[0]
+        queries = [(start, end) for end in find_tiles(grid, "D")[::scale * scale]]
+
+        name = os.path.basename(level_path)
+        for weighted in (False, True):
+            astar_time, astar_expanded, _, astar_costs = run_queries(
+                HintProvider(use_jump_point_search=False), level, queries, weighted)
+            # the first pass also builds the level's jump tables, the second reuses them
+            jps_provider = HintProvider()
+            cold_time, _, _, _ = run_queries(jps_provider, level, queries, weighted)
+            jps_time, jps_expanded, jps_queries, jps_costs = run_queries(jps_provider, level, queries, weighted)
+            assert astar_costs == jps_costs, f"{name}: JPS path cost differs from A*"
+            mode = "fuel" if weighted else "steps"
+            print(f"  {name:<13} {len(grid[0]):>4}x{len(grid):<4} {mode:<5} "
+                  f"A* {astar_time * 1000:8.1f} ms {astar_expanded:>8} expanded   "
+                  f"JPS {jps_time * 1000:8.1f} ms (cold {cold_time * 1000:6.1f}) {jps_expanded:>6} expanded "
+                  f"({jps_queries}/{len(queries)} queries)   x{astar_time / max(jps_time, 1e-9):5.1f}")
+
+if __name__ == "__main__":
+    scales = [int(arg) for arg in sys.argv[1:]] or [4, 16, 32]
+    for scale in scales:
+        run(scale)
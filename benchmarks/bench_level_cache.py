@@ -0,0 +1,41 @@
+# Level transitions (retry, next level) through GameManager with LevelLoader's cache
+# against the same transitions with the cache turned off. The loader's counters show how
+# many transitions still read a level file.
+#
+#   python benchmarks/bench_level_cache.py [transitions]
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from core.game_manager import GameManager
+from core.level_loader import LevelLoader
+from core.progress_manager import ProgressManager
+
+def run(transitions):
+    save_file = os.path.join(tempfile.mkdtemp(), "save_file.json")
+    for label, cache_size in (("no cache", 0), ("cache", None)):
+        level_loader = LevelLoader(os.path.join(ROOT, "assets", "levels"), cache_size=cache_size)
+        game_manager = GameManager(level_loader, ProgressManager(save_file), None)
+        level_count = level_loader.get_available_levels_count()
+        with redirect_stdout(io.StringIO()):
+            game_manager.load_and_start_level(1)
+            started = time.perf_counter()
+            for transition in range(transitions):
+                # alternate retrying the current level and moving on to the next one
+                level_id = game_manager.current_level_id
+                if transition % 2:
+                    level_id = level_id % level_count + 1
+                game_manager.load_and_start_level(level_id)
+            elapsed = time.perf_counter() - started
+        stats = level_loader.cache_stats
+        print(f"  {label:<8} {elapsed / transitions * 1e6:8.1f} us per transition   "
+              f"hits {stats['hits']:>6}  misses {stats['misses']:>6}  file reads {stats['disk_reads']:>6}")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
@@ -0,0 +1,60 @@
+# Counting and loading levels from a directory of level_N.json files against the same
+# levels in one level pack. The shipped levels are copied round-robin into a temporary
+# directory and loaded without routing precompute, so the timings are the file handling
+# and parsing.
+#
+#   python benchmarks/bench_level_pack.py [levels] [loads]
+import glob
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from core.level_loader import LevelLoader
+from core.level_pack import convert_levels_directory
+
+def timed(work):
+    started = time.perf_counter()
+    result = work()
+    return time.perf_counter() - started, result
+
+def load_all(loader, level_numbers):
+    with redirect_stdout(io.StringIO()):
+        return [loader.load_level_by_number(number) for number in level_numbers]
+
+def run(level_count, loads):
+    shipped = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "assets", "levels", "level_*.json"))):
+        with open(path) as f:
+            shipped.append(json.load(f))
+    levels_directory = tempfile.mkdtemp(prefix="bench_levels_")
+    for number in range(1, level_count + 1):
+        level = dict(shipped[number % len(shipped)], level_name=f"Level {number}")
+        with open(os.path.join(levels_directory, f"level_{number}.json"), 'w') as f:
+            json.dump(level, f)
+
+    pack_path = os.path.join(levels_directory, "levels.pack")
+    convert_time, _ = timed(lambda: convert_levels_directory(levels_directory, pack_path))
+    print(f"{level_count} levels, packed in {convert_time:.2f}s ({os.path.getsize(pack_path)} bytes)")
+
+    rng = random.Random(0)
+    level_numbers = [rng.randint(1, level_count) for _ in range(loads)]
+    for label, path in (("directory", levels_directory), ("pack", pack_path)):
+        open_time, loader = timed(lambda: LevelLoader(path, prepare_routing=False))
+        count_time, count = timed(loader.get_available_levels_count)
+        load_time, loaded = timed(lambda: load_all(loader, level_numbers))
+        assert count == level_count and all(loaded)
+        print(f"  {label:<9} open {open_time * 1000:7.2f} ms   count {count_time * 1000:8.2f} ms   "
+              f"load {load_time / loads * 1e6:7.1f} us per level")
+
+if __name__ == "__main__":
+    level_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    loads = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    run(level_count, loads)
@@ -0,0 +1,77 @@
+# Loading one huge level file with json.load plus LevelLoader.parse_level against the
+# streaming reader. Each path runs in a fresh subprocess so its peak RSS is its own.
+#
+#   python benchmarks/bench_level_stream.py [width] [height]
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+LOADERS = {
+    "json.load": "json",
+    "streaming": "stream",
+}
+
+def write_level(path, width, height):
+    with open(path, 'w') as f:
+        f.write('{"level_name": "Huge", "initial_fuel": 100000, "hint_battery": 5, "map_grid": [\n')
+        body = ("123W" * (width // 4 + 1))[:width]
+        for y in range(height):
+            row = body
+            if y == 0:
+                row = "S" + row[1:]
+            if y % 97 == 0:
+                row = row[:-1] + "D"
+            f.write(f'  "{row}"' + (",\n" if y < height - 1 else "\n"))
+        f.write("]}\n")
+
+def measure(mode, path):
+    # runs in the child process: load the file one way and report time, peak RSS and a checksum
+    import resource
+    import time
+    from core.level_loader import LevelLoader
+    from core.level_stream import read_level_stream
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    if mode == "json":
+        with open(path, 'r') as f:
+            level_data = LevelLoader(os.path.dirname(path)).parse_level(json.load(f))
+        terrain, destinations = level_data.terrain, level_data.destination_coords
+    else:
+        streamed = read_level_stream(path)
+        terrain, destinations = streamed.terrain, streamed.destination_coords
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"seconds": elapsed, "peak_kb": peak, "baseline_kb": baseline,
+                      "checksum": int(terrain.sum()), "destinations": len(destinations)}))
+
+def run(width, height):
+    path = os.path.join(tempfile.mkdtemp(), "level_huge.json")
+    write_level(path, width, height)
+    size = os.path.getsize(path)
+    print(f"{width}x{height} level, {size / 2**20:.1f} MiB file, terrain {width * height / 2**20:.1f} MiB")
+
+    results = {}
+    for label, mode in LOADERS.items():
+        output = subprocess.run([sys.executable, __file__, "--measure", mode, path],
+                                check=True, capture_output=True, text=True).stdout
+        results[label] = json.loads(output.strip().splitlines()[-1])
+        result = results[label]
+        print(f"  {label:<10} {result['seconds']:6.2f} s   peak RSS {result['peak_kb'] / 1024:8.1f} MiB   "
+              f"(+{(result['peak_kb'] - result['baseline_kb']) / 1024:.1f} MiB over startup)")
+    checks = {(result["checksum"], result["destinations"]) for result in results.values()}
+    assert len(checks) == 1, "loaders disagree"
+    os.remove(path)
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--measure":
+        measure(sys.argv[2], sys.argv[3])
+    else:
+        width = int(sys.argv[1]) if len(sys.argv) > 1 else 8_000
+        height = int(sys.argv[2]) if len(sys.argv) > 2 else 8_000
+        run(width, height)
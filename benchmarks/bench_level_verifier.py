@@ -0,0 +1,76 @@
+# Minimum-fuel verification on generated levels with a growing number of destinations:
+# the pruned A* of level_verifier against a plain Held-Karp table over the same legs
+# (skipped past HELD_KARP_LIMIT destinations, where it needs n * 2^n entries).
+#
+#   python benchmarks/bench_level_verifier.py [destinations ...]
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from core.distance_field import compute_distance_fields
+from core.level_loader import LevelData
+from core.level_verifier import find_cheapest_order
+from core.tile_rules import encode_grid
+
+WIDTH, HEIGHT = 48, 32
+HELD_KARP_LIMIT = 16
+
+def make_level(destinations, rng):
+    grid = [[rng.choice("1112") if rng.random() > 0.2 else "W" for _ in range(WIDTH)] for _ in range(HEIGHT)]
+    # a road every fourth row and column keeps everything connected
+    for y in range(HEIGHT):
+        for x in range(WIDTH):
+            if y % 4 == 0 or x % 4 == 0:
+                grid[y][x] = "1"
+    tiles = rng.sample([(x, y) for y in range(HEIGHT) for x in range(WIDTH) if x % 4 == 0], destinations + 1)
+    grid[tiles[0][1]][tiles[0][0]] = "S"
+    for x, y in tiles[1:]:
+        grid[y][x] = "D"
+    grid = ["".join(row) for row in grid]
+    return LevelData("generated", 0, 0, grid, (tiles[0][1], tiles[0][0]), [(y, x) for x, y in tiles[1:]],
+                     destinations, WIDTH, HEIGHT, encode_grid(grid))
+
+def held_karp(start_legs, legs):
+    n = len(start_legs)
+    costs = [[float('inf')] * n for _ in range(1 << n)]
+    for j in range(n):
+        costs[1 << j][j] = start_legs[j]
+    for mask in range(1, 1 << n):
+        row = costs[mask]
+        for j in range(n):
+            if row[j] == float('inf'):
+                continue
+            for k in range(n):
+                if not mask >> k & 1:
+                    next_cost = row[j] + legs[j][k]
+                    if next_cost < costs[mask | 1 << k][k]:
+                        costs[mask | 1 << k][k] = next_cost
+    return min(costs[-1])
+
+def run(destination_counts):
+    rng = random.Random(0)
+    for count in destination_counts:
+        level = make_level(count, rng)
+        destinations = [(x, y) for y, x in level.destination_coords]
+        fields = compute_distance_fields(level, destinations)
+        start = (level.player_start_pos[1], level.player_start_pos[0])
+        start_legs = [fields.cost(start, dest) for dest in destinations]
+        legs = [[fields.cost(a, b) for b in destinations] for a in destinations]
+
+        started = time.perf_counter()
+        cost, _, expanded = find_cheapest_order(start_legs, legs)
+        search_time = time.perf_counter() - started
+        line = f"  {count:>3} destinations   pruned A* {search_time * 1000:8.1f} ms ({expanded} states)"
+        if count <= HELD_KARP_LIMIT:
+            started = time.perf_counter()
+            assert held_karp(start_legs, legs) == cost
+            line += f"   Held-Karp {(time.perf_counter() - started) * 1000:9.1f} ms"
+        print(line)
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [8, 12, 14, 16, 20, 24]
+    run(counts)
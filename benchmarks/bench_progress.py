@@ -0,0 +1,51 @@
+# Cost on the game thread of the ProgressManager calls GameManager and the level select
+# menu make: load_progress() reading the save file (a fresh manager every call, as every
+# call used to) and served from memory, and save_progress() writing on the calling thread
+# (followed by flush()) and handing the write to the background writer. The last line
+# counts the disk writes a burst of saves turns into.
+#
+#   python benchmarks/bench_progress.py [calls]
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from core.progress_manager import ProgressManager
+
+def timed(calls, work):
+    started = time.perf_counter()
+    for i in range(calls):
+        work(i)
+    return (time.perf_counter() - started) / calls
+
+def run(calls):
+    save_file = os.path.join(tempfile.mkdtemp(prefix="bench_progress_"), "save_file.json")
+    progress_manager = ProgressManager(save_file)
+    print(f"{calls} calls each")
+    with redirect_stdout(io.StringIO()):
+        progress_manager.save_progress(5)
+        progress_manager.flush()
+        results = [
+            ("load, from disk", timed(calls, lambda i: ProgressManager(save_file).load_progress())),
+            ("load, in memory", timed(calls, lambda i: progress_manager.load_progress())),
+            ("save, written now", timed(calls, lambda i: (progress_manager.save_progress(i), progress_manager.flush()))),
+            ("save, write-behind", timed(calls, lambda i: progress_manager.save_progress(i))),
+        ]
+        writes = []
+        write = progress_manager._write_atomically
+        progress_manager._write_atomically = lambda data: (writes.append(data), write(data))
+        for i in range(calls):
+            progress_manager.save_progress(i)
+        time.sleep(progress_manager.flush_delay * 2)
+        progress_manager.flush()
+    for label, seconds in results:
+        print(f"  {label:<19} {seconds * 1e6:9.1f} us per call")
+    print(f"  {calls} saves in a burst were written {len(writes)} time(s)")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,128 @@
+# Frame cost of GamePlayScreen.render plus the display update, on the tutorial level and
+# on a generated size x size level, which should cost the same since only the tiles in
+# the camera's view are drawn:
+#   idle         nothing changed, no rects to update
+#   moving       the player moves every frame, the camera scrolls when it nears an edge
+#   hint moving  the same with a long hint path shown, which should cost no more
+#   hint reveal  a new hint path appearing, a few tiles per frame as it is animated in
+#   full redraw  the baked map layer and everything on it, flipped
+#   rebake       every tile in view drawn into the layer again, as a zoom does
+# Runs with SDL's dummy video driver unless SDL_VIDEODRIVER says otherwise.
+#
+#   python benchmarks/bench_render.py [frames] [size]
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+os.chdir(ROOT) # textures load from assets/ relative to the working directory
+
+import numpy as np
+import pygame
+from config import Configurations
+
+config = Configurations()
+
+def present(dirty_rects):
+    if dirty_rects is None:
+        pygame.display.flip()
+    elif dirty_rects:
+        pygame.display.update(dirty_rects)
+
+def generated_level(size):
+    # random road costs and walls, with open cross streets through the start in the middle
+    from core.level_loader import LevelData
+    terrain = np.random.default_rng(0).choice(np.frombuffer(b"1111123W", dtype=np.uint8), size=(size, size))
+    middle = size // 2
+    terrain[middle, :] = ord(config.ROAD_TILE_1)
+    terrain[:, middle] = ord(config.ROAD_TILE_1)
+    terrain[middle, middle] = ord(config.START_TILE)
+    destinations = [(0, middle), (size - 1, middle)]
+    for row, col in destinations:
+        terrain[row, col] = ord(config.DESTINATION_TILE)
+    return LevelData(f"Generated {size}x{size}", 10 ** 9, 0, None, (middle, middle), destinations,
+                     len(destinations), size, size, terrain)
+
+def run_level(surface, label, frames, level_id=None, level_data=None):
+    from core.game_manager import GameManager
+    from core.level_loader import LevelLoader
+    from core.progress_manager import ProgressManager
+    from screens.game_play_screen import GamePlayScreen
+
+    game_manager = GameManager(LevelLoader(os.path.join(ROOT, "assets", "levels")),
+                               ProgressManager(os.path.join(tempfile.mkdtemp(), "save_file.json")), None)
+    with redirect_stdout(io.StringIO()):
+        screen = GamePlayScreen(game_manager)
+        if level_data is None:
+            screen.on_enter(level_id=level_id)
+            game_manager.level_load_future.result()
+            screen.update(0)
+        else:
+            game_manager._start_level(1, level_data, None)
+        present(screen.render(surface))
+    game_manager.current_fuel = 10 ** 9 # never run out while moving
+    # up and down the start column, far enough for the camera to scroll on big maps
+    reach = max(1, min(20, game_manager.get_player_position()[1] - 1))
+
+    def idle():
+        present(screen.render(surface))
+
+    def moving(frame=[0]):
+        frame[0] += 1
+        direction = "up" if frame[0] // reach % 2 else "down"
+        game_manager.handle_player_action(action_type='move', direction=direction)
+        present(screen.render(surface))
+
+    # a snake through the rows around the start, longer than any real hint
+    start_col, start_row = game_manager.get_player_position()
+    hint_path = [(start_col - 30 + (i % 60 if i // 60 % 2 == 0 else 59 - i % 60), start_row - 5 + i // 60)
+                 for i in range(600)]
+
+    def hint_moving():
+        if game_manager.active_hint_path is not hint_path:
+            game_manager.active_hint_path = hint_path
+            screen._hint_progress = len(hint_path)
+        moving()
+
+    def hint_reveal(frame=[0]):
+        frame[0] += 1
+        if frame[0] % 100 == 1:
+            game_manager.active_hint_path = list(hint_path) # a new path starts over
+        screen.update(1 / config.FPS)
+        present(screen.render(surface))
+
+    def full_redraw():
+        screen._needs_full_redraw = True
+        present(screen.render(surface))
+
+    def rebake():
+        screen._bake_map_layer()
+        full_redraw()
+
+    print(f"{label}, {frames} frames each")
+    for name, work in (("idle", idle), ("moving", moving), ("hint moving", hint_moving),
+                       ("hint reveal", hint_reveal), ("full redraw", full_redraw), ("rebake", rebake)):
+        with redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            for _ in range(frames):
+                work()
+            elapsed = time.perf_counter() - started
+        print(f"  {name:<12} {elapsed / frames * 1e6:9.1f} us per frame")
+
+def run(frames, size):
+    pygame.init()
+    surface = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    run_level(surface, "level 1", frames, level_id=1)
+    run_level(surface, f"{size}x{size} generated level", frames, level_data=generated_level(size))
+    pygame.quit()
+
+if __name__ == "__main__":
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    run(frames, size)
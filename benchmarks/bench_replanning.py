@@ -0,0 +1,66 @@
+# Successive hints on levels without precomputed distance fields: RoutePlanner searching
+# from scratch every time against the D* Lite planners of IncrementalFields, which keep
+# their search between hints. The player walks a few tiles along each hint before asking
+# for the next one. The shipped levels are scaled up by turning each tile into a k x k block.
+#
+#   python benchmarks/bench_replanning.py [scale ...]
+import glob
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from bench_jps import find_tiles, path_cost, scale_grid
+from core.hint_provider import HintProvider
+from core.incremental_planner import IncrementalFields
+from core.level_loader import LevelData
+from core.route_planner import RoutePlanner
+
+HINTS = 6
+STEPS_BETWEEN_HINTS = 10
+
+def run_hints(level, start, destinations, use_incremental, walk=None):
+    # walk lists the tiles the player passes between hints; when None it follows each hint
+    planner = RoutePlanner(HintProvider())
+    fields = IncrementalFields(level, destinations, start) if use_incremental else None
+    position = start
+    timings = []
+    costs = []
+    walked = []
+    for hint in range(HINTS):
+        started = time.perf_counter()
+        path = planner.plan_route(level, position, destinations, distance_fields=fields)
+        timings.append(time.perf_counter() - started)
+        costs.append(path_cost(level.grid, path, True))
+        steps = path[1:STEPS_BETWEEN_HINTS + 1] if walk is None else walk[hint]
+        walked.append(steps)
+        for position in steps:
+            if fields is not None:
+                fields.set_start(position)
+    return timings, costs, walked
+
+def run(scale):
+    print(f"scale {scale}")
+    for level_path in sorted(glob.glob(os.path.join(ROOT, "assets", "levels", "level_*.json"))):
+        with open(level_path) as f:
+            grid = scale_grid(json.load(f)["map_grid"], scale)
+        level = LevelData(os.path.basename(level_path), 0, 0, grid, None, [], 0, len(grid[0]), len(grid))
+        start = find_tiles(grid, "S")[0]
+        destinations = find_tiles(grid, "D")[::scale * scale]
+
+        scratch_times, scratch_costs, walk = run_hints(level, start, destinations, use_incremental=False)
+        incremental_times, incremental_costs, _ = run_hints(level, start, destinations, True, walk)
+        assert scratch_costs == incremental_costs, f"{level.name}: incremental routes cost more fuel"
+        later = slice(1, None)
+        print(f"  {level.name:<13} {len(grid[0]):>4}x{len(grid):<4} first hint: scratch "
+              f"{scratch_times[0] * 1000:7.1f} ms, incremental {incremental_times[0] * 1000:7.1f} ms   "
+              f"later hints (mean): scratch {sum(scratch_times[later]) / (HINTS - 1) * 1000:7.1f} ms, "
+              f"incremental {sum(incremental_times[later]) / (HINTS - 1) * 1000:7.1f} ms")
+
+if __name__ == "__main__":
+    scales = [int(arg) for arg in sys.argv[1:]] or [4, 8, 16]
+    for scale in scales:
+        run(scale)
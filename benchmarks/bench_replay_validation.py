@@ -0,0 +1,38 @@
+# Throughput of ReplayValidator for a growing number of worker processes, on random move
+# logs over the shipped levels. Scaling flattens out at the number of CPU cores.
+#
+#   python benchmarks/bench_replay_validation.py [replays] [moves per replay]
+import os
+import random
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from core.replay_validator import ReplayValidator
+
+def make_logs(replays, moves, seed=0):
+    rng = random.Random(seed)
+    return [{"replay_id": i, "level_id": rng.randint(1, 5),
+             "moves": "".join(rng.choice("wasd") for _ in range(moves))} for i in range(replays)]
+
+def run(replays, moves):
+    logs = make_logs(replays, moves)
+    cores = os.cpu_count() or 1
+    print(f"{replays} replays of {moves} moves, {cores} CPU cores")
+    baseline = None
+    workers = 1
+    while workers <= max(cores, 1) * 2:
+        validator = ReplayValidator(os.path.join(ROOT, "assets", "levels"), max_workers=workers)
+        verdicts = sum(1 for _ in validator.validate(logs))
+        assert verdicts == replays
+        stats = validator.stats
+        baseline = baseline or stats["replays_per_second"]
+        print(f"  {workers:>3} workers: {stats['seconds']:6.2f} s   {stats['replays_per_second']:9.0f} replays/s   "
+              f"{stats['moves_per_second'] / 1e6:6.2f}M moves/s   x{stats['replays_per_second'] / baseline:4.2f}")
+        workers *= 2
+
+if __name__ == "__main__":
+    replays = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    moves = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    run(replays, moves)
@@ -0,0 +1,62 @@
+# Moves per second of the headless simulation against driving GameManager move by move
+# (with its logging sent to a buffer), on random move sequences over the shipped levels.
+#
+#   python benchmarks/bench_simulation.py [moves]
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from core.game_manager import GameManager
+from core.level_loader import LevelLoader
+from core.progress_manager import ProgressManager
+from core.simulation import SimulationLevel, simulate
+
+def game_manager_replay(game_manager, level_data, moves):
+    with redirect_stdout(io.StringIO()):
+        game_manager._initialize_level_state(level_data)
+        game_manager.current_game_state = "playing"
+        for move in moves:
+            if game_manager.get_game_state() != "playing":
+                break
+            game_manager._handle_player_move_action(move)
+    return game_manager
+
+def run(move_count):
+    level_loader = LevelLoader(os.path.join(ROOT, "assets", "levels"))
+    save_file = os.path.join(tempfile.mkdtemp(), "save_file.json")
+    game_manager = GameManager(level_loader, ProgressManager(save_file), None)
+    rng = random.Random(0)
+    for level_id in range(1, level_loader.get_available_levels_count() + 1):
+        with redirect_stdout(io.StringIO()):
+            level_data = level_loader.load_level_by_number(level_id)
+        # plenty of fuel and one package more than there are destinations, so the replay
+        # runs to the end instead of stopping at game over or level complete
+        level_data.initial_fuel = move_count * 10
+        level_data.num_packages_to_deliver += 1
+        moves = "".join(rng.choice("wasd") for _ in range(move_count))
+
+        started = time.perf_counter()
+        game_manager_replay(game_manager, level_data, moves)
+        scalar_time = time.perf_counter() - started
+
+        level = SimulationLevel(level_data)
+        started = time.perf_counter()
+        result = simulate(level, moves)
+        headless_time = time.perf_counter() - started
+
+        assert (result.outcome, result.fuel, result.packages_left, result.position) == \
+               (game_manager.current_game_state, game_manager.current_fuel,
+                game_manager.packages_left_to_deliver, game_manager.get_player_position())
+        print(f"  {level_data.name:<22} GameManager {result.actions_used / scalar_time / 1e6:6.2f} M moves/s   "
+              f"simulate {result.actions_used / headless_time / 1e6:6.2f} M moves/s   "
+              f"x{scalar_time / headless_time:5.1f}")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
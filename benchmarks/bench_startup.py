@@ -0,0 +1,66 @@
+# Startup time of the game: from starting the python process that runs src/main.py to its
+# first pygame.display.flip(), i.e. the title screen being shown. Each run is a fresh
+# process with SDL's dummy video driver (unless SDL_VIDEODRIVER says otherwise); the run
+# stops at the first flip. With --record the median is appended to startup_history.csv
+# next to this file with the commit it was measured on, so the number can be tracked over time.
+#
+#   python benchmarks/bench_startup.py [runs] [--record]
+import csv
+import datetime
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+HISTORY_FILE = os.path.join(ROOT, "benchmarks", "startup_history.csv")
+
+# runs main.py as __main__ and prints the wall clock time of its first flip
+CHILD = """
+import os, runpy, sys, time
+import pygame
+def first_flip(*args):
+    print(f"FIRST_FLIP {time.time()!r}", flush=True)
+    os._exit(0)
+pygame.display.flip = first_flip
+sys.argv = [sys.argv[1]]
+sys.path.insert(0, os.path.dirname(sys.argv[0]))
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+def measure_once():
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    started = time.time()
+    result = subprocess.run([sys.executable, "-c", CHILD, os.path.join(ROOT, "src", "main.py")],
+                            cwd=ROOT, env=env, capture_output=True, text=True, timeout=120)
+    for line in result.stdout.splitlines():
+        if line.startswith("FIRST_FLIP "):
+            return float(line.split()[1]) - started
+    raise RuntimeError(f"main.py exited without a flip:\n{result.stdout[-2000:]}\n{result.stderr[-2000:]}")
+
+def record(median):
+    commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                            capture_output=True, text=True).stdout.strip() or "unknown"
+    is_new = not os.path.exists(HISTORY_FILE)
+    with open(HISTORY_FILE, 'a', newline='') as f:
+        writer = csv.writer(f)
+        if is_new:
+            writer.writerow(["date", "commit", "startup_ms"])
+        writer.writerow([datetime.date.today().isoformat(), commit, f"{median * 1000:.1f}"])
+    print(f"  recorded in {os.path.relpath(HISTORY_FILE, ROOT)}")
+
+def run(runs, should_record):
+    measure_once() # warms the OS file cache, not timed
+    timings = sorted(measure_once() for _ in range(runs))
+    median = timings[len(timings) // 2]
+    print(f"process start to first flip, {runs} runs: median {median * 1000:.1f} ms   "
+          f"best {timings[0] * 1000:.1f} ms   worst {timings[-1] * 1000:.1f} ms")
+    if should_record:
+        record(median)
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--record"]
+    run(int(args[0]) if args else 10, "--record" in sys.argv[1:])
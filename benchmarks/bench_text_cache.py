@@ -0,0 +1,84 @@
+# Drawing cost of widgets whose text never changes between frames, with the shared text
+# cache turned off (every label rasterized every frame, as before) and on: the buttons of
+# the level select menu (one per level) and the title screen, and an open dialog. Whole
+# screens are timed too, where blitting the background image is most of the frame.
+#
+#   python benchmarks/bench_text_cache.py [frames] [levels]
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+os.chdir(ROOT) # backgrounds load from assets/ relative to the working directory
+
+import pygame
+from config import Configurations
+
+config = Configurations()
+
+def run(frames, level_count):
+    pygame.init()
+    surface = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    from core.game_manager import GameManager
+    from core.level_loader import LevelLoader
+    from core.progress_manager import ProgressManager
+    from screens.main_menu_screen import MainMenuScreen
+    from screens.title_screen import TitleScreen
+    from ui_elements.dialog import Dialog
+    from ui_elements.text_cache import text_cache
+
+    levels_directory = tempfile.mkdtemp(prefix="bench_text_")
+    for number in range(1, level_count + 1):
+        shutil.copy(os.path.join(ROOT, "assets", "levels", "level_1.json"),
+                    os.path.join(levels_directory, f"level_{number}.json"))
+    save_file = os.path.join(levels_directory, "save_file.json")
+    with open(save_file, 'w') as f:
+        json.dump({"max_level_unlocked": level_count // 2}, f)
+
+    game_manager = GameManager(LevelLoader(levels_directory), ProgressManager(save_file), None)
+    with redirect_stdout(io.StringIO()):
+        menu = MainMenuScreen(game_manager)
+        menu.on_enter()
+        title = TitleScreen()
+    dialog = Dialog(config.SCREEN_WIDTH // 2 - 200, config.SCREEN_HEIGHT // 2 - 100, 400, 200, "Level Complete!",
+                    button_configs=[{"text": "Next Level", "value": "next_level"},
+                                    {"text": "Retry", "value": "retry"},
+                                    {"text": "Main Menu", "value": "exit_to_main_menu"}])
+
+    print(f"{level_count} level buttons, {frames} frames each")
+    def draw_all(buttons):
+        def draw(surface):
+            for button in buttons:
+                button.draw(surface)
+        return draw
+
+    for label, render in (("menu buttons", draw_all(menu.level_buttons + [menu.back_button])),
+                          ("title buttons", draw_all(title.buttons)),
+                          ("dialog", dialog.draw),
+                          ("level select", menu.render),
+                          ("title", title.render)):
+        timings = []
+        for max_entries in (0, config.TEXT_CACHE_SIZE):
+            text_cache.max_entries = max_entries
+            text_cache.clear()
+            render(surface) # the first frame always rasterizes
+            started = time.perf_counter()
+            for _ in range(frames):
+                render(surface)
+            timings.append((time.perf_counter() - started) / frames)
+        print(f"  {label:<13} uncached {timings[0] * 1e6:8.1f} us   cached {timings[1] * 1e6:8.1f} us per frame")
+    print(f"  cache {text_cache.stats}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    level_count = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    run(frames, level_count)
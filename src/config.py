@@ -10,6 +10,13 @@ class Configurations:
 
         self.tile_size = 40
 
+        # Tile sizes (pixels) the game view can zoom between, and how many tiles the camera
+        # keeps between the player and the edge of the view before it scrolls
+        self.CAMERA_ZOOM_TILE_SIZES = (10, 20, 40, 80)
+        self.CAMERA_EDGE_MARGIN = 4
+        # How fast a new hint path is drawn in, tiles per second; 0 shows it all at once
+        self.HINT_REVEAL_TILES_PER_SECOND = 120
+
         self.START_TILE = 'S'
         self.WALL_TILE = 'W'
         self.DESTINATION_TILE = 'D'
@@ -20,11 +27,71 @@ class Configurations:
         self.DEFAULT_FUEL_CONSUMPTION_PER_MOVE = 1
         self.HINT_BATTERY_COST_PER_USE = 1
 
+        # Multi-stop hint routing: exact ordering up to this many destinations,
+        # heuristic ordering beyond it. The budget (seconds) caps ordering work per hint.
+        self.HINT_ROUTE_EXACT_LIMIT = 10
+        self.HINT_ROUTE_TIME_BUDGET = 0.05
+
+        # Levels precompute a distance field per destination while this many
+        # (destinations x tiles) cells or fewer; bigger levels search on demand.
+        self.DISTANCE_FIELD_MAX_CELLS = 4_000_000
+
+        # Maps up to this many tiles may use Jump Point Search for hints over uniform-cost ground.
+        # On mixed-cost maps it is only tried inside start/goal bounding boxes up to
+        # JUMP_POINT_SEARCH_MAX_BOX_TILES, since a straight-line-length path is rare in big ones.
+        self.JUMP_POINT_SEARCH_MAX_TILES = 4_000_000
+        self.JUMP_POINT_SEARCH_MAX_BOX_TILES = 4096
+
+        # Levels with at least this many tiles and no distance fields get an HPA* cluster
+        # hierarchy at load, and hints search its cluster entrances before refining locally. Runs of open border tiles at
+        # least HPA_WIDE_ENTRANCE long get an entrance at each end instead of one in the middle.
+        self.HPA_MIN_TILES = 1_000_000
+        self.HPA_CLUSTER_SIZE = 32
+        self.HPA_WIDE_ENTRANCE = 6
+
+        # Parsed levels LevelLoader keeps in memory, and whether starting a level loads the
+        # next one into that cache in the background
+        self.LEVEL_CACHE_SIZE = 16
+        self.LEVEL_PREFETCH_NEXT = True
+
+        # Level files at least this big are parsed incrementally in chunks of LEVEL_STREAM_CHUNK_BYTES
+        self.LEVEL_STREAM_MIN_BYTES = 16 * 1024 * 1024
+        self.LEVEL_STREAM_CHUNK_BYTES = 1024 * 1024
+
+        # Seconds the level loading thread may hold the interpreter at a time while a level
+        # loads in the background; short slices keep the render loop at its FPS target
+        self.LEVEL_LOAD_SWITCH_INTERVAL = 0.001
+
+        # Seconds ProgressManager's writer waits after a save before writing it to disk, so
+        # saves in quick succession become one write
+        self.PROGRESS_FLUSH_DELAY = 0.5
+
+        # Rendered text surfaces kept for reuse by labels, buttons, dialogs and the HUD
+        self.TEXT_CACHE_SIZE = 256
+
+        # Replays per task sent to a replay validation worker process
+        self.REPLAY_CHUNK_SIZE = 512
+
+        # Procedurally generated levels: default size and destination count, and per difficulty
+        # (fuel above the optimum as a fraction of it, hint battery per destination)
+        self.GENERATED_LEVEL_WIDTH = 64
+        self.GENERATED_LEVEL_HEIGHT = 48
+        self.GENERATED_LEVEL_DESTINATIONS = 8
+        # Layouts LevelGenerator tries for a level before giving up on fitting its destinations
+        self.GENERATED_LEVEL_MAX_LAYOUTS = 100
+        self.GENERATED_LEVEL_DIFFICULTIES = {
+            "easy": (0.5, 1.0),
+            "normal": (0.25, 0.5),
+            "hard": (0.1, 0.25),
+            "expert": (0.0, 0.0),
+        }
+
         self.GAME_STATE_PLAYING = "playing"
         self.GAME_STATE_CONFIRM_HINT = "confirm_hint"
         self.GAME_STATE_PAUSED = "paused"
         self.GAME_STATE_LEVEL_COMPLETE = "level_complete"
         self.GAME_STATE_GAME_OVER = "game_over"
+        self.GAME_STATE_LOADING = "loading"
 
         self.PLAYER_ACTION_MOVE_UP = 'w'
         self.PLAYER_ACTION_MOVE_DOWN = 's'
@@ -0,0 +1,181 @@
+import hashlib
+import heapq
+import struct
+import sys
+import zlib
+from array import array
+from core.tile_rules import encode_grid, get_cost_table
+
+UNREACHABLE = -1
+NO_HOP = 255
+HOP_MOVES = [(0, -1), (0, 1), (-1, 0), (1, 0)] # (dx, dy) indexed by hop code
+
+SIDECAR_MAGIC = b"ADF1"
+SIDECAR_HEADER = struct.Struct("<4sIII20s") # magic, width, height, field count, grid hash
+SIDECAR_DEST = struct.Struct("<II")
+
+def grid_content_hash(terrain) -> bytes:
+    # identifies a map layout; fields only depend on the tiles, not on fuel/battery/name
+    digest = hashlib.sha1(struct.pack("<II", terrain.shape[1], terrain.shape[0]))
+    digest.update(terrain.tobytes())
+    return digest.digest()
+
+class DistanceField:
+    # Fuel cost from every tile to one destination plus the first move to make from there.
+    # Positions are (x, y) like HintProvider.
+    def __init__(self, destination, width, height, costs, next_hops):
+        self.destination = destination
+        self.width = width
+        self.height = height
+        self.costs = costs          # array('i'), UNREACHABLE where the destination cannot be reached
+        self.next_hops = next_hops  # bytearray of HOP_MOVES indices, NO_HOP at the destination/unreachable
+
+    def cost_from(self, position) -> int | None:
+        x, y = position
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        cost = self.costs[y * self.width + x]
+        return None if cost == UNREACHABLE else cost
+
+    def path_from(self, position) -> list[tuple[int, int]]:
+        # follows the next-hop table, O(path length)
+        if self.cost_from(position) is None:
+            return []
+        x, y = position
+        path = [(x, y)]
+        hop = self.next_hops[y * self.width + x]
+        while hop != NO_HOP:
+            dx, dy = HOP_MOVES[hop]
+            x += dx
+            y += dy
+            path.append((x, y))
+            hop = self.next_hops[y * self.width + x]
+        return path
+
+class DistanceFields:
+    # All destination fields of one level, keyed by destination (x, y).
+    def __init__(self, content_hash, width, height, fields):
+        self.content_hash = content_hash
+        self.width = width
+        self.height = height
+        self.fields = fields
+
+    def __contains__(self, destination):
+        return destination in self.fields
+
+    def get(self, destination) -> DistanceField | None:
+        return self.fields.get(destination)
+
+    def cost(self, start, destination) -> int | None:
+        field = self.fields.get(destination)
+        return field.cost_from(start) if field else None
+
+    def path(self, start, destination) -> list[tuple[int, int]]:
+        field = self.fields.get(destination)
+        return field.path_from(start) if field else []
+
+    def to_bytes(self) -> bytes:
+        chunks = [SIDECAR_HEADER.pack(SIDECAR_MAGIC, self.width, self.height, len(self.fields), self.content_hash)]
+        for destination, field in self.fields.items():
+            costs = array('i', field.costs)
+            if sys.byteorder == "big":
+                costs.byteswap()
+            chunks.append(SIDECAR_DEST.pack(*destination))
+            chunks.append(costs.tobytes())
+            chunks.append(bytes(field.next_hops))
+        return zlib.compress(b"".join(chunks))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "DistanceFields":
+        try:
+            data = zlib.decompress(data)
+            magic, width, height, count, content_hash = SIDECAR_HEADER.unpack_from(data, 0)
+        except (zlib.error, struct.error) as e:
+            raise ValueError(f"Corrupt distance field sidecar: {e}")
+        if magic != SIDECAR_MAGIC:
+            raise ValueError("Not a distance field sidecar.")
+
+        tiles = width * height
+        offset = SIDECAR_HEADER.size
+        fields = {}
+        for _ in range(count):
+            if offset + SIDECAR_DEST.size + tiles * 5 > len(data):
+                raise ValueError("Distance field sidecar is truncated.")
+            destination = SIDECAR_DEST.unpack_from(data, offset)
+            offset += SIDECAR_DEST.size
+            costs = array('i')
+            costs.frombytes(data[offset:offset + tiles * costs.itemsize])
+            if sys.byteorder == "big":
+                costs.byteswap()
+            offset += tiles * costs.itemsize
+            next_hops = bytearray(data[offset:offset + tiles])
+            offset += tiles
+            fields[destination] = DistanceField(destination, width, height, costs, next_hops)
+        if offset != len(data):
+            raise ValueError("Distance field sidecar has trailing or missing data.")
+        return cls(content_hash, width, height, fields)
+
+def compute_distance_field(map_data, destination, cost_table=None) -> DistanceField:
+    # reverse dijkstra out of the destination: stepping from a tile into its neighbour
+    # costs the neighbour's fuel, so relaxing backwards charges the tile being left
+    if cost_table is None:
+        cost_table = get_cost_table(map_data)
+    width, height, tile_costs = cost_table
+
+    costs = array('i', [UNREACHABLE]) * (width * height)
+    next_hops = bytearray([NO_HOP]) * (width * height)
+
+    dest_x, dest_y = destination
+    start = dest_y * width + dest_x
+    if not tile_costs[start]:
+        return DistanceField(destination, width, height, costs, next_hops)
+
+    costs[start] = 0
+    open_set_heap = [(0, start)]
+    while open_set_heap:
+        cost, index = heapq.heappop(open_set_heap)
+        if cost > costs[index]:
+            continue
+
+        neighbor_cost = cost + tile_costs[index]
+        x = index % width
+        # (neighbour index, hop the neighbour takes to get here)
+        if index >= width:
+            _relax(index - width, 1, neighbor_cost, tile_costs, costs, next_hops, open_set_heap)
+        if index < (height - 1) * width:
+            _relax(index + width, 0, neighbor_cost, tile_costs, costs, next_hops, open_set_heap)
+        if x > 0:
+            _relax(index - 1, 3, neighbor_cost, tile_costs, costs, next_hops, open_set_heap)
+        if x < width - 1:
+            _relax(index + 1, 2, neighbor_cost, tile_costs, costs, next_hops, open_set_heap)
+
+    return DistanceField(destination, width, height, costs, next_hops)
+
+def _relax(neighbor, hop, neighbor_cost, tile_costs, costs, next_hops, open_set_heap):
+    if not tile_costs[neighbor]:
+        return
+    current = costs[neighbor]
+    if current == UNREACHABLE or neighbor_cost < current:
+        costs[neighbor] = neighbor_cost
+        next_hops[neighbor] = hop
+        heapq.heappush(open_set_heap, (neighbor_cost, neighbor))
+
+def compute_distance_fields(map_data, destinations, content_hash=None) -> DistanceFields:
+    # map_data is a LevelData or a plain list of rows
+    if content_hash is None:
+        content_hash = grid_content_hash(map_data.terrain if hasattr(map_data, "terrain") else encode_grid(map_data))
+    cost_table = get_cost_table(map_data)
+    width, height, _ = cost_table
+    fields = {dest: compute_distance_field(map_data, dest, cost_table) for dest in destinations}
+    return DistanceFields(content_hash, width, height, fields)
+
+if __name__ == "__main__":
+    test_map = [
+        "S33D",
+        "1111",
+    ]
+    fields = compute_distance_fields(test_map, [(3, 0)])
+    print(f"Fuel from (0, 0): {fields.cost((0, 0), (3, 0))}, path: {fields.path((0, 0), (3, 0))}")
+
+    restored = DistanceFields.from_bytes(fields.to_bytes())
+    print(f"Round-tripped path: {restored.path((0, 0), (3, 0))}")
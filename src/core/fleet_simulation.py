@@ -0,0 +1,166 @@
+import numpy as np
+from core.simulation import HINT_ACTION, SimulationLevel, SimulationResult
+from config import Configurations
+
+config = Configurations()
+
+# Many independent robots on one level, stepped together: positions, fuel, battery and
+# deliveries of N agents live in NumPy arrays and every tick applies one action per agent
+# with a handful of array operations. The rules are those of simulate() (and so of
+# GameManager + Player), and results() matches simulate() agent for agent.
+
+# outcome codes held in FleetSimulation.outcomes
+PLAYING, LEVEL_COMPLETE, GAME_OVER = 0, 1, 2
+OUTCOME_STATES = (config.GAME_STATE_PLAYING, config.GAME_STATE_LEVEL_COMPLETE, config.GAME_STATE_GAME_OVER)
+
+# action codes: 0-3 are moves, OTHER counts as a blocked move, NO_ACTION is no action at all.
+# No character maps to NO_ACTION; run() pads shorter action strings with it after decoding,
+# so every byte, '\x00' included, means what it means to simulate().
+MOVE_UP, MOVE_DOWN, MOVE_LEFT, MOVE_RIGHT, OTHER, HINT, NO_ACTION = range(7)
+
+class FleetSimulation:
+    def __init__(self, level, num_agents):
+        if not isinstance(level, SimulationLevel):
+            level = SimulationLevel(level)
+        self.level = level
+        self.num_agents = num_agents
+
+        move_keys = (config.PLAYER_ACTION_MOVE_UP, config.PLAYER_ACTION_MOVE_DOWN,
+                     config.PLAYER_ACTION_MOVE_LEFT, config.PLAYER_ACTION_MOVE_RIGHT)
+        # next tile per action code and tile, -1 where nothing moves
+        self._steps = np.full((NO_ACTION + 1, level.width * level.height), -1, dtype=np.int32)
+        for code, key in enumerate(move_keys):
+            self._steps[code] = np.frombuffer(level.steps[key], dtype=np.int32)
+        self._costs = np.frombuffer(level.costs, dtype=np.int32)
+
+        # byte of an action character -> action code
+        self._action_codes = np.full(256, OTHER, dtype=np.int8)
+        for code, key in enumerate(move_keys):
+            self._action_codes[ord(key)] = code
+            self._action_codes[ord(key.upper())] = code
+        self._action_codes[ord(HINT_ACTION)] = HINT
+
+        # destination number (bit in delivered_mask) of each tile, -1 elsewhere
+        self._destination_index = np.full(level.width * level.height, -1, dtype=np.int32)
+        for index, bit in level.destination_bits.items():
+            self._destination_index[index] = bit.bit_length() - 1
+        self.reset()
+
+    def reset(self):
+        level = self.level
+        n = self.num_agents
+        self.positions = np.full(n, level.start_index, dtype=np.int32) # y * width + x
+        self.fuel = np.full(n, level.initial_fuel, dtype=np.int32)
+        self.battery = np.full(n, level.hint_battery, dtype=np.int32)
+        self.packages_left = np.full(n, level.num_packages, dtype=np.int32)
+        self.delivered = np.zeros((n, len(level.destination_tiles)), dtype=bool)
+        self.actions_used = np.zeros(n, dtype=np.int32)
+        self.outcomes = np.full(n, LEVEL_COMPLETE if level.num_packages == 0 else PLAYING, dtype=np.int8)
+
+    def _to_codes(self, actions):
+        # actions: a string/bytes with one character per agent, or a uint8 array of bytes
+        if isinstance(actions, str):
+            actions = actions.encode('ascii', 'replace')
+        if isinstance(actions, (bytes, bytearray)):
+            actions = np.frombuffer(actions, dtype=np.uint8)
+        if len(actions) != self.num_agents:
+            raise ValueError(f"Expected {self.num_agents} actions, got {len(actions)}.")
+        return self._action_codes[actions]
+
+    def step(self, actions) -> int:
+        # applies one action per agent; agents that already won or lost ignore theirs.
+        # Returns how many agents are still playing.
+        return self._step_codes(self._to_codes(actions))
+
+    def _step_codes(self, codes):
+        fuel = self.fuel
+        outcomes = self.outcomes
+        active = (outcomes == PLAYING) & (codes != NO_ACTION)
+        self.actions_used += active
+
+        hints = active & (codes == HINT)
+        if hints.any():
+            hint_cost = config.HINT_BATTERY_COST_PER_USE
+            self.battery[hints & (self.battery >= hint_cost)] -= hint_cost
+
+        # moves, and unknown characters which count as blocked moves, end the game on an empty tank
+        tries_move = active & (codes <= OTHER)
+        out_of_fuel = tries_move & (fuel <= 0)
+        if out_of_fuel.any():
+            outcomes[out_of_fuel] = GAME_OVER
+            tries_move &= ~out_of_fuel
+
+        # whole-fleet lookups; rows past MOVE_RIGHT of the step table are all -1
+        targets = self._steps[codes, self.positions]
+        moved = tries_move & (targets >= 0)
+        np.copyto(self.positions, targets, where=moved)
+        fuel -= self._costs[targets] * moved
+
+        arrived = moved & (self._destination_index[targets] >= 0)
+        if arrived.any():
+            agents = np.flatnonzero(arrived)
+            destinations = self._destination_index[targets[agents]]
+            first_visit = ~self.delivered[agents, destinations]
+            agents = agents[first_visit]
+            self.delivered[agents, destinations[first_visit]] = True
+            self.packages_left[agents] -= 1
+            # all packages delivered wins before a negative tank loses
+            won = agents[self.packages_left[agents] == 0]
+            outcomes[won] = LEVEL_COMPLETE
+            moved[won] = False
+        outcomes[moved & (fuel < 0)] = GAME_OVER
+        return int(np.count_nonzero(outcomes == PLAYING))
+
+    def run(self, action_logs) -> int:
+        # action_logs: one action string per agent, or a (ticks, agents) uint8 array.
+        # Agents whose strings are shorter than the longest sit out the ticks after theirs.
+        if isinstance(action_logs, np.ndarray):
+            if action_logs.ndim != 2 or action_logs.shape[1] != self.num_agents:
+                raise ValueError(f"Expected a (ticks, {self.num_agents}) action array, got {action_logs.shape}.")
+            all_codes = self._action_codes[action_logs]
+        else:
+            if len(action_logs) != self.num_agents:
+                raise ValueError(f"Expected {self.num_agents} action logs, got {len(action_logs)}.")
+            encoded = [log.encode('ascii', 'replace') if isinstance(log, str) else bytes(log) for log in action_logs]
+            ticks = max((len(log) for log in encoded), default=0)
+            all_codes = np.full((ticks, self.num_agents), NO_ACTION, dtype=np.int8)
+            for agent, log in enumerate(encoded):
+                all_codes[:len(log), agent] = self._action_codes[np.frombuffer(log, dtype=np.uint8)]
+        playing = int(np.count_nonzero(self.outcomes == PLAYING))
+        for codes in all_codes:
+            if playing == 0:
+                break
+            playing = self._step_codes(codes)
+        return playing
+
+    def result(self, agent) -> SimulationResult:
+        width = self.level.width
+        position = int(self.positions[agent])
+        delivered_mask = 0
+        for bit in np.flatnonzero(self.delivered[agent]):
+            delivered_mask |= 1 << int(bit)
+        return SimulationResult(OUTCOME_STATES[self.outcomes[agent]], int(self.fuel[agent]), int(self.battery[agent]),
+                                int(self.packages_left[agent]), (position % width, position // width),
+                                delivered_mask, int(self.actions_used[agent]))
+
+    def results(self) -> list[SimulationResult]:
+        return [self.result(agent) for agent in range(self.num_agents)]
+
+if __name__ == "__main__":
+    import random
+    import time
+    from core.level_loader import LevelLoader
+    from core.simulation import simulate
+
+    level = SimulationLevel(LevelLoader(prepare_routing=False).load_level_by_number(1))
+    rng = random.Random(0)
+    logs = ["".join(rng.choice("wasdh") for _ in range(300)) for _ in range(5000)]
+
+    fleet = FleetSimulation(level, len(logs))
+    started = time.perf_counter()
+    fleet.run(logs)
+    elapsed = time.perf_counter() - started
+    print(f"{len(logs)} agents, {int(fleet.actions_used.sum())} actions in {elapsed:.3f}s "
+          f"({fleet.actions_used.sum() / elapsed / 1e6:.1f}M actions/s)")
+    print(f"Outcomes: {dict(zip(OUTCOME_STATES, np.bincount(fleet.outcomes, minlength=3).tolist()))}")
+    print(f"Matches simulate(): {all(fleet.result(i) == simulate(level, log) for i, log in enumerate(logs))}")
@@ -1,7 +1,13 @@
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from core.player import Player
 from core.progress_manager import ProgressManager
-from core.level_loader import LevelData, LevelLoader
+from core.level_loader import LevelData, LevelLoadCancelled, LevelLoader
 from core.hint_provider import HintProvider
+from core.route_planner import RoutePlanner
+from core.incremental_planner import IncrementalFields
+from core.hierarchical_pathfinder import HierarchyFields
+from core.tile_rules import get_fuel_cost, DESTINATION_CODE
 from config import Configurations
 
 config = Configurations()
@@ -26,14 +32,136 @@ class GameManager:
 
         self.active_hint_path: list[tuple[int, int]] | None = None
         self.hint_provider = hint_provider_instance
+        self.route_planner = RoutePlanner(hint_provider_instance)
+        # levels without precomputed distance fields plan hints over their HPA* hierarchy when
+        # they have one, else with a D* Lite planner per pending destination
+        self.incremental_fields: IncrementalFields | HierarchyFields | None = None
+
+        # Levels load on a worker thread so the render loop keeps its frame rate; the main
+        # thread starts the level once poll_level_load finds the future done. Each load gets
+        # a generation; a superseded one stops at its next progress report and never starts,
+        # so the single worker is free for the load that replaced it.
+        self._level_load_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-load")
+        self.level_load_future: Future | None = None
+        self._level_load_generation = 0
+        self.loading_progress: tuple[str, float] = ("", 0.0)
+        self._saved_switch_interval: float | None = None
 
     def load_and_start_level(self, level_id: int):
         print(f"GM: Attempting to load level ID: {level_id}")
+        self.cancel_level_load()
         self.current_level_id = level_id
         level_data = self.level_loader.load_level_by_number(level_id)
+        self._start_level(level_id, level_data, self._build_incremental_fields(level_data))
+
+    def load_level_async(self, level_id: int) -> Future:
+        # returns a future for (LevelData or None, IncrementalFields or None); the game stays
+        # in GAME_STATE_LOADING until poll_level_load starts the level
+        print(f"GM: Loading level ID {level_id} in the background")
+        self.cancel_level_load()
+        self.current_level_id = level_id
+        self.is_level_loaded = False
+        self.active_hint_path = None
+        self.current_game_state = config.GAME_STATE_LOADING
+        self.loading_progress = ("Waiting for level loader", 0.0)
+        if self._saved_switch_interval is None:
+            # shorter GIL slices for the loader, so the render loop wakes on time
+            self._saved_switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(config.LEVEL_LOAD_SWITCH_INTERVAL)
+        self.level_load_future = self._level_load_executor.submit(
+            self._prepare_level, level_id, self._level_load_generation)
+        return self.level_load_future
+
+    def poll_level_load(self) -> bool:
+        # called from the main loop; True once the level being loaded has been started
+        future = self.level_load_future
+        if future is None or not future.done():
+            return False
+        self.level_load_future = None
+        self._restore_switch_interval()
+        try:
+            level_data, incremental_fields = future.result()
+        except Exception as e:
+            print(f"GM: Loading level ID {self.current_level_id} failed: {e}")
+            level_data, incremental_fields = None, None
+        self._start_level(self.current_level_id, level_data, incremental_fields)
+        return self.is_level_loaded
+
+    def cancel_level_load(self):
+        # a load already running gives up at its next progress report
+        self._level_load_generation += 1
+        if self.level_load_future is not None:
+            self.level_load_future.cancel()
+            self.level_load_future = None
+            if self.current_game_state == config.GAME_STATE_LOADING:
+                self.current_game_state = config.GAME_STATE_PLAYING
+        self._restore_switch_interval()
+
+    def _restore_switch_interval(self):
+        if self._saved_switch_interval is not None:
+            sys.setswitchinterval(self._saved_switch_interval)
+            self._saved_switch_interval = None
+
+    def is_loading(self) -> bool:
+        return self.level_load_future is not None
+
+    def get_loading_progress(self) -> tuple[str, float]:
+        # (stage, fraction done) of the level being loaded
+        return self.loading_progress
+
+    def _prepare_level(self, level_id: int, generation: int):
+        # runs on the loader thread; everything here must leave the game's state alone
+        def progress(stage, fraction):
+            if generation != self._level_load_generation:
+                raise LevelLoadCancelled(f"load of level ID {level_id} was superseded")
+            self.loading_progress = (stage, fraction)
+
+        progress("Reading level", 0.0) # a load queued behind a cancelled one may be stale too
+        level_data = self.level_loader.load_level_by_number(level_id, progress)
+        incremental_fields = None
+        if level_data is not None and level_data.distance_fields is None:
+            progress("Preparing route planner", 0.9)
+            incremental_fields = self._build_incremental_fields(level_data)
+        progress("Starting level", 1.0)
+        return level_data, incremental_fields
+
+    def _build_incremental_fields(self, level_data: LevelData | None) -> IncrementalFields | HierarchyFields | None:
+        # levels without precomputed distance fields plan hints over the level's hierarchy, or
+        # with D* Lite when it is too small to have one
+        if level_data is None or level_data.distance_fields is not None:
+            return None
+        start_row, start_col = level_data.player_start_pos
+        destinations_cr = [(c, r) for r, c in level_data.destination_coords]
+        if level_data.hierarchy is not None:
+            return HierarchyFields(level_data.hierarchy, destinations_cr)
+        return IncrementalFields(level_data, destinations_cr, start=(start_col, start_row))
+
+    def update_tiles(self, changes):
+        # changes maps (x, y) -> new road or wall tile character, e.g. a street closing
+        # mid-level; hints planned after it route over the changed map
+        level_data = self.current_level_data
+        if level_data is None:
+            return
+        level_data.update_tiles(changes)
+        self.route_planner.reset()
+        self.active_hint_path = None
+        if self.incremental_fields is not None:
+            self.incremental_fields.update_tiles(level_data, changes.keys())
+            return
+        # the level just lost its distance fields, so it plans like one that never had any
+        self.incremental_fields = self._build_incremental_fields(level_data)
+        if self.incremental_fields is not None:
+            for r, c in self.delivered_packages_coords:
+                self.incremental_fields.remove_destination((c, r))
+            if self.player is not None:
+                self.incremental_fields.set_start((self.player.x, self.player.y))
+
+    def _start_level(self, level_id: int, level_data: LevelData | None, incremental_fields: IncrementalFields | HierarchyFields | None):
         if level_data:
-            self._initialize_level_state(level_data)
+            self._initialize_level_state(level_data, incremental_fields)
             self.current_game_state = config.GAME_STATE_PLAYING
+            if config.LEVEL_PREFETCH_NEXT:
+                self.level_loader.prefetch_level(level_id + 1)
         else:
             print(f"GM: Failed to load level ID: {level_id}")
             self.is_level_loaded = False
@@ -45,7 +173,7 @@ class GameManager:
     def get_total_defined_levels(self) -> int:
         return self.level_loader.get_available_levels_count()
 
-    def _initialize_level_state(self, level_data: LevelData):
+    def _initialize_level_state(self, level_data: LevelData, incremental_fields: IncrementalFields | HierarchyFields | None = None):
         self.current_level_data = level_data
         
         start_row, start_col = self.current_level_data.player_start_pos
@@ -61,6 +189,10 @@ class GameManager:
         self.destination_tiles_coords = list(self.current_level_data.destination_coords)
         self.delivered_packages_coords = set()
         self.active_hint_path = None
+        self.route_planner.reset()
+        self.incremental_fields = incremental_fields
+        if self.incremental_fields is None:
+            self.incremental_fields = self._build_incremental_fields(level_data)
 
         self.is_level_loaded = True
 
@@ -78,10 +210,7 @@ class GameManager:
             self._process_package_delivery_at(current_pos_tuple)
     
     def _calculate_fuel_cost(self, tile_char: str) -> int:
-        if tile_char.isdigit():
-            cost = int(tile_char)
-            return cost if cost > 0 else config.DEFAULT_FUEL_CONSUMPTION_PER_MOVE
-        return config.DEFAULT_FUEL_CONSUMPTION_PER_MOVE
+        return get_fuel_cost(tile_char)
     
     def _handle_player_move_action(self, direction_key: str) -> bool:
         if not self.is_level_loaded or self.current_game_state != config.GAME_STATE_PLAYING:
@@ -93,19 +222,20 @@ class GameManager:
             self._update_game_rules_and_status()
             return False
 
-        self.player.update_state(self.current_level_data.grid)
+        self.player.update_state_from_mask(self.current_level_data.passable)
         moved = self.player.move(direction_key)
         
         if moved:
             player_r, player_c = self.player.y, self.player.x
-            tile_player_is_on = self.current_level_data.grid[player_r][player_c]
             
-            fuel_cost = self._calculate_fuel_cost(tile_player_is_on)
+            fuel_cost = int(self.current_level_data.cost_grid[player_r, player_c])
             self.current_fuel -= fuel_cost
             
             current_pos_tuple = (player_r, player_c)
+            if self.incremental_fields is not None:
+                self.incremental_fields.set_start((player_c, player_r))
 
-            if tile_player_is_on == config.DESTINATION_TILE:
+            if self.current_level_data.terrain[player_r, player_c] == DESTINATION_CODE:
                 if current_pos_tuple in self.destination_tiles_coords and \
                    current_pos_tuple not in self.delivered_packages_coords:
                     self._process_package_delivery_at(current_pos_tuple)
@@ -119,6 +249,8 @@ class GameManager:
     def _process_package_delivery_at(self, coords: tuple[int, int]):
         self.packages_left_to_deliver -= 1
         self.delivered_packages_coords.add(coords)
+        if self.incremental_fields is not None:
+            self.incremental_fields.remove_destination((coords[1], coords[0]))
         print(f"GM: Package delivered at {coords}! Packages left: {self.packages_left_to_deliver}")
 
     def _update_game_rules_and_status(self):
@@ -201,10 +333,15 @@ class GameManager:
                     if (r,c) not in self.delivered_packages_coords:
                         pending_dest_cr.append((c,r)) 
 
-                self.active_hint_path = self.hint_provider.get_path(
-                    map_data=self.current_level_data.grid,
+                distance_fields = self.current_level_data.distance_fields
+                if distance_fields is None:
+                    distance_fields = self.incremental_fields
+
+                self.active_hint_path = self.route_planner.plan_route(
+                    map_data=self.current_level_data,
                     start_coords=player_pos_cr,
-                    end_coords=pending_dest_cr[0] 
+                    destinations=pending_dest_cr,
+                    distance_fields=distance_fields
                 )
             else:
                 print("GM: HintProvider not available or player/level data missing.")
@@ -223,7 +360,7 @@ class GameManager:
         
         elif choice == 'retry':
             if self.current_level_id is not None:
-                self.load_and_start_level(self.current_level_id)
+                self.load_level_async(self.current_level_id)
             else:
                  print("GM: Cannot retry, no current_level_id known.")
         
@@ -235,9 +372,9 @@ class GameManager:
                     num_available_levels = self.level_loader.get_available_levels_count()
 
                     if next_level_to_play < max_unlocked and next_level_to_play <= num_available_levels :
-                        self.load_and_start_level(next_level_to_play)
+                        self.load_level_async(next_level_to_play)
                     elif next_level_to_play == max_unlocked and next_level_to_play <= num_available_levels:
-                        self.load_and_start_level(next_level_to_play)
+                        self.load_level_async(next_level_to_play)
                     else:
                         print(f"GM: Cannot go to next level. Next: {next_level_to_play}, Max Unlocked: {max_unlocked}, Total Levels: {num_available_levels}")
                         self.is_level_loaded = False
@@ -245,6 +382,7 @@ class GameManager:
                     print("GM: Cannot go to next level, current_level_id is unknown.")
         
         elif choice == 'exit_to_main_menu':
+            self.cancel_level_load()
             self.is_level_loaded = False
             self.current_game_state = config.GAME_STATE_PLAYING
             print("GM: Requesting exit to main menu (handled by ScreenManager).")
@@ -267,6 +405,10 @@ class GameManager:
     def get_current_map_data(self) -> list[str] | None:
         return self.current_level_data.grid if self.current_level_data else None
 
+    def get_current_terrain(self):
+        # (height, width) uint8 array of tile codes, see LevelData.terrain
+        return self.current_level_data.terrain if self.current_level_data else None
+
     def get_player_position(self) -> tuple[int, int] | None:
         return self.player.get_location() if self.player else None
 
@@ -293,7 +435,7 @@ class GameManager:
         if not self.player or not self.current_level_data or self.game_over:
             return {"up": False, "down": False, "left": False, "right": False}
         
-        self.player.update_state(self.current_level_data.grid)
+        self.player.update_state_from_mask(self.current_level_data.passable)
         return {
             "up": self.player.move_up,
             "down": self.player.move_down,
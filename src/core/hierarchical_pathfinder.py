@@ -0,0 +1,461 @@
+import copy
+import heapq
+from core.tile_rules import MIN_TILE_FUEL_COST, UNIT_COST_TABLE, get_cost_table
+from config import Configurations
+
+config = Configurations()
+
+NOT_REACHED = 1 << 62
+
+# Hierarchical A* (HPA*) for maps too big to search tile by tile.
+#
+# The map is cut into square clusters. Every run of open tiles crossing the border between
+# two neighbouring clusters gets an entrance: the middle pair of the run, or both end pairs
+# for wide runs. Entrance tiles are the nodes of an abstract graph whose edges are the border
+# crossings plus the cheapest in-cluster cost between the entrances of one cluster. A query
+# searches that graph and then refines each edge with a search bounded to a single cluster.
+# Paths are near-optimal, since every crossing is forced through its run's entrance tiles.
+# Intra-cluster costs are worked out the first time a search reaches a cluster and kept
+# until its tiles change. For levels without distance fields LevelLoader calls precompute()
+# for the fuel-weighted costs hints use, so in-game searches never pay for them; on a
+# 1200x1200 city level that is about 9 s of loading, against seconds on whichever hint
+# first crosses the map otherwise.
+#
+# Positions are (x, y) like HintProvider; tiles are addressed by y * width + x.
+class HierarchicalPathfinder:
+    def __init__(self, map_data, cluster_size=None):
+        self.width, self.height, self.tile_costs = get_cost_table(map_data)
+        self.cluster_size = cluster_size or config.HPA_CLUSTER_SIZE
+        self.clusters_x = -(-self.width // self.cluster_size)
+        self.clusters_y = -(-self.height // self.cluster_size)
+
+        self._border_entrances = {}  # border -> [(tile, tile across the border), ...]
+        self._partners = {}          # entrance tile -> entrance tiles across its borders
+        self._cluster_nodes = {}     # cluster -> entrance tiles inside it, filled on demand
+        self._intra_edges = {False: {}, True: {}}  # weighted -> cluster -> {node: [(node, cost)]}
+
+        for border in self._all_borders():
+            self._build_border(border)
+
+    def _all_borders(self):
+        # ('x', cx, cy) separates cluster (cx, cy) from (cx + 1, cy), ('y', cx, cy) from (cx, cy + 1)
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                if cx + 1 < self.clusters_x:
+                    yield ('x', cx, cy)
+                if cy + 1 < self.clusters_y:
+                    yield ('y', cx, cy)
+
+    def _border_pairs(self, border):
+        axis, cx, cy = border
+        size = self.cluster_size
+        width = self.width
+        if axis == 'x':
+            x = (cx + 1) * size - 1
+            rows = range(cy * size, min(self.height, (cy + 1) * size))
+            return [(y * width + x, y * width + x + 1) for y in rows]
+        y = (cy + 1) * size - 1
+        cols = range(cx * size, min(width, (cx + 1) * size))
+        return [(y * width + x, (y + 1) * width + x) for x in cols]
+
+    def _border_clusters(self, border):
+        axis, cx, cy = border
+        return ((cx, cy), (cx + 1, cy) if axis == 'x' else (cx, cy + 1))
+
+    def _build_border(self, border):
+        for a, b in self._border_entrances.pop(border, []):
+            self._unlink(a, b)
+            self._unlink(b, a)
+
+        tile_costs = self.tile_costs
+        entrances = []
+        run = []
+        for a, b in self._border_pairs(border) + [(None, None)]:
+            if a is not None and tile_costs[a] and tile_costs[b]:
+                run.append((a, b))
+                continue
+            if len(run) >= config.HPA_WIDE_ENTRANCE:
+                entrances.extend((run[0], run[-1]))
+            elif run:
+                entrances.append(run[len(run) // 2])
+            run = []
+
+        for a, b in entrances:
+            self._partners.setdefault(a, []).append(b)
+            self._partners.setdefault(b, []).append(a)
+        if entrances:
+            self._border_entrances[border] = entrances
+
+    def _unlink(self, tile, partner):
+        partners = self._partners[tile]
+        partners.remove(partner)
+        if not partners:
+            del self._partners[tile]
+
+    def _cluster_of(self, index):
+        return (index % self.width // self.cluster_size, index // self.width // self.cluster_size)
+
+    def _nodes_of(self, cluster):
+        nodes = self._cluster_nodes.get(cluster)
+        if nodes is None:
+            cx, cy = cluster
+            nodes = set()
+            # a cluster's entrances sit on the near side of its right/bottom borders and on
+            # the far side of its left/top borders
+            for border, side in ((('x', cx, cy), 0), (('y', cx, cy), 0),
+                                 (('x', cx - 1, cy), 1), (('y', cx, cy - 1), 1)):
+                for pair in self._border_entrances.get(border, ()):
+                    nodes.add(pair[side])
+            nodes = sorted(nodes)
+            self._cluster_nodes[cluster] = nodes
+        return nodes
+
+    def _cluster_block(self, cluster, weighted):
+        # the cluster's entering costs copied out with a ring of walls around them, so searches
+        # inside it need no bounds checks. Returns (block, block width, origin x, origin y).
+        size = self.cluster_size
+        width = self.width
+        tile_costs = self.tile_costs
+        cx, cy = cluster
+        min_x, min_y = cx * size, cy * size
+        cluster_width = min(width, min_x + size) - min_x
+        wall_row = bytes(cluster_width + 2)
+        rows = [wall_row]
+        for y in range(min_y, min(self.height, min_y + size)):
+            row_start = y * width + min_x
+            rows.append(b"\0" + tile_costs[row_start:row_start + cluster_width] + b"\0")
+        rows.append(wall_row)
+        block = b"".join(rows)
+        if not weighted:
+            block = block.translate(UNIT_COST_TABLE)
+        return block, cluster_width + 2, min_x - 1, min_y - 1
+
+    def _to_block(self, block_info, index):
+        _, block_width, origin_x, origin_y = block_info
+        return (index // self.width - origin_y) * block_width + index % self.width - origin_x
+
+    def _from_block(self, block_info, local):
+        _, block_width, origin_x, origin_y = block_info
+        return (origin_y + local // block_width) * self.width + origin_x + local % block_width
+
+    def _block_search(self, block_info, source, reverse=False, targets=None):
+        # dijkstra over one cluster block between block indices, stopping early once every
+        # index in targets is settled. Forward costs run from source to each tile; reverse
+        # costs run from each tile to source and parents then point towards source.
+        block, block_width = block_info[0], block_info[1]
+        costs = [NOT_REACHED] * len(block)
+        parents = [-1] * len(block)
+        costs[source] = 0
+        remaining = set(targets) if targets else None
+        open_set_heap = [(0, source)]
+        while open_set_heap:
+            cost, index = heapq.heappop(open_set_heap)
+            if cost > costs[index]:
+                continue
+            if remaining is not None and index in remaining:
+                remaining.remove(index)
+                if not remaining:
+                    break
+
+            leave_cost = block[index]
+            for neighbor in (index - block_width, index + block_width, index - 1, index + 1):
+                enter_cost = block[neighbor]
+                if not enter_cost:
+                    continue
+                tentative_cost = cost + (leave_cost if reverse else enter_cost)
+                if tentative_cost < costs[neighbor]:
+                    costs[neighbor] = tentative_cost
+                    parents[neighbor] = index
+                    heapq.heappush(open_set_heap, (tentative_cost, neighbor))
+        return costs, parents
+
+    def _get_intra_edges(self, cluster, weighted):
+        edges = self._intra_edges[weighted].get(cluster)
+        if edges is None:
+            nodes = self._nodes_of(cluster)
+            edges = {node: [] for node in nodes}
+            block_info = self._cluster_block(cluster, weighted)
+            block = block_info[0]
+            local_nodes = [self._to_block(block_info, node) for node in nodes]
+            # Entering costs make a path's reverse cost differ from its forward cost by
+            # cost(a) - cost(b) whatever the path, so the cheapest a -> b path reversed is the
+            # cheapest b -> a path and each pair only needs one search.
+            for i in range(len(nodes) - 1):
+                local = local_nodes[i]
+                costs, _ = self._block_search(block_info, local, targets=local_nodes[i + 1:])
+                for j in range(i + 1, len(nodes)):
+                    other_local = local_nodes[j]
+                    cost = costs[other_local]
+                    if cost == NOT_REACHED:
+                        continue
+                    edges[nodes[i]].append((nodes[j], cost))
+                    edges[nodes[j]].append((nodes[i], cost + block[local] - block[other_local]))
+            self._intra_edges[weighted][cluster] = edges
+        return edges
+
+    def precompute(self, weighted=True, progress=None):
+        # fills in every cluster's intra-cluster costs instead of waiting for searches to need
+        # them; progress, if given, is called with the fraction done after each row of clusters
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                self._get_intra_edges((cx, cy), weighted)
+            if progress is not None:
+                progress((cy + 1) / self.clusters_y)
+
+    def copy(self) -> "HierarchicalPathfinder":
+        # an independent hierarchy for a copy of the map, so one copy's update_tiles leaves the
+        # other alone; intra-cluster costs worked out so far are shared, never changed in place
+        clone = copy.copy(self)
+        clone._border_entrances = dict(self._border_entrances)
+        clone._partners = {tile: list(partners) for tile, partners in self._partners.items()}
+        clone._cluster_nodes = dict(self._cluster_nodes)
+        clone._intra_edges = {weighted: dict(edges) for weighted, edges in self._intra_edges.items()}
+        return clone
+
+    def update_tiles(self, map_data, positions):
+        # re-reads the cost table after the tiles at positions ((x, y)) changed and rebuilds
+        # only the borders and clusters those tiles touch
+        width, height, tile_costs = get_cost_table(map_data)
+        if (width, height) != (self.width, self.height):
+            raise ValueError("update_tiles cannot change the map size.")
+        self.tile_costs = tile_costs
+
+        borders, clusters = self._touched_by(positions)
+        for border in borders:
+            self._build_border(border)
+        for cluster in clusters:
+            self._cluster_nodes.pop(cluster, None)
+            for edges in self._intra_edges.values():
+                edges.pop(cluster, None)
+
+    def clusters_touched(self, positions) -> set[tuple[int, int]]:
+        # clusters whose entrances or intra-cluster costs update_tiles(positions) rebuilds
+        return self._touched_by(positions)[1]
+
+    def _touched_by(self, positions):
+        size = self.cluster_size
+        borders = set()
+        clusters = set()
+        for x, y in positions:
+            cx, cy = x // size, y // size
+            clusters.add((cx, cy))
+            if x % size == size - 1 and cx + 1 < self.clusters_x:
+                borders.add(('x', cx, cy))
+            if x % size == 0 and cx > 0:
+                borders.add(('x', cx - 1, cy))
+            if y % size == size - 1 and cy + 1 < self.clusters_y:
+                borders.add(('y', cx, cy))
+            if y % size == 0 and cy > 0:
+                borders.add(('y', cx, cy - 1))
+        for border in borders:
+            clusters.update(self._border_clusters(border))
+        return borders, clusters
+
+    def find_path(self, start, goal, weighted=False):
+        # (path of (x, y) tiles, expanded, peak_open); the path is [] when goal cannot be reached
+        width = self.width
+        tile_costs = self.tile_costs
+        start_index = start[1] * width + start[0]
+        goal_index = goal[1] * width + goal[0]
+        start_cluster = self._cluster_of(start_index)
+        goal_cluster = self._cluster_of(goal_index)
+
+        # temporary edges joining start and goal to the entrances of their clusters
+        start_block = self._cluster_block(start_cluster, weighted)
+        start_costs, start_parents = self._block_search(start_block, self._to_block(start_block, start_index))
+        start_edges = []
+        for node in self._nodes_of(start_cluster) + [goal_index]:
+            if node != start_index and self._cluster_of(node) == start_cluster:
+                cost = start_costs[self._to_block(start_block, node)]
+                if cost != NOT_REACHED:
+                    start_edges.append((node, cost))
+
+        goal_block = self._cluster_block(goal_cluster, weighted)
+        goal_costs, goal_parents = self._block_search(goal_block, self._to_block(goal_block, goal_index), reverse=True)
+        goal_edges = {}
+        for node in self._nodes_of(goal_cluster):
+            cost = goal_costs[self._to_block(goal_block, node)]
+            if node != goal_index and cost != NOT_REACHED:
+                goal_edges[node] = cost
+
+        goal_x, goal_y = goal
+        heuristic_scale = MIN_TILE_FUEL_COST if weighted else 1
+        start_h = (abs(start[0] - goal_x) + abs(start[1] - goal_y)) * heuristic_scale
+        open_set_heap = [(start_h, start_h, start_index)]
+        g_costs = {start_index: 0}
+        parents = {start_index: None}
+        closed_set = set()
+        expanded = 0
+        peak_open = 1
+
+        while open_set_heap:
+            if len(open_set_heap) > peak_open:
+                peak_open = len(open_set_heap)
+            _, _, node = heapq.heappop(open_set_heap)
+            if node in closed_set:
+                continue
+            closed_set.add(node)
+            expanded += 1
+            if node == goal_index:
+                break
+
+            g = g_costs[node]
+            if node == start_index:
+                edges = list(start_edges)
+            else:
+                edges = list(self._get_intra_edges(self._cluster_of(node), weighted).get(node, ()))
+                if node in goal_edges:
+                    edges.append((goal_index, goal_edges[node]))
+            for partner in self._partners.get(node, ()):
+                edges.append((partner, tile_costs[partner] if weighted else 1))
+
+            for neighbor, edge_cost in edges:
+                if neighbor in closed_set:
+                    continue
+                tentative_g_cost = g + edge_cost
+                if neighbor not in g_costs or tentative_g_cost < g_costs[neighbor]:
+                    g_costs[neighbor] = tentative_g_cost
+                    parents[neighbor] = node
+                    x, y = neighbor % width, neighbor // width
+                    h = (abs(x - goal_x) + abs(y - goal_y)) * heuristic_scale
+                    heapq.heappush(open_set_heap, (tentative_g_cost + h, h, neighbor))
+
+        if goal_index not in closed_set:
+            return [], expanded, peak_open
+
+        abstract_path = []
+        node = goal_index
+        while node is not None:
+            abstract_path.append(node)
+            node = parents[node]
+        abstract_path.reverse()
+        path = self._refine(abstract_path, weighted, (start_block, start_parents), (goal_block, goal_parents))
+        return path, expanded, peak_open
+
+    def _refine(self, abstract_path, weighted, start_search, goal_search):
+        # start_search/goal_search are (block info, parents) of the searches out of the start
+        # and back from the goal, which already hold the first and last legs
+        width = self.width
+        start_index = abstract_path[0]
+        goal_index = abstract_path[-1]
+        path = [start_index]
+        for a, b in zip(abstract_path, abstract_path[1:]):
+            cluster = self._cluster_of(a)
+            if cluster != self._cluster_of(b):
+                path.append(b) # border crossing, the two tiles are adjacent
+                continue
+            if b == goal_index:
+                # reverse parents already lead from a to the goal
+                block_info, parents = goal_search
+                local = parents[self._to_block(block_info, a)]
+                while local != -1:
+                    path.append(self._from_block(block_info, local))
+                    local = parents[local]
+                continue
+
+            if a == start_index:
+                block_info, parents = start_search
+            else:
+                block_info = self._cluster_block(cluster, weighted)
+                _, parents = self._block_search(block_info, self._to_block(block_info, a),
+                                                targets=(self._to_block(block_info, b),))
+            leg = []
+            local = self._to_block(block_info, b)
+            while local != -1:
+                leg.append(self._from_block(block_info, local))
+                local = parents[local]
+            path.extend(reversed(leg[:-1]))
+        return [(index % width, index // width) for index in path]
+
+class HierarchyFields:
+    # Fuel costs and paths between the player and the destinations of one level searched over
+    # its hierarchy, used like DistanceFields/IncrementalFields by RoutePlanner. Legs between
+    # destinations are kept until tiles they run through change; legs from the player are
+    # kept until the player moves.
+    def __init__(self, hierarchy: HierarchicalPathfinder, destinations):
+        self.hierarchy = hierarchy
+        self._tile_costs = hierarchy.tile_costs # the costs the kept legs were searched on
+        self.destinations = set(destinations)
+        self._legs = {}       # (destination, destination) -> (cost or None, path)
+        self._start = None
+        self._start_legs = {} # destination -> (cost or None, path) from self._start
+
+    def __contains__(self, destination):
+        return destination in self.destinations
+
+    def _leg(self, start, destination):
+        if start in self.destinations:
+            legs, key = self._legs, (start, destination)
+        else:
+            if start != self._start:
+                self._start = start
+                self._start_legs = {}
+            legs, key = self._start_legs, destination
+        leg = legs.get(key)
+        if leg is None:
+            if start == destination:
+                leg = (0, [start])
+            else:
+                path, _, _ = self.hierarchy.find_path(start, destination, weighted=True)
+                width = self.hierarchy.width
+                tile_costs = self.hierarchy.tile_costs
+                cost = sum(tile_costs[y * width + x] for x, y in path[1:]) if path else None
+                leg = (cost, path)
+            legs[key] = leg
+        return leg
+
+    def cost(self, start, destination) -> int | None:
+        if destination not in self.destinations:
+            return None
+        return self._leg(start, destination)[0]
+
+    def path(self, start, destination) -> list[tuple[int, int]]:
+        if destination not in self.destinations:
+            return []
+        return self._leg(start, destination)[1]
+
+    def set_start(self, position):
+        pass # legs from the old position are dropped when one from the new position is asked for
+
+    def remove_destination(self, destination):
+        self.destinations.discard(destination)
+
+    def update_tiles(self, map_data, positions):
+        # call after map_data.update_tiles(); follows the level to its updated hierarchy and
+        # drops the legs that ran through rebuilt clusters. A tile that got cheaper or opened
+        # can shorten any leg, so then every leg is dropped.
+        hierarchy = map_data.hierarchy
+        old_costs, new_costs = self._tile_costs, hierarchy.tile_costs
+        width = hierarchy.width
+        self.hierarchy = hierarchy
+        self._tile_costs = new_costs
+        indices = [y * width + x for x, y in positions]
+        if any(new_costs[i] and (not old_costs[i] or new_costs[i] < old_costs[i]) for i in indices):
+            self._legs = {}
+            self._start_legs = {}
+            return
+
+        size = hierarchy.cluster_size
+        clusters = hierarchy.clusters_touched(positions)
+        def unaffected(leg):
+            return not any((x // size, y // size) in clusters for x, y in leg[1])
+        self._legs = {key: leg for key, leg in self._legs.items() if unaffected(leg)}
+        self._start_legs = {key: leg for key, leg in self._start_legs.items() if unaffected(leg)}
+
+if __name__ == "__main__":
+    test_map = [
+        "S111W1111",
+        "1W11W1WW1",
+        "1W1111W11",
+        "1WWWW1W1W",
+        "111111W1D",
+    ]
+    hierarchy = HierarchicalPathfinder(test_map, cluster_size=3)
+    path, expanded, _ = hierarchy.find_path((0, 0), (8, 4))
+    print(f"Path ({len(path) - 1} steps, {expanded} abstract nodes expanded): {path}")
+
+    # wall off the middle gap and rebuild only what the change touches
+    test_map[2] = "1W11W1W11"
+    hierarchy.update_tiles(test_map, [(4, 2)])
+    path, expanded, _ = hierarchy.find_path((0, 0), (8, 4))
+    print(f"After update ({len(path) - 1} steps): {path}")
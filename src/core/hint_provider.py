@@ -1,120 +1,305 @@
 import heapq
+from array import array
+import numpy as np
+from core.distance_field import NO_HOP, UNREACHABLE, compute_distance_field
+from core.jump_point_search import JumpTables
+from core.tile_rules import MIN_TILE_FUEL_COST, UNIT_COST_TABLE, get_cost_table
+from config import Configurations
 
-class Node:
-    def __init__(self, position, parent=None):
-        self.position = position  # (x, y) tuple
-        self.parent = parent
+config = Configurations()
 
-        self.g = 0  # cost from start to node
-        self.h = 0  # heuristic cost
-        self.f = 0  # g + h
+BATCH_WALK_CHUNK = 4096 # queries walked together when building array paths
 
-    def __lt__(self, other):
-        # priority queue comparator via total cost
-        return self.f < other.f
+class HintProvider:
+    def __init__(self, use_jump_point_search=True):
+        # counters from the most recent get_path search: tiles expanded and largest open list
+        self.last_search_stats = {"expanded": 0, "peak_open": 0, "method": None}
+        self.use_jump_point_search = use_jump_point_search
+        # (cost table, uniform step cost or None, JumpTables) of the last whole map JPS ran on
+        self._jump_cache = (None, None, None)
 
-    def __eq__(self, other):
-        # comparator to check if same position
-        return isinstance(other, Node) and self.position == other.position
+    def _reconstruct_path(self, parents, cols, end_index):
+        # walks the flat parent array back from end_index, returns (x, y) tiles from start to end
+        path = []
+        current = end_index
+        while current != -1:
+            path.append((current % cols, current // cols))
+            current = parents[current]
+        return path[::-1]
 
-    def __hash__(self):
-        return hash(self.position)
+    def _search(self, cols, rows, tile_costs, start_index, end_index, heuristic_scale):
+        # A* over a flat cost table (0 = cannot enter). Heap entries are (f, h, index) int tuples,
+        # so ordering never calls back into Python code; h breaks f ties towards the goal.
+        # g costs and parents live in flat arrays indexed by row * cols + col.
+        # With end_index=None it runs plain dijkstra over every reachable tile.
+        size = cols * rows
+        g_costs = array('i', [-1]) * size
+        parents = array('i', [-1]) * size
+        closed = bytearray(size)
+        last_row_start = size - cols
+        last_col = cols - 1
 
-class HintProvider:
-    def _heuristic(self, current_pos, end_pos):
-        # calculates manhattan distance
-        return abs(current_pos[0] - end_pos[0]) + abs(current_pos[1] - end_pos[1])
+        if end_index is None:
+            goal_x = goal_y = 0
+            heuristic_scale = 0
+        else:
+            goal_x, goal_y = end_index % cols, end_index // cols
 
-    def _reconstruct_path(self, end_node):
-        # reverses path found to get from start to end node
-        path = []
-        current = end_node
-        while current is not None:
-            path.append(current.position)
-            current = current.parent
-        return path[::-1] 
-
-    def get_path(self, map_data, start_coords, end_coords):
-        if not map_data or not map_data[0]:
+        start_h = (abs(start_index % cols - goal_x) + abs(start_index // cols - goal_y)) * heuristic_scale
+        g_costs[start_index] = 0
+        open_set_heap = [(start_h, start_h, start_index)]
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        expanded = 0
+        peak_open = 1
+
+        while open_set_heap:
+            if len(open_set_heap) > peak_open:
+                peak_open = len(open_set_heap)
+            _, _, index = heappop(open_set_heap)
+            if closed[index]:
+                continue # stale duplicate of a tile already expanded
+            closed[index] = 1
+            expanded += 1
+            if index == end_index:
+                break
+
+            g = g_costs[index]
+            x = index % cols
+            for neighbor, valid in ((index - cols, index >= cols), (index + cols, index < last_row_start),
+                                    (index - 1, x > 0), (index + 1, x < last_col)):
+                if not valid or closed[neighbor]:
+                    continue
+                step_cost = tile_costs[neighbor]
+                if not step_cost:
+                    continue
+                tentative_g_cost = g + step_cost
+                old_g_cost = g_costs[neighbor]
+                if old_g_cost < 0 or tentative_g_cost < old_g_cost:
+                    g_costs[neighbor] = tentative_g_cost
+                    parents[neighbor] = index
+                    h = (abs(neighbor % cols - goal_x) + abs(neighbor // cols - goal_y)) * heuristic_scale
+                    heappush(open_set_heap, (tentative_g_cost + h, h, neighbor))
+
+        self.last_search_stats = {"expanded": expanded, "peak_open": peak_open, "method": "astar"}
+        return g_costs, parents, closed
+
+    def _jump_point_path(self, cols, rows, tile_costs, start_coords, end_coords, weighted):
+        # Jump Point Search when the tiles involved all cost the same.
+        # Returns a path, [] when the goal is provably unreachable, or None when JPS does not apply.
+        if cols * rows > config.JUMP_POINT_SEARCH_MAX_TILES:
+            return None
+        costs = np.frombuffer(tile_costs, dtype=np.uint8).reshape(rows, cols)
+
+        cached_costs, uniform_cost, tables = self._jump_cache
+        if cached_costs is not tile_costs:
+            # the one fuel cost every enterable tile shares, or None when costs differ
+            enterable = costs[costs != 0]
+            uniform_cost = int(enterable[0]) if enterable.size and enterable.min() == enterable.max() else None
+            tables = None
+            self._jump_cache = (tile_costs, uniform_cost, tables)
+
+        step_cost = uniform_cost if weighted else 1
+        if step_cost is not None:
+            if tables is None:
+                tables = JumpTables(costs != 0)
+                self._jump_cache = (tile_costs, uniform_cost, tables)
+            path, expanded, peak_open = tables.find_path(start_coords, end_coords, step_cost)
+            self.last_search_stats = {"expanded": expanded, "peak_open": peak_open, "method": "jps"}
+            return path
+
+        # Mixed costs: search the start/goal bounding box if it is uniform at the cheapest cost.
+        # A path found there is only kept when it is as short as the Manhattan distance, which
+        # is a lower bound over the whole map, so nothing outside the box could beat it.
+        left, right = sorted((start_coords[0], end_coords[0]))
+        top, bottom = sorted((start_coords[1], end_coords[1]))
+        if (right - left + 1) * (bottom - top + 1) > config.JUMP_POINT_SEARCH_MAX_BOX_TILES:
+            return None
+        region = costs[top:bottom + 1, left:right + 1]
+        enterable = region[region != 0]
+        if enterable.min() != MIN_TILE_FUEL_COST or enterable.max() != MIN_TILE_FUEL_COST:
+            return None
+
+        tables = JumpTables(region != 0)
+        path, expanded, peak_open = tables.find_path((start_coords[0] - left, start_coords[1] - top),
+                                                     (end_coords[0] - left, end_coords[1] - top),
+                                                     MIN_TILE_FUEL_COST)
+        manhattan = (right - left) + (bottom - top)
+        if len(path) - 1 != manhattan:
+            return None # the search that answers instead records its own stats
+        self.last_search_stats = {"expanded": expanded, "peak_open": peak_open, "method": "jps"}
+        return [(x + left, y + top) for x, y in path]
+
+    def get_path(self, map_data, start_coords, end_coords, weighted=False):
+        # map_data is a LevelData or a list of rows; weighted=True minimises fuel instead of steps
+        cols, rows, tile_costs = get_cost_table(map_data)
+        if cols == 0 or rows == 0:
             print("[HintProvider A*] Error: Map data is empty.")
             return []
 
-        rows = len(map_data)
-        cols = len(map_data[0])
-
         if not (0 <= start_coords[0] < cols and 0 <= start_coords[1] < rows):
             print(f"[HintProvider A*] Error: Start coordinates {start_coords} out of bounds.")
             return []
-        if map_data[start_coords[1]][start_coords[0]] == 'W':
+        if not tile_costs[start_coords[1] * cols + start_coords[0]]:
             print(f"[HintProvider A*] Error: Start coordinates {start_coords} are on a wall.")
             return []
 
         if not (0 <= end_coords[0] < cols and 0 <= end_coords[1] < rows):
             print(f"[HintProvider A*] Error: End coordinates {end_coords} out of bounds.")
             return []
-        if map_data[end_coords[1]][end_coords[0]] == 'W':
+        if not tile_costs[end_coords[1] * cols + end_coords[0]]:
             print(f"[HintProvider A*] Error: End coordinates {end_coords} are on a wall.")
             return []
             
         if start_coords == end_coords:
             return [start_coords]
 
-        start_node = Node(start_coords)
-        end_node = Node(end_coords)
+        if self.use_jump_point_search:
+            path = self._jump_point_path(cols, rows, tile_costs, start_coords, end_coords, weighted)
+            if path:
+                return path
+            if path is not None:
+                print(f"[HintProvider JPS] No path found from {start_coords} to {end_coords}.")
+                return []
 
-        # nodes that hasnt been visited
-        open_set_heap = [] 
-        heapq.heappush(open_set_heap, start_node)
-        open_set_dict = {start_node.position: start_node.g}
+        hierarchy = getattr(map_data, "hierarchy", None)
+        if hierarchy is not None:
+            # big level: search the cluster entrance graph, then refine inside clusters
+            path, expanded, peak_open = hierarchy.find_path(start_coords, end_coords, weighted)
+            self.last_search_stats = {"expanded": expanded, "peak_open": peak_open, "method": "hpa"}
+            if not path:
+                print(f"[HintProvider HPA*] No path found from {start_coords} to {end_coords}.")
+            return path
 
-        # nodes that has been visited
-        closed_set = set()
+        if not weighted:
+            tile_costs = tile_costs.translate(UNIT_COST_TABLE)
+        start_index = start_coords[1] * cols + start_coords[0]
+        end_index = end_coords[1] * cols + end_coords[0]
+        heuristic_scale = MIN_TILE_FUEL_COST if weighted else 1
 
-        movements = [(0, -1), (0, 1), (-1, 0), (1, 0)] # (dx, dy)
+        _, parents, closed = self._search(cols, rows, tile_costs, start_index, end_index, heuristic_scale)
+        if closed[end_index]:
+            return self._reconstruct_path(parents, cols, end_index)
 
-        # main loop
-        while open_set_heap:
-            current_node = heapq.heappop(open_set_heap)
+        print(f"[HintProvider A*] No path found from {start_coords} to {end_coords}.")
+        return [] # No path found
 
-            if current_node.position in closed_set:
-                continue
-            
-            if current_node.position in open_set_dict and current_node.g > open_set_dict[current_node.position]:
+    def get_cost_field(self, map_data, start_coords, weighted=True):
+        # dijkstra from start_coords to every reachable tile
+        # returns (costs, parents) dicts keyed by (x, y); parents lead back to start_coords
+        cols, rows, tile_costs = get_cost_table(map_data)
+        if not (0 <= start_coords[0] < cols and 0 <= start_coords[1] < rows):
+            return {}, {}
+        start_index = start_coords[1] * cols + start_coords[0]
+        if not tile_costs[start_index]:
+            return {}, {}
+
+        if not weighted:
+            tile_costs = tile_costs.translate(UNIT_COST_TABLE)
+        g_costs, parents, closed = self._search(cols, rows, tile_costs, start_index, None, 0)
+
+        costs = {}
+        parent_coords = {}
+        for index in np.flatnonzero(np.frombuffer(closed, dtype=np.uint8)).tolist():
+            position = (index % cols, index // cols)
+            costs[position] = g_costs[index]
+            parent = parents[index]
+            parent_coords[position] = None if parent == -1 else (parent % cols, parent // cols)
+        return costs, parent_coords
+
+    def get_paths_batch(self, map_data, pairs, weighted=False, return_paths=True, as_arrays=False):
+        # answers many ((x, y) start, (x, y) goal) queries at once without logging.
+        # Queries are grouped by goal and each goal gets a single reverse search that every
+        # start shares (the level's precomputed distance fields are reused when they match).
+        #
+        # Returns (distances, paths). With as_arrays=False distances is a list of int | None and
+        # paths a list of [(x, y), ...] ([] when unreachable). With as_arrays=True distances is an
+        # int64 array (-1 when unreachable) and paths is (coords, offsets): coords is an (M, 2)
+        # int32 array of (x, y) and path k is coords[offsets[k]:offsets[k + 1]].
+        # paths is None when return_paths is False.
+        cols, rows, tile_costs = get_cost_table(map_data)
+        if not weighted:
+            tile_costs = tile_costs.translate(UNIT_COST_TABLE)
+        cost_table = (cols, rows, tile_costs)
+        level_fields = getattr(map_data, "distance_fields", None) if weighted else None
+
+        query_count = len(pairs)
+        distances = np.full(query_count, UNREACHABLE, dtype=np.int64)
+        start_indices = np.full(query_count, -1, dtype=np.int64)
+        fields = [None] * query_count
+
+        queries_by_goal = {}
+        for query, (start, goal) in enumerate(pairs):
+            if 0 <= start[0] < cols and 0 <= start[1] < rows:
+                start_indices[query] = start[1] * cols + start[0]
+            queries_by_goal.setdefault(tuple(goal), []).append(query)
+
+        for goal, queries in queries_by_goal.items():
+            if not (0 <= goal[0] < cols and 0 <= goal[1] < rows):
                 continue
+            field = level_fields.get(goal) if level_fields is not None else None
+            if field is None:
+                field = compute_distance_field(map_data, goal, cost_table)
 
-            if current_node.position in open_set_dict: 
-                del open_set_dict[current_node.position]
-            closed_set.add(current_node.position)
+            queries = np.array(queries, dtype=np.int64)
+            queries = queries[start_indices[queries] >= 0]
+            field_costs = np.frombuffer(field.costs, dtype=np.int32)
+            distances[queries] = field_costs[start_indices[queries]]
+            for query in queries.tolist():
+                fields[query] = field
 
-            if current_node == end_node:
-                return self._reconstruct_path(current_node)
+        paths = None
+        if return_paths:
+            if as_arrays:
+                paths = self._walk_paths_as_arrays(cols, distances, start_indices, fields)
+            else:
+                paths = [field.path_from(pair[0]) if field is not None and distance != UNREACHABLE else []
+                         for pair, field, distance in zip(pairs, fields, distances.tolist())]
 
-            for dx, dy in movements:
-                neighbor_pos = (current_node.position[0] + dx, current_node.position[1] + dy)
+        if as_arrays:
+            return distances, paths
+        return [None if distance == UNREACHABLE else distance for distance in distances.tolist()], paths
 
-                if not (0 <= neighbor_pos[0] < cols and 0 <= neighbor_pos[1] < rows):
-                    continue
+    def _walk_paths_as_arrays(self, cols, distances, start_indices, fields):
+        # follows the next-hop tables of every query sharing a goal in lock-step
+        hop_offsets = np.array([-cols, cols, -1, 1], dtype=np.int64) # indexed like HOP_MOVES
+        query_count = len(distances)
+        lengths = np.zeros(query_count, dtype=np.int64)
+        walked = [None] * query_count
 
-                if map_data[neighbor_pos[1]][neighbor_pos[0]] == 'W':
-                    continue
+        reachable = np.flatnonzero(distances != UNREACHABLE)
+        by_field = {}
+        for query in reachable.tolist():
+            by_field.setdefault(id(fields[query]), []).append(query)
 
-                if neighbor_pos in closed_set:
-                    continue
-                
-                tentative_g_cost = current_node.g + 1
-
-                # If neighbor is not in open_set_dict or this path is better
-                if neighbor_pos not in open_set_dict or tentative_g_cost < open_set_dict[neighbor_pos]:
-                    neighbor_node = Node(neighbor_pos, current_node)
-                    neighbor_node.g = tentative_g_cost
-                    neighbor_node.h = self._heuristic(neighbor_node.position, end_node.position)
-                    neighbor_node.f = neighbor_node.g + neighbor_node.h
-                    
-                    heapq.heappush(open_set_heap, neighbor_node)
-                    open_set_dict[neighbor_pos] = neighbor_node.g
+        for queries in by_field.values():
+            next_hops = np.frombuffer(fields[queries[0]].next_hops, dtype=np.uint8)
+            for chunk_start in range(0, len(queries), BATCH_WALK_CHUNK):
+                chunk = np.array(queries[chunk_start:chunk_start + BATCH_WALK_CHUNK], dtype=np.int64)
+                current = start_indices[chunk].copy()
+                steps = [current.copy()]
+                hops = next_hops[current]
+                moving = hops != NO_HOP
+                while moving.any():
+                    current[moving] += hop_offsets[hops[moving]]
+                    steps.append(current.copy())
+                    hops = next_hops[current]
+                    moving = hops != NO_HOP
 
-        print(f"[HintProvider A*] No path found from {start_coords} to {end_coords}.")
-        return [] # No path found
+                steps = np.stack(steps, axis=1) # (queries, longest path)
+                chunk_lengths = (steps != steps[:, -1:]).sum(axis=1) + 1
+                lengths[chunk] = chunk_lengths
+                keep = np.arange(steps.shape[1]) < chunk_lengths[:, None]
+                for query, path in zip(chunk.tolist(), np.split(steps[keep], np.cumsum(chunk_lengths)[:-1])):
+                    walked[query] = path
+
+        offsets = np.zeros(query_count + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        flat = np.concatenate([path for path in walked if path is not None]) if reachable.size else np.empty(0, dtype=np.int64)
+        coords = np.empty((len(flat), 2), dtype=np.int32)
+        coords[:, 0] = flat % cols
+        coords[:, 1] = flat // cols
+        return coords, offsets
 
 if __name__ == "__main__":
     hp = HintProvider()
@@ -122,7 +307,7 @@ if __name__ == "__main__":
     test_map = [
         ["S", "1", "1", "1", "1"],
         ["1", "W", "W", "W", "1"],
-        ["1", "1", "1", "E", "1"],
+        ["1", "1", "1", "D", "1"],
         ["W", "W", "1", "W", "W"],
         ["1", "1", "1", "1", "1"]
     ]
@@ -137,10 +322,17 @@ if __name__ == "__main__":
     print(path if path else "No path found.")
     
     false_test_map = [
-        ["S", "1", "W", "E"],
+        ["S", "1", "W", "D"],
         ["1", "1", "W", "1"]
     ]
     false_start = (0,0)
     false_end = (3,0)
     path = hp.get_path(false_test_map, false_start, false_end)
-    print(path if path else "No path found.")
\ No newline at end of file
+    print(path if path else "No path found.")
+
+    weighted_test_map = [
+        "S33D",
+        "1111",
+    ]
+    print("Fewest steps:", hp.get_path(weighted_test_map, (0, 0), (3, 0)))
+    print("Least fuel:", hp.get_path(weighted_test_map, (0, 0), (3, 0), weighted=True))
\ No newline at end of file
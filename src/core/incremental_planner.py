@@ -0,0 +1,241 @@
+import heapq
+from core.tile_rules import MIN_TILE_FUEL_COST, UNIT_COST_TABLE, get_cost_table
+
+INFINITE_COST = float('inf')
+
+# D* Lite (Koenig & Likhachev) rooted at one destination. It searches backwards from the
+# destination towards the current start, so g/rhs hold the cost of getting from a tile to
+# the destination. Moving the start only bumps the key modifier and changed tiles only
+# requeue their neighbourhood; everything already settled is kept for the next query.
+#
+# Positions are (x, y) like HintProvider; cost_from/path_from mirror DistanceField, so a
+# planner can stand in for a precomputed field that would be too big to build at load.
+class IncrementalPlanner:
+    def __init__(self, map_data, destination, start=None, weighted=True):
+        self.width, self.height, tile_costs = get_cost_table(map_data)
+        self.weighted = weighted
+        self.tile_costs = tile_costs if weighted else tile_costs.translate(UNIT_COST_TABLE)
+        self.heuristic_scale = MIN_TILE_FUEL_COST if weighted else 1
+        self.destination = destination
+        self.expanded = 0 # tiles expanded over the planner's lifetime
+
+        self._g = {}
+        self._rhs = {}
+        self._queued = {}     # tile -> key it is currently queued with
+        self._open_heap = []  # (key1, key2, tile), stale entries are skipped when popped
+        self._key_modifier = 0
+
+        self._goal = self._index_of(destination)
+        start_index = self._index_of(start) if start is not None else None
+        self._start = start_index if start_index is not None else (self._goal or 0)
+        if self._goal is not None and self.tile_costs[self._goal]:
+            self._rhs[self._goal] = 0
+            self._queue(self._goal)
+
+    def _index_of(self, position):
+        x, y = position
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        return y * self.width + x
+
+    def _heuristic(self, a, b):
+        width = self.width
+        return (abs(a % width - b % width) + abs(a // width - b // width)) * self.heuristic_scale
+
+    def _key(self, index):
+        best = min(self._g.get(index, INFINITE_COST), self._rhs.get(index, INFINITE_COST))
+        return (best + self._heuristic(self._start, index) + self._key_modifier, best)
+
+    def _queue(self, index):
+        key = self._key(index)
+        self._queued[index] = key
+        heapq.heappush(self._open_heap, (key[0], key[1], index))
+
+    def _update_vertex(self, index):
+        if self._g.get(index, INFINITE_COST) != self._rhs.get(index, INFINITE_COST):
+            self._queue(index)
+        else:
+            self._queued.pop(index, None)
+
+    def _top(self):
+        open_set_heap = self._open_heap
+        while open_set_heap:
+            key1, key2, index = open_set_heap[0]
+            if self._queued.get(index) == (key1, key2):
+                return open_set_heap[0]
+            heapq.heappop(open_set_heap)
+        return None
+
+    def _neighbors(self, index):
+        # open tiles next to index
+        width = self.width
+        tile_costs = self.tile_costs
+        x = index % width
+        neighbors = []
+        if index >= width and tile_costs[index - width]:
+            neighbors.append(index - width)
+        if index < (self.height - 1) * width and tile_costs[index + width]:
+            neighbors.append(index + width)
+        if x > 0 and tile_costs[index - 1]:
+            neighbors.append(index - 1)
+        if x < width - 1 and tile_costs[index + 1]:
+            neighbors.append(index + 1)
+        return neighbors
+
+    def _best_rhs(self, index):
+        # cheapest way on from index: enter a neighbour, then that neighbour's cost to go
+        if not self.tile_costs[index]:
+            return INFINITE_COST
+        g = self._g
+        tile_costs = self.tile_costs
+        return min((tile_costs[n] + g.get(n, INFINITE_COST) for n in self._neighbors(index)),
+                   default=INFINITE_COST)
+
+    def _compute_shortest_path(self):
+        g = self._g
+        rhs = self._rhs
+        tile_costs = self.tile_costs
+        start = self._start
+        while True:
+            top = self._top()
+            if top is None:
+                return
+            top_key = (top[0], top[1])
+            if top_key >= self._key(start) and \
+               rhs.get(start, INFINITE_COST) == g.get(start, INFINITE_COST):
+                return
+
+            index = top[2]
+            new_key = self._key(index)
+            if top_key < new_key:
+                # queued before the start moved, the key only grew
+                self._queue(index)
+                continue
+            heapq.heappop(self._open_heap)
+            del self._queued[index]
+            self.expanded += 1
+
+            old_g = g.get(index, INFINITE_COST)
+            index_rhs = rhs.get(index, INFINITE_COST)
+            enter_cost = tile_costs[index]
+            if old_g > index_rhs:
+                g[index] = index_rhs
+                through_cost = enter_cost + index_rhs
+                for neighbor in self._neighbors(index):
+                    if neighbor != self._goal and through_cost < rhs.get(neighbor, INFINITE_COST):
+                        rhs[neighbor] = through_cost
+                        self._update_vertex(neighbor)
+            else:
+                g.pop(index, None)
+                through_cost = enter_cost + old_g
+                for neighbor in self._neighbors(index) + [index]:
+                    if neighbor != self._goal and \
+                       (neighbor == index or rhs.get(neighbor, INFINITE_COST) == through_cost):
+                        rhs[neighbor] = self._best_rhs(neighbor)
+                    self._update_vertex(neighbor)
+
+    def set_start(self, position):
+        # called as the player moves; the search itself is repaired lazily on the next query
+        index = self._index_of(position)
+        if index is None or index == self._start:
+            return
+        self._key_modifier += self._heuristic(self._start, index)
+        self._start = index
+
+    def update_tiles(self, map_data, positions):
+        # re-reads the cost table after the tiles at positions ((x, y)) changed
+        _, _, tile_costs = get_cost_table(map_data)
+        self.tile_costs = tile_costs if self.weighted else tile_costs.translate(UNIT_COST_TABLE)
+        width = self.width
+        affected = set()
+        for x, y in positions:
+            index = y * width + x
+            affected.add(index)
+            if y > 0:
+                affected.add(index - width)
+            if y < self.height - 1:
+                affected.add(index + width)
+            if x > 0:
+                affected.add(index - 1)
+            if x < width - 1:
+                affected.add(index + 1)
+        for index in affected:
+            if index != self._goal:
+                self._rhs[index] = self._best_rhs(index)
+                self._update_vertex(index)
+
+    def cost_from(self, position) -> int | None:
+        index = self._index_of(position)
+        if index is None or self._goal is None or not self.tile_costs[index]:
+            return None
+        self.set_start(position)
+        self._compute_shortest_path()
+        cost = self._g.get(index, INFINITE_COST)
+        return None if cost == INFINITE_COST else cost
+
+    def path_from(self, position) -> list[tuple[int, int]]:
+        # walks towards the destination the way a D* Lite agent would, bringing the search
+        # up to date for each tile before taking the cheapest step out of it
+        if self.cost_from(position) is None:
+            return []
+        width = self.width
+        tile_costs = self.tile_costs
+        g = self._g
+        index = self._index_of(position)
+        path = [position]
+        while index != self._goal:
+            index = min(self._neighbors(index), key=lambda n: tile_costs[n] + g.get(n, INFINITE_COST))
+            position = (index % width, index // width)
+            path.append(position)
+            self.set_start(position)
+            self._compute_shortest_path()
+        return path
+
+class IncrementalFields:
+    # One IncrementalPlanner per pending destination, keyed by (x, y) and used like
+    # DistanceFields. The player's moves and deliveries are forwarded to the planners.
+    def __init__(self, map_data, destinations, start=None, weighted=True):
+        self.planners = {dest: IncrementalPlanner(map_data, dest, start, weighted) for dest in destinations}
+
+    def __contains__(self, destination):
+        return destination in self.planners
+
+    def get(self, destination) -> IncrementalPlanner | None:
+        return self.planners.get(destination)
+
+    def cost(self, start, destination) -> int | None:
+        planner = self.planners.get(destination)
+        return planner.cost_from(start) if planner else None
+
+    def path(self, start, destination) -> list[tuple[int, int]]:
+        planner = self.planners.get(destination)
+        return planner.path_from(start) if planner else []
+
+    def set_start(self, position):
+        for planner in self.planners.values():
+            planner.set_start(position)
+
+    def remove_destination(self, destination):
+        self.planners.pop(destination, None)
+
+    def update_tiles(self, map_data, positions):
+        for planner in self.planners.values():
+            planner.update_tiles(map_data, positions)
+
+if __name__ == "__main__":
+    test_map = [
+        "S111W111",
+        "1WW1W1W1",
+        "1111111D",
+    ]
+    planner = IncrementalPlanner(test_map, (7, 2), start=(0, 0))
+    print(f"Fuel from (0, 0): {planner.cost_from((0, 0))}, expanded {planner.expanded}")
+    print(f"Path: {planner.path_from((0, 0))}")
+
+    # a few steps later the next query reuses nearly all of the earlier search
+    expanded = planner.expanded
+    print(f"Fuel from (3, 1): {planner.cost_from((3, 1))}, expanded {planner.expanded - expanded} more")
+
+    test_map[2] = "11W1111D"
+    planner.update_tiles(test_map, [(2, 2)])
+    print(f"After closing (2, 2): {planner.path_from((0, 0))}")
@@ -0,0 +1,180 @@
+import heapq
+from array import array
+import numpy as np
+
+# Jump Point Search adapted to 4-connected grids with a uniform step cost.
+#
+# Canonical paths only turn from a vertical move into a horizontal one when they have to:
+# going (0, dy) into (x, y) and then sideways to (x + sx, y) is only needed when
+# (x + sx, y - dy) is blocked, otherwise the same-length path that moves sideways one row
+# earlier is preferred. Horizontal moves may always turn vertical. So a vertical scan stops
+# at walls and at tiles with such a "forced" sideways neighbour, and a horizontal scan stops
+# wherever one of its vertical scans finds something.
+
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)] # left, right, up, down
+START_KIND = len(DIRECTIONS) # search state of the start tile, which may move in every direction
+STATE_KINDS = START_KIND + 1
+
+class JumpTables:
+    # Per-grid precomputation that makes every vertical scan O(1): for each tile, the row where
+    # a scan moving down (or up) from it stops, i.e. the first wall/map edge or forced tile.
+    def __init__(self, passable: np.ndarray):
+        rows, cols = passable.shape
+        self.rows = rows
+        self.cols = cols
+        self.passable = passable.astype(np.uint8).tobytes()
+
+        # neighbour to the left/right of every tile, False past the map edge
+        side_left = np.zeros_like(passable)
+        side_left[:, 1:] = passable[:, :-1]
+        side_right = np.zeros_like(passable)
+        side_right[:, :-1] = passable[:, 1:]
+
+        # the same side neighbours one row behind the scan direction
+        left_above = np.zeros_like(passable)
+        left_above[1:, :] = side_left[:-1, :]
+        right_above = np.zeros_like(passable)
+        right_above[1:, :] = side_right[:-1, :]
+        left_below = np.zeros_like(passable)
+        left_below[:-1, :] = side_left[1:, :]
+        right_below = np.zeros_like(passable)
+        right_below[:-1, :] = side_right[1:, :]
+
+        forced_down = passable & ((side_left & ~left_above) | (side_right & ~right_above))
+        forced_up = passable & ((side_left & ~left_below) | (side_right & ~right_below))
+
+        row_numbers = np.arange(rows, dtype=np.int32)[:, None]
+        stops_down = np.where(~passable | forced_down, row_numbers, rows).astype(np.int32)
+        next_down = np.minimum.accumulate(stops_down[::-1], axis=0)[::-1]
+        stops_up = np.where(~passable | forced_up, row_numbers, -1).astype(np.int32)
+        next_up = np.maximum.accumulate(stops_up, axis=0)
+
+        # flat row numbers indexed by row * cols + col
+        self.next_down = array('i')
+        self.next_down.frombytes(np.ascontiguousarray(next_down, dtype=np.int32).tobytes())
+        self.next_up = array('i')
+        self.next_up.frombytes(np.ascontiguousarray(next_up, dtype=np.int32).tobytes())
+
+    def _jump_vertical(self, x, y, dy, goal_x, goal_y):
+        # index of the next jump point from (x, y) moving dy, or -1
+        cols = self.cols
+        if dy > 0:
+            stop = self.next_down[(y + 1) * cols + x] if y + 1 < self.rows else self.rows
+            if x == goal_x and y < goal_y <= stop:
+                return goal_y * cols + x
+            if stop < self.rows and self.passable[stop * cols + x]:
+                return stop * cols + x
+        else:
+            stop = self.next_up[(y - 1) * cols + x] if y > 0 else -1
+            if x == goal_x and stop <= goal_y < y:
+                return goal_y * cols + x
+            if stop >= 0 and self.passable[stop * cols + x]:
+                return stop * cols + x
+        return -1
+
+    def _jump_horizontal(self, x, y, dx, goal_x, goal_y):
+        cols = self.cols
+        passable = self.passable
+        row_start = y * cols
+        while True:
+            x += dx
+            if x < 0 or x >= cols or not passable[row_start + x]:
+                return -1
+            if x == goal_x and y == goal_y:
+                return row_start + x
+            if self._jump_vertical(x, y, 1, goal_x, goal_y) != -1 or \
+               self._jump_vertical(x, y, -1, goal_x, goal_y) != -1:
+                return row_start + x
+
+    def _successor_directions(self, kind, x, y):
+        if kind == START_KIND:
+            return range(len(DIRECTIONS))
+        dx, dy = DIRECTIONS[kind]
+        if dx:
+            # horizontal arrival: keep going or turn vertical, never reverse
+            return (kind, 2, 3)
+        directions = [kind]
+        cols = self.cols
+        passable = self.passable
+        behind_row = y - dy
+        for side, sx in ((0, -1), (1, 1)):
+            side_x = x + sx
+            if not 0 <= side_x < cols or not passable[y * cols + side_x]:
+                continue
+            if not 0 <= behind_row < self.rows or not passable[behind_row * cols + side_x]:
+                directions.append(side)
+        return directions
+
+    def find_path(self, start, goal, step_cost=1):
+        # A* over jump points between (x, y) tiles of this grid.
+        # Returns (path of every (x, y) tile, expanded, peak_open); path is [] when unreachable.
+        cols = self.cols
+        start_index = start[1] * cols + start[0]
+        goal_x, goal_y = goal
+        goal_index = goal_y * cols + goal_x
+
+        start_state = start_index * STATE_KINDS + START_KIND
+        start_h = (abs(start[0] - goal_x) + abs(start[1] - goal_y)) * step_cost
+        open_set_heap = [(start_h, start_h, start_state)]
+        g_costs = {start_state: 0}
+        parents = {start_state: None}
+        closed_set = set()
+        expanded = 0
+        peak_open = 1
+
+        while open_set_heap:
+            if len(open_set_heap) > peak_open:
+                peak_open = len(open_set_heap)
+            _, _, state = heapq.heappop(open_set_heap)
+            if state in closed_set:
+                continue
+            closed_set.add(state)
+            expanded += 1
+
+            index, kind = divmod(state, STATE_KINDS)
+            if index == goal_index:
+                return self._expand_path(parents, state), expanded, peak_open
+
+            x, y = index % cols, index // cols
+            g = g_costs[state]
+            for direction in self._successor_directions(kind, x, y):
+                dx, dy = DIRECTIONS[direction]
+                if dx:
+                    jump_index = self._jump_horizontal(x, y, dx, goal_x, goal_y)
+                else:
+                    jump_index = self._jump_vertical(x, y, dy, goal_x, goal_y)
+                if jump_index == -1:
+                    continue
+
+                jump_state = jump_index * STATE_KINDS + direction
+                if jump_state in closed_set:
+                    continue
+                jump_x, jump_y = jump_index % cols, jump_index // cols
+                tentative_g_cost = g + (abs(jump_x - x) + abs(jump_y - y)) * step_cost
+                if jump_state not in g_costs or tentative_g_cost < g_costs[jump_state]:
+                    g_costs[jump_state] = tentative_g_cost
+                    parents[jump_state] = state
+                    h = (abs(jump_x - goal_x) + abs(jump_y - goal_y)) * step_cost
+                    heapq.heappush(open_set_heap, (tentative_g_cost + h, h, jump_state))
+
+        return [], expanded, peak_open
+
+    def _expand_path(self, parents, state):
+        # jump points are joined by straight runs; fill in every tile between them
+        cols = self.cols
+        jump_points = []
+        while state is not None:
+            index = state // STATE_KINDS
+            jump_points.append((index % cols, index // cols))
+            state = parents[state]
+        jump_points.reverse()
+
+        path = [jump_points[0]]
+        for (x, y), (next_x, next_y) in zip(jump_points, jump_points[1:]):
+            step_x = (next_x > x) - (next_x < x)
+            step_y = (next_y > y) - (next_y < y)
+            while (x, y) != (next_x, next_y):
+                x += step_x
+                y += step_y
+                path.append((x, y))
+        return path
@@ -0,0 +1,243 @@
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from core.level_loader import LevelData
+from core.level_verifier import verify_level
+from core.tile_rules import PASSABLE_LUT, encode_grid
+from config import Configurations
+
+config = Configurations()
+
+# Builds levels in the level_N.json format LevelLoader reads. A layout ("city" blocks
+# between weighted streets, or a braided "maze") is carved out of walls, then the start
+# and destinations go on wall tiles fronting the road network reachable from the start,
+# the way the hand-made levels place driveways. initial_fuel is the optimum worked out
+# by level_verifier plus the difficulty's slack. A level only depends on (seed, number).
+
+LAYOUTS = ("city", "maze")
+
+def flood_fill(passable, width, height, start_index) -> bytearray:
+    # passable: flat bytes/bytearray/array indexed by y * width + x; returns reached flags
+    reached = bytearray(width * height)
+    if not passable[start_index]:
+        return reached
+    reached[start_index] = 1
+    stack = [start_index]
+    last_row = (height - 1) * width
+    while stack:
+        index = stack.pop()
+        x = index % width
+        for neighbor, inside in ((index - width, index >= width), (index + width, index < last_row),
+                                 (index - 1, x > 0), (index + 1, x < width - 1)):
+            if inside and passable[neighbor] and not reached[neighbor]:
+                reached[neighbor] = 1
+                stack.append(neighbor)
+    return reached
+
+class LevelGenerator:
+    def __init__(self, width=None, height=None, destinations=None, layout="city", difficulty="normal"):
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout {layout!r}, expected one of {LAYOUTS}.")
+        if difficulty not in config.GENERATED_LEVEL_DIFFICULTIES:
+            raise ValueError(f"Unknown difficulty {difficulty!r}, expected one of "
+                             f"{tuple(config.GENERATED_LEVEL_DIFFICULTIES)}.")
+        self.width = width or config.GENERATED_LEVEL_WIDTH
+        self.height = height or config.GENERATED_LEVEL_HEIGHT
+        if self.width < 5 or self.height < 5:
+            raise ValueError(f"Generated levels need at least 5x5 tiles, got {self.width}x{self.height}.")
+        self.destinations = config.GENERATED_LEVEL_DESTINATIONS if destinations is None else destinations
+        # stops go on inner tiles, and the start takes one of them
+        max_destinations = (self.width - 2) * (self.height - 2) - 1
+        if not 0 <= self.destinations <= max_destinations:
+            raise ValueError(f"A {self.width}x{self.height} level fits at most {max_destinations} destinations, "
+                             f"got {self.destinations}.")
+        self.layout = layout
+        self.difficulty = difficulty
+
+    def generate(self, seed, number=1):
+        # returns (level JSON dict, LevelVerdict of the generated map)
+        rng = random.Random(f"{seed}:{number}")
+        for _ in range(config.GENERATED_LEVEL_MAX_LAYOUTS):
+            grid = self._city(rng) if self.layout == "city" else self._maze(rng)
+            placed = self._place_stops(grid, rng)
+            if placed is not None:
+                break
+        else:
+            raise ValueError(f"No {self.layout} layout of {self.width}x{self.height} fitted {self.destinations} "
+                             f"destinations in {config.GENERATED_LEVEL_MAX_LAYOUTS} tries (seed {seed}, level {number}).")
+        start, destinations = placed
+        map_grid = ["".join(row) for row in grid]
+
+        level_name = f"Generated {self.layout.title()} {number}"
+        terrain = encode_grid(map_grid)
+        level_data = LevelData(level_name, 0, 0, map_grid, (start[1], start[0]),
+                               [(y, x) for x, y in destinations], len(destinations),
+                               self.width, self.height, terrain)
+        verdict = verify_level(level_data)
+
+        fuel_slack, hints_per_destination = config.GENERATED_LEVEL_DIFFICULTIES[self.difficulty]
+        verdict.initial_fuel = math.ceil(verdict.min_fuel * (1 + fuel_slack))
+        level = {
+            "level_name": level_name,
+            "initial_fuel": verdict.initial_fuel,
+            "hint_battery": round(len(destinations) * hints_per_destination),
+            "map_grid": map_grid,
+        }
+        return level, verdict
+
+    def _city(self, rng):
+        # streets every few tiles around wall blocks; each street gets a weight, some get
+        # congested stretches or closures, and a few blocks are open parks
+        width, height = self.width, self.height
+        grid = [[config.WALL_TILE] * width for _ in range(height)]
+        block_width = rng.randint(4, 7)
+        block_height = rng.randint(3, 5)
+        columns = list(range(1, width - 1, block_width + 1))
+        rows = list(range(1, height - 1, block_height + 1))
+
+        # only the road tiles the game has art for, so players can see every street's cost
+        road_1, road_2, road_3 = config.ROAD_TILE_1, config.ROAD_TILE_2, config.ROAD_TILE_3
+
+        def street_costs(length):
+            base = road_1 if rng.random() < 0.35 else rng.choice((road_1, road_2, road_2, road_3))
+            costs = [base] * length
+            for _ in range(rng.randint(0, 2)): # jams are the costliest road
+                jam_start = rng.randrange(length)
+                for i in range(jam_start, min(length, jam_start + rng.randint(2, 5))):
+                    costs[i] = road_3
+            return costs
+
+        for y in rows:
+            for x, cost in enumerate(street_costs(width - 2), start=1):
+                grid[y][x] = cost
+        for x in columns:
+            for y, cost in enumerate(street_costs(height - 2), start=1):
+                grid[y][x] = cost
+
+        # closures between two intersections
+        for y in rows:
+            for left, right in zip(columns, columns[1:]):
+                if rng.random() < 0.08:
+                    for x in range(left + 1, right):
+                        grid[y][x] = config.WALL_TILE
+        for x in columns:
+            for top, bottom in zip(rows, rows[1:]):
+                if rng.random() < 0.08:
+                    for y in range(top + 1, bottom):
+                        grid[y][x] = config.WALL_TILE
+
+        for top, bottom in zip(rows, rows[1:]):
+            for left, right in zip(columns, columns[1:]):
+                if rng.random() < 0.05:
+                    for y in range(top + 1, bottom):
+                        for x in range(left + 1, right):
+                            grid[y][x] = rng.choice("112")
+        return grid
+
+    def _maze(self, rng):
+        # randomized depth-first maze over odd tiles, then braided by knocking through
+        # some extra walls so there is more than one way between places
+        width, height = self.width, self.height
+        grid = [[config.WALL_TILE] * width for _ in range(height)]
+        cells_x = (width - 1) // 2
+        cells_y = (height - 1) // 2
+        corridor_costs = "1111111223"
+
+        visited = bytearray(cells_x * cells_y)
+        visited[0] = 1
+        grid[1][1] = rng.choice(corridor_costs)
+        stack = [(0, 0)]
+        while stack:
+            cx, cy = stack[-1]
+            options = [(nx, ny) for nx, ny in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1))
+                       if 0 <= nx < cells_x and 0 <= ny < cells_y and not visited[ny * cells_x + nx]]
+            if not options:
+                stack.pop()
+                continue
+            nx, ny = rng.choice(options)
+            visited[ny * cells_x + nx] = 1
+            grid[cy + ny + 1][cx + nx + 1] = rng.choice(corridor_costs)
+            grid[2 * ny + 1][2 * nx + 1] = rng.choice(corridor_costs)
+            stack.append((nx, ny))
+
+        for y in range(1, 2 * cells_y):
+            for x in range(1, 2 * cells_x):
+                if grid[y][x] == config.WALL_TILE and (x + y) % 2 == 1 and rng.random() < 0.1:
+                    grid[y][x] = rng.choice(corridor_costs)
+        return grid
+
+    def _place_stops(self, grid, rng):
+        # start and destinations go on inner wall tiles next to the roads reachable from
+        # the start; returns None when the layout has too few such tiles
+        width, height = self.width, self.height
+        passable = bytes(PASSABLE_LUT[encode_grid(["".join(row) for row in grid])].ravel())
+        frontage = [(x, y) for y in range(1, height - 1) for x in range(1, width - 1)
+                    if grid[y][x] == config.WALL_TILE and
+                    (passable[(y - 1) * width + x] or passable[(y + 1) * width + x] or
+                     passable[y * width + x - 1] or passable[y * width + x + 1])]
+        if not frontage:
+            return None
+        start = rng.choice(frontage)
+        grid[start[1]][start[0]] = config.START_TILE
+        passable = bytearray(passable)
+        passable[start[1] * width + start[0]] = 1
+        reached = flood_fill(passable, width, height, start[1] * width + start[0])
+
+        candidates = [(x, y) for x, y in frontage if (x, y) != start and
+                      (reached[(y - 1) * width + x] or reached[(y + 1) * width + x] or
+                       reached[y * width + x - 1] or reached[y * width + x + 1])]
+        if len(candidates) < self.destinations:
+            grid[start[1]][start[0]] = config.WALL_TILE
+            return None
+        destinations = rng.sample(candidates, self.destinations)
+        for x, y in destinations:
+            grid[y][x] = config.DESTINATION_TILE
+        return start, destinations
+
+# Per-process generator for generate_levels workers
+_worker_generator: LevelGenerator | None = None
+
+def _init_worker(options):
+    global _worker_generator
+    _worker_generator = LevelGenerator(**options)
+
+def _generate_to_file(task):
+    output_directory, seed, number = task
+    started = time.perf_counter()
+    level, verdict = _worker_generator.generate(seed, number)
+    with open(os.path.join(output_directory, f"level_{number}.json"), 'w') as f:
+        json.dump(level, f, indent=2)
+    return (number, level["level_name"], verdict.min_fuel, level["initial_fuel"], level["hint_battery"],
+            time.perf_counter() - started)
+
+def generate_levels(output_directory, count, seed=0, start_number=1, max_workers=None, **options):
+    # writes level_{start_number}.json onwards across a process pool and yields
+    # (number, name, min_fuel, initial_fuel, hint_battery, seconds) per level in number order
+    LevelGenerator(**options) # bad options raise here rather than breaking every worker
+    os.makedirs(output_directory, exist_ok=True)
+    tasks = ((output_directory, seed, number) for number in range(start_number, start_number + count))
+    max_workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(options,)) as executor:
+        yield from executor.map(_generate_to_file, tasks, chunksize=16)
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+
+    output_directory = sys.argv[1] if len(sys.argv) > 1 else tempfile.mkdtemp(prefix="generated_levels_")
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    generator = LevelGenerator(24, 16, 3)
+    level, verdict = generator.generate(seed=0)
+    print("\n".join(level["map_grid"]))
+    print(verdict)
+
+    for layout in LAYOUTS:
+        started = time.perf_counter()
+        generated = list(generate_levels(os.path.join(output_directory, layout), count, layout=layout))
+        elapsed = time.perf_counter() - started
+        print(f"{layout}: {len(generated)} levels in {elapsed:.2f}s ({len(generated) / elapsed * 60:.0f} per minute) "
+              f"into {os.path.join(output_directory, layout)}")
@@ -1,99 +1,321 @@
+import copy
+import hashlib
 import json
 import os
+import threading
+from collections import OrderedDict
+import numpy as np
+from core.distance_field import DistanceFields, compute_distance_fields, grid_content_hash
+from core.hierarchical_pathfinder import HierarchicalPathfinder
+from core.level_pack import LEVEL_PACK_EXTENSION, LevelPack
+from core.level_stream import read_level_stream
+from core.tile_rules import PASSABLE_LUT, TILE_COST_LUT, START_CODE, DESTINATION_CODE, encode_grid, decode_grid
+from config import Configurations
+
+config = Configurations()
 
 class LevelData:
     def __init__(self, name, initial_fuel, hint_battery, grid, player_start_pos, 
-                 destination_coords, num_packages_to_deliver, grid_width, grid_height):
+                 destination_coords, num_packages_to_deliver, grid_width, grid_height, terrain=None):
         self.name = name
         self.initial_fuel = initial_fuel
         self.hint_battery = hint_battery
-        self.grid = grid
         self.player_start_pos = player_start_pos
         self.destination_coords = destination_coords
         self.num_packages_to_deliver = num_packages_to_deliver
         self.grid_width = grid_width
         self.grid_height = grid_height
+        self.distance_fields: DistanceFields | None = None
+        self.hierarchy: HierarchicalPathfinder | None = None
+
+        # Packed (height, width) arrays built once at load; gameplay, hints and rendering read these.
+        # terrain holds tile character codes, cost_grid the fuel to enter a tile (0 = cannot enter).
+        self.terrain: np.ndarray = encode_grid(grid) if terrain is None else terrain
+        self.cost_grid: np.ndarray = TILE_COST_LUT[self.terrain]
+        self.passable: np.ndarray = PASSABLE_LUT[self.terrain]
+        self._grid = grid
+        self._flat_costs = None
+        self._shares_hierarchy = False
+
+    def copy(self) -> "LevelData":
+        # cheap copy for LevelLoader's cache: the tile arrays and the hierarchy are shared, and
+        # update_tiles copies them on first write
+        for tiles in (self.terrain, self.cost_grid, self.passable):
+            tiles.flags.writeable = False
+        clone = copy.copy(self)
+        clone.destination_coords = list(self.destination_coords)
+        clone._shares_hierarchy = self.hierarchy is not None
+        return clone
+
+    @property
+    def grid(self) -> list[str]:
+        # row strings, only decoded from terrain when a caller still asks for them
+        if self._grid is None:
+            self._grid = decode_grid(self.terrain)
+        return self._grid
+
+    @property
+    def flat_costs(self) -> bytes:
+        # cost_grid as bytes indexed by row * grid_width + col, for tight pure-Python loops
+        if self._flat_costs is None:
+            self._flat_costs = self.cost_grid.tobytes()
+        return self._flat_costs
+
+    def update_tiles(self, changes):
+        # changes maps (x, y) -> new road or wall tile character. Distance fields no longer
+        # match the map and are dropped; the hierarchy only rebuilds the clusters touched, and
+        # a big level that relied on its fields gets one now, its cluster costs found on demand.
+        if not self.terrain.flags.writeable:
+            self.terrain = self.terrain.copy()
+        if not self.cost_grid.flags.writeable:
+            self.cost_grid = self.cost_grid.copy()
+        if not self.passable.flags.writeable:
+            self.passable = self.passable.copy()
+        for (x, y), tile_char in changes.items():
+            if self.terrain[y, x] in (START_CODE, DESTINATION_CODE) or \
+               tile_char in (config.START_TILE, config.DESTINATION_TILE):
+                raise ValueError(f"Cannot change start/destination tile at {(x, y)}.")
+            if len(tile_char) != 1 or not tile_char.isascii():
+                raise ValueError(f"Invalid tile character {tile_char!r} at {(x, y)}.")
+            code = ord(tile_char)
+            self.terrain[y, x] = code
+            self.cost_grid[y, x] = TILE_COST_LUT[code]
+            self.passable[y, x] = PASSABLE_LUT[code]
+        self._grid = None
+        self._flat_costs = None
+        had_distance_fields = self.distance_fields is not None
+        self.distance_fields = None
+        if self._shares_hierarchy:
+            self.hierarchy = self.hierarchy.copy()
+            self._shares_hierarchy = False
+        if had_distance_fields and self.hierarchy is None and \
+           self.grid_width * self.grid_height >= config.HPA_MIN_TILES:
+            self.hierarchy = HierarchicalPathfinder(self)
+        elif self.hierarchy is not None:
+            self.hierarchy.update_tiles(self, changes.keys())
 
     def __str__(self):
         return (f"LevelData(Name: {self.name}, Fuel: {self.initial_fuel}, Battery: {self.hint_battery}, "
                 f"Start: {self.player_start_pos}, Destinations: {self.destination_coords}, "
                 f"Packages: {self.num_packages_to_deliver}, Grid: {self.grid_width}x{self.grid_height})")
 
+class LevelLoadCancelled(Exception):
+    # raised from a progress callback to abandon a load nobody waits for any more; it is
+    # passed on to the caller rather than reported as a failed load
+    pass
+
+def _report(progress, stage, fraction):
+    if progress is not None:
+        progress(stage, fraction)
+
 class LevelLoader:
-    def __init__(self, levels_directory="assets/levels"):
+    def __init__(self, levels_directory="assets/levels", persist_distance_fields=False, cache_size=None,
+                 prepare_routing=True):
+        # levels_directory holds level_N.json files, or is the path of a level pack.
+        # prepare_routing=False skips distance fields and the route hierarchy, for headless
+        # callers that never ask for hints (replay validation, the verifier, simulations).
         self.levels_directory = levels_directory
+        self.persist_distance_fields = persist_distance_fields
+        self.prepare_routing = prepare_routing
+
+        # Parsed levels, most recently used last: path -> (file signature, content hash, LevelData).
+        # Callers get copies, so a level they change never leaks into the next load.
+        self.cache_size = config.LEVEL_CACHE_SIZE if cache_size is None else cache_size
+        self._level_cache: OrderedDict[str, tuple] = OrderedDict()
+        # guards the cache and its stats only; levels are read and built outside it, so a
+        # cache hit never waits behind a prefetch of another level
+        self._cache_lock = threading.RLock()
+        self._loading: dict[str, threading.Event] = {} # key -> set when its load in flight ends
+        self.cache_stats = {"hits": 0, "misses": 0, "revalidated": 0, "evictions": 0,
+                            "disk_reads": 0, "prefetches": 0}
+
+        self.level_pack: LevelPack | None = None
+        self._pack_signature = None
+        if levels_directory.endswith(LEVEL_PACK_EXTENSION):
+            self._open_level_pack()
+
+    def _open_level_pack(self):
+        try:
+            stat = os.stat(self.levels_directory)
+            self.level_pack = LevelPack(self.levels_directory)
+            self._pack_signature = (stat.st_mtime_ns, stat.st_size)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not open level pack {self.levels_directory}: {e}")
+            self.level_pack = None
+            self._pack_signature = None
+
+    def _cache_get(self, key, signature):
+        entry = self._level_cache.get(key)
+        if entry is None or entry[0] != signature:
+            return None
+        self._level_cache.move_to_end(key)
+        self.cache_stats["hits"] += 1
+        return entry[2].copy()
+
+    def _cache_put(self, key, signature, content_hash, level_data):
+        if self.cache_size <= 0:
+            return
+        self._level_cache[key] = (signature, content_hash, level_data)
+        self._level_cache.move_to_end(key)
+        while len(self._level_cache) > self.cache_size:
+            self._level_cache.popitem(last=False)
+            self.cache_stats["evictions"] += 1
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._level_cache.clear()
+
+    def prefetch_level(self, level_number: int) -> bool:
+        # loads a level into the cache on a background thread, e.g. the next level while
+        # the current one is played; a load of the same level meanwhile waits for it
+        if self.cache_size <= 0:
+            return False
+        if self.levels_directory.endswith(LEVEL_PACK_EXTENSION):
+            if self.level_pack is None or not 1 <= level_number <= len(self.level_pack):
+                return False
+            key = f"{os.path.abspath(self.levels_directory)}#{level_number}"
+            signature = self._pack_signature
+        else:
+            filepath = os.path.join(self.levels_directory, f"level_{level_number}.json")
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                return False
+            key = os.path.abspath(filepath)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        with self._cache_lock:
+            entry = self._level_cache.get(key)
+            if (entry is not None and entry[0] == signature) or key in self._loading:
+                return False # already cached, or being loaded
+        threading.Thread(target=self._prefetch, args=(level_number,), daemon=True).start()
+        return True
+
+    def _prefetch(self, level_number: int):
+        with self._cache_lock:
+            self.cache_stats["prefetches"] += 1
+        self.load_level_by_number(level_number)
+
+    def _load_once(self, key, signature, load):
+        # the cached level for key, or else load() run outside the lock with key marked as in
+        # flight; a second load of the same key meanwhile waits for the first and is served
+        # from the cache, or loads itself if the first one failed
+        while True:
+            with self._cache_lock:
+                level_data = self._cache_get(key, signature)
+                if level_data is not None:
+                    return level_data
+                in_flight = self._loading.get(key)
+                if in_flight is None:
+                    in_flight = self._loading[key] = threading.Event()
+                    break
+            in_flight.wait()
+        try:
+            return load()
+        finally:
+            with self._cache_lock:
+                del self._loading[key]
+            in_flight.set()
 
     def _parse_map_grid(self, map_grid_data):
         if not map_grid_data or not isinstance(map_grid_data, list):
             print("Warning: map_grid_data is empty or not a list.")
-            return None, [], 0, 0, 0
+            return None, [], 0, 0, 0, None
 
         height = len(map_grid_data)
         width = len(map_grid_data[0]) if height > 0 else 0
 
-        player_start_pos = None
-        destination_coords = []
-        num_packages = 0
-
         for r, row_str in enumerate(map_grid_data):
             if len(row_str) != width:
                 raise ValueError(f"Inconsistent row length in map_grid. Expected {width}, got {len(row_str)} for row {r}.")
-            for c, char in enumerate(row_str):
-                if char == 'S':
-                    if player_start_pos is not None:
-                        raise ValueError("Multiple start positions ('S') found in the map grid.")
-                    player_start_pos = (r, c)
-                elif char == 'D':
-                    destination_coords.append((r, c))
-                    num_packages += 1
-        
-        if player_start_pos is None:
+
+        terrain = encode_grid(map_grid_data)
+        start_positions = np.argwhere(terrain == START_CODE)
+        if len(start_positions) > 1:
+            raise ValueError("Multiple start positions ('S') found in the map grid.")
+        if len(start_positions) == 0:
             raise ValueError("No start position ('S') found in the map grid.")
+        player_start_pos = tuple(int(v) for v in start_positions[0])
+
+        destination_coords = [(int(r), int(c)) for r, c in np.argwhere(terrain == DESTINATION_CODE)]
+        num_packages = len(destination_coords)
         if num_packages == 0:
             print("Warning: No destination points ('D') found in the map grid.")
-        return player_start_pos, destination_coords, num_packages, width, height
+        return player_start_pos, destination_coords, num_packages, width, height, terrain
 
-    def load_level_by_number(self, level_number: int) -> LevelData | None:
+    def load_level_by_number(self, level_number: int, progress=None) -> LevelData | None:
+        if self.levels_directory.endswith(LEVEL_PACK_EXTENSION):
+            return self._load_packed_level(level_number, progress)
         filename = f"level_{level_number}.json"
         filepath = os.path.join(self.levels_directory, filename)
-        return self.load_level_from_file(filepath)
+        return self.load_level_from_file(filepath, progress)
 
-    def load_level_from_file(self, filepath: str) -> LevelData | None:
-        try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
+    def parse_level(self, data) -> LevelData:
+        # builds a LevelData from the contents of a level JSON file; raises ValueError when invalid
+        level_name = data.get("level_name", "Unnamed Level")
+        initial_fuel = data.get("initial_fuel")
+        hint_battery = data.get("hint_battery")
+        map_grid = data.get("map_grid")
 
-            level_name = data.get("level_name", "Unnamed Level")
-            initial_fuel = data.get("initial_fuel")
-            hint_battery = data.get("hint_battery")
-            map_grid = data.get("map_grid")
+        self._check_level_fields(initial_fuel, hint_battery, map_grid is not None)
+        if not isinstance(map_grid, list) or not all(isinstance(row, str) for row in map_grid):
+             raise ValueError(f"map_grid must be a list of strings. Got: {type(map_grid)}")
 
-            if initial_fuel is None or hint_battery is None or map_grid is None:
-                raise ValueError("JSON file is missing one or more required fields: "
-                                 "'initial_fuel', 'hint_battery', 'map_grid'.")
-            
-            if not isinstance(initial_fuel, int) or initial_fuel < 0:
-                raise ValueError(f"initial_fuel must be a non-negative integer. Got: {initial_fuel}")
-            if not isinstance(hint_battery, int) or hint_battery < 0:
-                raise ValueError(f"hint_battery must be a non-negative integer. Got: {hint_battery}")
-            if not isinstance(map_grid, list) or not all(isinstance(row, str) for row in map_grid):
-                 raise ValueError(f"map_grid must be a list of strings. Got: {type(map_grid)}")
 
+        player_start_pos, destination_coords, num_packages, width, height, terrain = self._parse_map_grid(map_grid)
 
-            player_start_pos, destination_coords, num_packages, width, height = self._parse_map_grid(map_grid)
-            
-            return LevelData(
-                name=level_name,
-                initial_fuel=initial_fuel,
-                hint_battery=hint_battery,
-                grid=map_grid,
-                player_start_pos=player_start_pos,
-                destination_coords=destination_coords,
-                num_packages_to_deliver=num_packages,
-                grid_width=width,
-                grid_height=height
-            )
+        return LevelData(
+            name=level_name,
+            initial_fuel=initial_fuel,
+            hint_battery=hint_battery,
+            grid=map_grid,
+            player_start_pos=player_start_pos,
+            destination_coords=destination_coords,
+            num_packages_to_deliver=num_packages,
+            grid_width=width,
+            grid_height=height,
+            terrain=terrain
+        )
+
+    def _check_level_fields(self, initial_fuel, hint_battery, has_map_grid):
+        if initial_fuel is None or hint_battery is None or not has_map_grid:
+            raise ValueError("JSON file is missing one or more required fields: "
+                             "'initial_fuel', 'hint_battery', 'map_grid'.")
+
+        if not isinstance(initial_fuel, int) or initial_fuel < 0:
+            raise ValueError(f"initial_fuel must be a non-negative integer. Got: {initial_fuel}")
+        if not isinstance(hint_battery, int) or hint_battery < 0:
+            raise ValueError(f"hint_battery must be a non-negative integer. Got: {hint_battery}")
 
+    def _stream_level(self, filepath: str) -> tuple[LevelData, bytes]:
+        # parse_level for files too big to hold as a JSON document; rows go straight into terrain
+        streamed = read_level_stream(filepath)
+        fields = streamed.fields
+        initial_fuel = fields.get("initial_fuel")
+        hint_battery = fields.get("hint_battery")
+        self._check_level_fields(initial_fuel, hint_battery, streamed.terrain is not None)
+
+        height, width = streamed.terrain.shape
+        level_data = LevelData(
+            name=fields.get("level_name", "Unnamed Level"),
+            initial_fuel=initial_fuel,
+            hint_battery=hint_battery,
+            grid=None,
+            player_start_pos=streamed.player_start_pos,
+            destination_coords=streamed.destination_coords,
+            num_packages_to_deliver=len(streamed.destination_coords),
+            grid_width=width,
+            grid_height=height,
+            terrain=streamed.terrain
+        )
+        return level_data, streamed.content_hash
+
+    def load_level_from_file(self, filepath: str, progress=None) -> LevelData | None:
+        # progress, if given, is called as progress(stage, fraction) while a level is built
+        try:
+            return self._load_level_file(filepath, progress)
+
+        except LevelLoadCancelled:
+            raise
         except FileNotFoundError:
             print(f"Error: Level file not found at {filepath}")
             return None
@@ -107,7 +329,150 @@ class LevelLoader:
             print(f"An unexpected error occurred while loading {filepath}: {e}")
             return None
 
+    def _load_level_file(self, filepath: str, progress=None) -> LevelData:
+        # a file whose size and mtime are unchanged is served from the cache without being
+        # read; one that was only touched is recognised by its content hash
+        stat = os.stat(filepath)
+        key = os.path.abspath(filepath)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        return self._load_once(key, signature,
+                               lambda: self._read_level_file(filepath, key, signature, stat.st_size, progress))
+
+    def _read_level_file(self, filepath: str, key, signature, size, progress=None) -> LevelData:
+        with self._cache_lock:
+            self.cache_stats["disk_reads"] += 1
+        _report(progress, "Reading level", 0.1)
+        if size >= config.LEVEL_STREAM_MIN_BYTES:
+            # big files are parsed while they are read, so their hash is only known afterwards
+            level_data, content_hash = self._stream_level(filepath)
+        else:
+            with open(filepath, 'rb') as f:
+                raw = f.read()
+            content_hash = hashlib.sha1(raw).digest()
+            level_data = None
+
+        with self._cache_lock:
+            entry = self._level_cache.get(key)
+            if entry is not None and entry[1] == content_hash:
+                self.cache_stats["revalidated"] += 1
+                self._cache_put(key, signature, content_hash, entry[2])
+                return self._cache_get(key, signature)
+            self.cache_stats["misses"] += 1
+
+        if level_data is None:
+            level_data = self.parse_level(json.loads(raw))
+        self._prepare_routing(filepath, level_data, progress)
+        with self._cache_lock:
+            self._cache_put(key, signature, content_hash, level_data)
+        return level_data.copy() if self.cache_size > 0 else level_data
+
+    def _load_packed_level(self, level_number: int, progress=None) -> LevelData | None:
+        with self._cache_lock:
+            # a rewritten pack is reopened, and the signature change drops its cached levels
+            try:
+                stat = os.stat(self.levels_directory)
+                if (stat.st_mtime_ns, stat.st_size) != self._pack_signature:
+                    self._open_level_pack()
+            except OSError:
+                pass
+            if self.level_pack is None:
+                return None
+            # the pack as it is now, should another thread reopen it while this level is read
+            level_pack, signature = self.level_pack, self._pack_signature
+        key = f"{os.path.abspath(self.levels_directory)}#{level_number}"
+        return self._load_once(key, signature,
+                               lambda: self._read_packed_level(level_pack, key, signature, level_number, progress))
+
+    def _read_packed_level(self, level_pack: LevelPack, key, signature, level_number: int, progress=None) -> LevelData | None:
+        _report(progress, "Reading level", 0.1)
+        try:
+            packed = level_pack.read_level(level_number)
+        except IndexError:
+            print(f"Error: Level {level_number} not found in {self.levels_directory}")
+            return None
+        except ValueError as e:
+            print(f"Error: Level {level_number} in {self.levels_directory} is corrupt: {e}")
+            return None
+
+        # packs are validated when written; only the destinations still need a scan
+        destination_coords = [(int(r), int(c)) for r, c in np.argwhere(packed.terrain == DESTINATION_CODE)]
+        level_data = LevelData(
+            name=packed.name,
+            initial_fuel=packed.initial_fuel,
+            hint_battery=packed.hint_battery,
+            grid=None,
+            player_start_pos=packed.player_start_pos,
+            destination_coords=destination_coords,
+            num_packages_to_deliver=packed.num_packages,
+            grid_width=packed.width,
+            grid_height=packed.height,
+            terrain=packed.terrain
+        )
+        self._prepare_routing(None, level_data, progress)
+        with self._cache_lock:
+            self.cache_stats["misses"] += 1
+            self._cache_put(key, signature, None, level_data)
+        return level_data.copy() if self.cache_size > 0 else level_data
+
+    def _prepare_routing(self, filepath: str | None, level_data: LevelData, progress=None):
+        if not self.prepare_routing:
+            return
+        _report(progress, "Computing distance fields", 0.4)
+        level_data.distance_fields = self._get_distance_fields(filepath, level_data)
+        if level_data.distance_fields is None: # hints route over the fields when there are some
+            _report(progress, "Building route hierarchy", 0.7)
+            level_data.hierarchy = self._build_hierarchy(level_data, progress)
+
+    def _get_distance_fields(self, filepath: str | None, level_data: LevelData) -> DistanceFields | None:
+        # filepath is None for levels read from a pack, which get no sidecar
+        # fields are keyed by (x, y) like HintProvider; level data stores (row, col)
+        destinations = [(c, r) for r, c in level_data.destination_coords]
+        if len(destinations) * level_data.grid_width * level_data.grid_height > config.DISTANCE_FIELD_MAX_CELLS:
+            return None
+
+        # each level's fields live on its LevelData, so the level cache keeps them
+        content_hash = grid_content_hash(level_data.terrain)
+        fields = None
+        persist = self.persist_distance_fields and filepath is not None
+        if persist:
+            sidecar_path = os.path.splitext(filepath)[0] + ".fields"
+            fields = self._read_distance_field_sidecar(sidecar_path, content_hash)
+
+        if fields is None:
+            fields = compute_distance_fields(level_data, destinations, content_hash)
+            if persist:
+                try:
+                    with open(sidecar_path, 'wb') as f:
+                        f.write(fields.to_bytes())
+                except OSError as e:
+                    print(f"Warning: Could not write distance fields to {sidecar_path}: {e}")
+
+        return fields
+
+    def _build_hierarchy(self, level_data: LevelData, progress=None) -> HierarchicalPathfinder | None:
+        if level_data.grid_width * level_data.grid_height < config.HPA_MIN_TILES:
+            return None
+        hierarchy = HierarchicalPathfinder(level_data)
+        # the fuel costs inside every cluster, so no hint has to work them out mid-game
+        hierarchy.precompute(weighted=True,
+                             progress=lambda fraction: _report(progress, "Building route hierarchy", 0.7 + 0.2 * fraction))
+        return hierarchy
+
+    def _read_distance_field_sidecar(self, sidecar_path: str, content_hash: bytes) -> DistanceFields | None:
+        try:
+            with open(sidecar_path, 'rb') as f:
+                fields = DistanceFields.from_bytes(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable distance fields {sidecar_path}: {e}")
+            return None
+        # stale sidecar from an older version of the level
+        return fields if fields.content_hash == content_hash else None
+
     def get_available_levels_count(self) -> int:
+        if self.levels_directory.endswith(LEVEL_PACK_EXTENSION):
+            return len(self.level_pack) if self.level_pack is not None else 0
         count = 0
         if not os.path.isdir(self.levels_directory):
             print(f"Warning: Levels directory '{self.levels_directory}' not found.")
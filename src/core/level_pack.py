@@ -0,0 +1,149 @@
+import mmap
+import os
+import struct
+import numpy as np
+
+# Many levels in one file, for level sets too big for one JSON file per level:
+#
+#   header | terrain of level 1 | terrain of level 2 | ... | names | index
+#
+# The header holds the level count and where the index starts, and the index holds one
+# fixed-size entry per level (terrain offset, size, fuel, battery, start, name). The
+# file is memory-mapped, so counting levels reads the header only and loading a level
+# reads its index entry and wraps its terrain bytes in a NumPy array without copying.
+# Terrain is stored as tile characters, one byte per tile, like LevelData.terrain.
+
+LEVEL_PACK_EXTENSION = ".pack"
+PACK_MAGIC = b"ALP1"
+PACK_HEADER = struct.Struct("<4sIQ")       # magic, level count, index offset
+PACK_ENTRY = struct.Struct("<QQIIIIIIII")  # terrain offset, name offset, name length, width, height,
+                                           # initial fuel, hint battery, start row, start col, packages
+
+class PackedLevel:
+    # one index entry plus its terrain, as read from a pack
+    def __init__(self, name, initial_fuel, hint_battery, width, height, player_start_pos, num_packages, terrain):
+        self.name = name
+        self.initial_fuel = initial_fuel
+        self.hint_battery = hint_battery
+        self.width = width
+        self.height = height
+        self.player_start_pos = player_start_pos # (row, col)
+        self.num_packages = num_packages
+        self.terrain = terrain                   # read-only (height, width) view into the pack
+
+class LevelPack:
+    def __init__(self, pack_path):
+        self.pack_path = pack_path
+        with open(pack_path, 'rb') as f:
+            try:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"{pack_path} is empty, not a level pack.")
+        if len(self._data) < PACK_HEADER.size:
+            raise ValueError(f"{pack_path} is too short to be a level pack.")
+        magic, self.count, self.index_offset = PACK_HEADER.unpack_from(self._data, 0)
+        if magic != PACK_MAGIC:
+            raise ValueError(f"{pack_path} is not a level pack.")
+        if self.index_offset + self.count * PACK_ENTRY.size != len(self._data):
+            raise ValueError(f"{pack_path} is truncated or has trailing data.")
+
+    def __len__(self):
+        return self.count
+
+    def _entry(self, level_number):
+        if not 1 <= level_number <= self.count:
+            raise IndexError(f"Level {level_number} is not in {self.pack_path} ({self.count} levels).")
+        return PACK_ENTRY.unpack_from(self._data, self.index_offset + (level_number - 1) * PACK_ENTRY.size)
+
+    def level_name(self, level_number) -> str:
+        _, name_offset, name_length, *_ = self._entry(level_number)
+        return self._data[name_offset:name_offset + name_length].decode("utf-8")
+
+    def read_level(self, level_number) -> PackedLevel:
+        (terrain_offset, name_offset, name_length, width, height,
+         initial_fuel, hint_battery, start_row, start_col, num_packages) = self._entry(level_number)
+        if terrain_offset + width * height > self.index_offset:
+            raise ValueError(f"Level {level_number} in {self.pack_path} points past the terrain data.")
+        terrain = np.frombuffer(self._data, dtype=np.uint8, count=width * height,
+                                offset=terrain_offset).reshape(height, width)
+        name = self._data[name_offset:name_offset + name_length].decode("utf-8")
+        return PackedLevel(name, initial_fuel, hint_battery, width, height,
+                           (start_row, start_col), num_packages, terrain)
+
+    def close(self):
+        # levels already read keep the mapping alive until they are dropped
+        self._data = None
+
+def write_level_pack(pack_path, levels) -> int:
+    # levels: LevelData objects in level order, streamed straight to disk. Returns the count.
+    # The pack is written next to pack_path and only replaces it once complete.
+    temporary_path = pack_path + ".tmp"
+    try:
+        count = _write_pack_file(temporary_path, levels)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+    os.replace(temporary_path, pack_path)
+    return count
+
+def _write_pack_file(path, levels) -> int:
+    names = []
+    entries = []
+    with open(path, 'wb') as f:
+        f.write(PACK_HEADER.pack(PACK_MAGIC, 0, 0))
+        for level_data in levels:
+            terrain_offset = f.tell()
+            f.write(np.ascontiguousarray(level_data.terrain, dtype=np.uint8).tobytes())
+            names.append(level_data.name.encode("utf-8"))
+            start_row, start_col = level_data.player_start_pos
+            entries.append((terrain_offset, level_data.grid_width, level_data.grid_height,
+                            level_data.initial_fuel, level_data.hint_battery,
+                            start_row, start_col, level_data.num_packages_to_deliver))
+
+        name_offset = f.tell()
+        f.write(b"".join(names))
+        index_offset = f.tell()
+        for (terrain_offset, *fields), name in zip(entries, names):
+            f.write(PACK_ENTRY.pack(terrain_offset, name_offset, len(name), *fields))
+            name_offset += len(name)
+        f.seek(0)
+        f.write(PACK_HEADER.pack(PACK_MAGIC, len(entries), index_offset))
+    return len(entries)
+
+def convert_levels_directory(levels_directory, pack_path) -> int:
+    # packs level_1.json, level_2.json, ... (validated like LevelLoader does) into pack_path
+    # imported here because level_loader itself reads packs through this module
+    import json
+    from core.level_loader import LevelLoader
+
+    loader = LevelLoader(levels_directory)
+
+    def read_levels():
+        for level_number in range(1, loader.get_available_levels_count() + 1):
+            filepath = os.path.join(levels_directory, f"level_{level_number}.json")
+            with open(filepath, 'r') as f:
+                try:
+                    yield loader.parse_level(json.load(f))
+                except (ValueError, AttributeError) as e:
+                    raise ValueError(f"Cannot pack {filepath}: {e}")
+
+    return write_level_pack(pack_path, read_levels())
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    import time
+
+    levels_directory = sys.argv[1] if len(sys.argv) > 1 else "assets/levels"
+    pack_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(tempfile.gettempdir(), "levels" + LEVEL_PACK_EXTENSION)
+
+    started = time.perf_counter()
+    count = convert_levels_directory(levels_directory, pack_path)
+    print(f"Packed {count} levels from {levels_directory} into {pack_path} "
+          f"({os.path.getsize(pack_path)} bytes) in {time.perf_counter() - started:.2f}s")
+
+    pack = LevelPack(pack_path)
+    for level_number in range(1, len(pack) + 1):
+        level = pack.read_level(level_number)
+        print(f"  {level_number}: {level.name} {level.width}x{level.height}, Fuel: {level.initial_fuel}")
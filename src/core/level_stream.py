@@ -0,0 +1,199 @@
+import hashlib
+import json
+import numpy as np
+from config import Configurations
+
+config = Configurations()
+
+# Incremental reader for level JSON files too big for json.load. The file is read in
+# chunks and map_grid rows are copied straight into one packed terrain buffer as they
+# are found, so memory stays at the finished terrain plus a chunk instead of the whole
+# document and a Python string per row. Row widths, the start tile and destinations are
+# checked in the same pass. Any other value (name, fuel, battery) is decoded with json.
+
+WHITESPACE = b" \t\r\n"
+START_BYTE = ord(config.START_TILE)
+DESTINATION_BYTE = ord(config.DESTINATION_TILE)
+
+class StreamedLevel:
+    def __init__(self, fields, terrain, player_start_pos, destination_coords, content_hash):
+        self.fields = fields                        # top-level values other than map_grid
+        self.terrain = terrain                      # (height, width) uint8, None without a map_grid
+        self.player_start_pos = player_start_pos    # (row, col)
+        self.destination_coords = destination_coords
+        self.content_hash = content_hash            # sha1 of the file bytes, like LevelLoader's cache
+
+class _ChunkReader:
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = b""
+        self.pos = 0
+        self.at_end = False
+        self.digest = hashlib.sha1()
+
+    def fill(self) -> bool:
+        # appends the next chunk, dropping what has been consumed; False at end of file
+        data = self.f.read(self.chunk_size)
+        if not data:
+            self.at_end = True
+            return False
+        self.digest.update(data)
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def next_byte(self) -> int:
+        # first non-whitespace byte, left unconsumed
+        while True:
+            buffer = self.buffer
+            pos = self.pos
+            while pos < len(buffer) and buffer[pos] in WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self.fill():
+                raise ValueError("Level file ends unexpectedly.")
+
+    def expect(self, char):
+        if self.next_byte() != ord(char):
+            raise ValueError(f"Invalid JSON: expected '{char}' at byte {self.pos} of the current chunk.")
+        self.pos += 1
+
+    def value(self):
+        # one complete JSON value of any kind; numbers are only trusted once something follows them
+        decoder = json.JSONDecoder()
+        self.next_byte()
+        while True:
+            text = self.buffer[self.pos:].decode("utf-8", "surrogateescape")
+            try:
+                value, end = decoder.raw_decode(text)
+                if end < len(text) or self.at_end:
+                    self.pos += len(text[:end].encode("utf-8", "surrogateescape"))
+                    return value
+            except json.JSONDecodeError:
+                if self.at_end:
+                    raise
+            self.fill()
+
+    def row(self) -> bytes:
+        # the next map_grid string as bytes; rows with escapes take the slow path
+        if self.next_byte() != ord('"'):
+            raise ValueError("map_grid must be a list of strings.")
+        end = self.buffer.find(b'"', self.pos + 1)
+        while end == -1:
+            searched = len(self.buffer) - self.pos # fill() moves the row to the buffer start
+            if not self.fill():
+                raise ValueError("Level file ends inside a map_grid row.")
+            end = self.buffer.find(b'"', max(1, searched))
+        row = self.buffer[self.pos + 1:end]
+        if b"\\" in row:
+            row = self.value()
+            if not row.isascii():
+                raise ValueError("map_grid may only contain ASCII tile characters.")
+            return row.encode("ascii")
+        if not row.isascii():
+            raise ValueError("map_grid may only contain ASCII tile characters.")
+        self.pos = end + 1
+        return row
+
+def _read_map_grid(reader):
+    terrain = bytearray()
+    width = None
+    player_start_pos = None
+    destination_coords = []
+    reader.expect('[')
+    if reader.next_byte() == ord(']'):
+        raise ValueError("map_grid must contain at least one row.")
+
+    r = 0
+    while True:
+        row = reader.row()
+        if width is None:
+            width = len(row)
+        elif len(row) != width:
+            raise ValueError(f"Inconsistent row length in map_grid. Expected {width}, got {len(row)} for row {r}.")
+        terrain += row
+
+        c = row.find(START_BYTE)
+        while c != -1:
+            if player_start_pos is not None:
+                raise ValueError("Multiple start positions ('S') found in the map grid.")
+            player_start_pos = (r, c)
+            c = row.find(START_BYTE, c + 1)
+        c = row.find(DESTINATION_BYTE)
+        while c != -1:
+            destination_coords.append((r, c))
+            c = row.find(DESTINATION_BYTE, c + 1)
+
+        r += 1
+        separator = reader.next_byte()
+        reader.pos += 1
+        if separator == ord(']'):
+            break
+        if separator != ord(','):
+            raise ValueError("Invalid JSON: expected ',' or ']' in map_grid.")
+
+    if player_start_pos is None:
+        raise ValueError("No start position ('S') found in the map grid.")
+    return np.frombuffer(terrain, dtype=np.uint8).reshape(r, width), player_start_pos, destination_coords
+
+def read_level_stream(filepath, chunk_size=None) -> StreamedLevel:
+    # raises ValueError (json.JSONDecodeError included) for files that are not valid levels
+    fields = {}
+    terrain = None
+    player_start_pos = None
+    destination_coords = []
+    with open(filepath, 'rb') as f:
+        reader = _ChunkReader(f, chunk_size or config.LEVEL_STREAM_CHUNK_BYTES)
+        reader.expect('{')
+        if reader.next_byte() == ord('}'):
+            reader.pos += 1
+        else:
+            while True:
+                key = reader.value()
+                if not isinstance(key, str):
+                    raise ValueError("Invalid JSON: object keys must be strings.")
+                reader.expect(':')
+                if key == "map_grid" and reader.next_byte() == ord('['):
+                    terrain, player_start_pos, destination_coords = _read_map_grid(reader)
+                else:
+                    fields[key] = reader.value()
+                separator = reader.next_byte()
+                reader.pos += 1
+                if separator == ord('}'):
+                    break
+                if separator != ord(','):
+                    raise ValueError("Invalid JSON: expected ',' or '}' between level fields.")
+        # the rest only matters to the content hash
+        while reader.fill():
+            pass
+        if reader.buffer[reader.pos:].strip(WHITESPACE):
+            raise ValueError("Invalid JSON: extra data after the level object.")
+    if "map_grid" in fields:
+        raise ValueError(f"map_grid must be a list of strings. Got: {type(fields['map_grid'])}")
+    return StreamedLevel(fields, terrain, player_start_pos, destination_coords, reader.digest.digest())
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+
+    path = os.path.join(tempfile.mkdtemp(), "level_big.json")
+    width, height = 2000, 2000
+    with open(path, 'w') as f:
+        f.write('{"level_name": "Streamed", "initial_fuel": 500, "hint_battery": 3, "map_grid": [\n')
+        for y in range(height):
+            row = ["1"] * width
+            if y == 0:
+                row[0] = "S"
+            if y == height - 1:
+                row[-1] = "D"
+            f.write(f'  "{"".join(row)}"' + (",\n" if y < height - 1 else "\n"))
+        f.write("]}\n")
+
+    started = time.perf_counter()
+    streamed = read_level_stream(path)
+    print(f"Read {streamed.terrain.shape[1]}x{streamed.terrain.shape[0]} in {time.perf_counter() - started:.2f}s, "
+          f"start {streamed.player_start_pos}, destinations {streamed.destination_coords}, fields {streamed.fields}")
@@ -0,0 +1,251 @@
+import glob
+import heapq
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from core.level_loader import LevelData, LevelLoader
+from core.tile_rules import get_cost_table, get_fuel_cost
+from config import Configurations
+
+config = Configurations()
+
+INFINITE_COST = float('inf')
+
+# Works out the least initial_fuel a level can be completed with and compares it to the
+# level's own. Legs between stops come from the level's distance fields, or else from a
+# Dijkstra per destination that stops once every stop is settled. The delivery order is
+# found by A* over (last destination, delivered set) states:
+#   - lower bound: minimum spanning tree over the destinations still pending (memoized
+#     per set) plus the cheapest edge into them. Any remaining route is a spanning path
+#     of those destinations, so this never overestimates.
+#   - pruning: a leg i -> j is skipped when a pending destination k lies on a cheapest
+#     path from i to j. Stopping at k on the way costs the same, so the order through k
+#     covers it. States that cost at least as much as the best known route are dropped,
+#     and so are states already reached more cheaply.
+#
+# Fuel rules (GameManager): a move needs fuel > 0 beforehand, and delivering the last
+# package wins before a negative tank is checked. The final step into a destination can
+# therefore overdraw the tank, and the minimum is route cost - that step's cost + 1.
+
+class LevelVerdict:
+    def __init__(self, name, filepath, initial_fuel, num_destinations, min_fuel=None,
+                 order=None, expanded=0, seconds=0.0, error=None):
+        self.name = name
+        self.filepath = filepath
+        self.initial_fuel = initial_fuel
+        self.num_destinations = num_destinations
+        self.min_fuel = min_fuel      # least initial_fuel that completes the level, None if it cannot be
+        self.order = order or []      # cheapest delivery order, (x, y) destinations
+        self.expanded = expanded      # search states expanded
+        self.seconds = seconds
+        self.error = error
+
+    @property
+    def slack(self) -> int | None:
+        if self.min_fuel is None or self.initial_fuel is None:
+            return None
+        return self.initial_fuel - self.min_fuel
+
+    @property
+    def is_solvable(self) -> bool:
+        return self.slack is not None and self.slack >= 0
+
+    def __str__(self):
+        if self.error:
+            return f"LevelVerdict({self.name}: {self.error})"
+        return (f"LevelVerdict({self.name}: Destinations: {self.num_destinations}, Fuel: {self.initial_fuel}, "
+                f"Needed: {self.min_fuel}, Slack: {self.slack}, Solvable: {self.is_solvable})")
+
+def _spanning_tree_cost(mask, weights):
+    # Prim over the destinations in mask with symmetric edge weights
+    members = [i for i in range(len(weights)) if mask >> i & 1]
+    if len(members) < 2:
+        return 0
+    first = members[0]
+    remaining = members[1:]
+    best = {j: weights[first][j] for j in remaining}
+    total = 0
+    while best:
+        nearest = min(best, key=best.get)
+        total += best.pop(nearest)
+        row = weights[nearest]
+        for j in best:
+            if row[j] < best[j]:
+                best[j] = row[j]
+    return total
+
+def find_cheapest_order(start_legs, legs):
+    # start_legs[j]: fuel from the start to destination j; legs[i][j]: from destination i to j.
+    # Every destination must be reachable. Returns (route cost, order, states expanded).
+    n = len(start_legs)
+    if n == 0:
+        return 0, [], 0
+    full = (1 << n) - 1
+    rows = legs + [start_legs] # row n is the start
+    weights = [[min(legs[i][j], legs[j][i]) for j in range(n)] for i in range(n)]
+
+    # on_the_way[i][j]: destinations on some cheapest path from row i to destination j
+    on_the_way = []
+    for row in rows:
+        masks = []
+        for j in range(n):
+            mask = 0
+            for k in range(n):
+                if k != j and row[k] + legs[k][j] == row[j]:
+                    mask |= 1 << k
+            masks.append(mask)
+        on_the_way.append(masks)
+
+    tree_costs = {}
+    def lower_bound(position, pending):
+        if not pending:
+            return 0
+        tree_cost = tree_costs.get(pending)
+        if tree_cost is None:
+            tree_cost = tree_costs[pending] = _spanning_tree_cost(pending, weights)
+        row = rows[position]
+        return tree_cost + min(row[j] for j in range(n) if pending >> j & 1)
+
+    # nearest neighbour route as the first upper bound
+    position, pending, bound = n, full, 0
+    while pending:
+        row = rows[position]
+        position = min((j for j in range(n) if pending >> j & 1), key=lambda j: row[j])
+        bound += row[position]
+        pending ^= 1 << position
+
+    # states are keyed delivered_mask * (n + 1) + position
+    start_key = n
+    best_costs = {start_key: 0}
+    parents = {start_key: None}
+    open_set_heap = [(lower_bound(n, full), 0, 0, n)]
+    expanded = 0
+    while open_set_heap:
+        _, cost, delivered, position = heapq.heappop(open_set_heap)
+        key = delivered * (n + 1) + position
+        if cost > best_costs[key]:
+            continue
+        if delivered == full:
+            order = []
+            while key != start_key:
+                order.append(key % (n + 1))
+                key = parents[key]
+            return cost, order[::-1], expanded
+        expanded += 1
+
+        pending = full ^ delivered
+        row = rows[position]
+        passes = on_the_way[position]
+        for j in range(n):
+            if not pending >> j & 1 or passes[j] & pending:
+                continue
+            next_cost = cost + row[j]
+            next_delivered = delivered | (1 << j)
+            estimate = next_cost + lower_bound(j, full ^ next_delivered)
+            if estimate > bound:
+                continue
+            next_key = next_delivered * (n + 1) + j
+            if next_cost >= best_costs.get(next_key, INFINITE_COST):
+                continue
+            best_costs[next_key] = next_cost
+            parents[next_key] = key
+            if next_delivered == full:
+                bound = min(bound, next_cost)
+            heapq.heappush(open_set_heap, (estimate, next_cost, next_delivered, j))
+    return None, [], expanded
+
+def _costs_to(map_data, destination, stops):
+    # reverse dijkstra out of destination (like compute_distance_field) that stops as soon
+    # as every stop is settled; returns {stop: fuel from stop to destination}
+    width, height, tile_costs = get_cost_table(map_data)
+    dest_x, dest_y = destination
+    remaining = {y * width + x: (x, y) for x, y in stops}
+    found = {}
+    costs = {dest_y * width + dest_x: 0}
+    open_set_heap = [(0, dest_y * width + dest_x)]
+    last_row = (height - 1) * width
+    while open_set_heap and remaining:
+        cost, index = heapq.heappop(open_set_heap)
+        if cost > costs[index]:
+            continue
+        stop = remaining.pop(index, None)
+        if stop is not None:
+            found[stop] = cost
+        neighbor_cost = cost + tile_costs[index]
+        x = index % width
+        for neighbor, inside in ((index - width, index >= width), (index + width, index < last_row),
+                                 (index - 1, x > 0), (index + 1, x < width - 1)):
+            if inside and tile_costs[neighbor] and neighbor_cost < costs.get(neighbor, INFINITE_COST):
+                costs[neighbor] = neighbor_cost
+                heapq.heappush(open_set_heap, (neighbor_cost, neighbor))
+    return found
+
+def verify_level(level_data: LevelData, filepath=None) -> LevelVerdict:
+    started = time.perf_counter()
+    destinations = [(c, r) for r, c in level_data.destination_coords]
+    verdict = LevelVerdict(level_data.name, filepath, level_data.initial_fuel, len(destinations))
+    start_row, start_col = level_data.player_start_pos
+    start = (start_col, start_row)
+
+    fields = level_data.distance_fields
+    if fields is not None and all(dest in fields for dest in destinations):
+        def leg_cost(src, dst):
+            return fields.cost(src, dst)
+    else:
+        # only the legs between stops are needed, not whole fields
+        stops = [start] + destinations
+        costs_to = {dest: _costs_to(level_data, dest, stops) for dest in destinations}
+        def leg_cost(src, dst):
+            return costs_to[dst].get(src)
+
+    start_legs = [leg_cost(start, dest) for dest in destinations]
+    unreachable = [dest for dest, cost in zip(destinations, start_legs) if cost is None]
+    if unreachable:
+        verdict.error = f"Destinations {unreachable} cannot be reached from the start."
+    else:
+        legs = [[leg_cost(src, dst) for dst in destinations] for src in destinations]
+        cost, order, verdict.expanded = find_cheapest_order(start_legs, legs)
+        verdict.order = [destinations[i] for i in order]
+        if not order:
+            verdict.min_fuel = 0
+        else:
+            # every destination tile has the same fuel cost, so refunding the last step
+            # does not change which order is cheapest
+            verdict.min_fuel = cost - get_fuel_cost(config.DESTINATION_TILE) + 1
+    verdict.seconds = time.perf_counter() - started
+    return verdict
+
+def _verify_file(filepath):
+    with open(os.devnull, 'w') as quiet, redirect_stdout(quiet):
+        # legs come from _costs_to, so the loader's distance fields and hierarchy would be wasted
+        level_data = LevelLoader(os.path.dirname(filepath), prepare_routing=False).load_level_from_file(filepath)
+    if level_data is None:
+        return LevelVerdict(os.path.basename(filepath), filepath, None, 0, error="Level could not be loaded.")
+    return verify_level(level_data, filepath)
+
+def _level_number(filepath):
+    match = re.search(r"(\d+)", os.path.basename(filepath))
+    return int(match.group(1)) if match else 0
+
+def verify_levels(levels_directory="assets/levels", max_workers=None) -> list[LevelVerdict]:
+    # verifies every level_*.json in the directory, one level per worker process
+    filepaths = sorted(glob.glob(os.path.join(levels_directory, "level_*.json")), key=_level_number)
+    if not filepaths:
+        return []
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(filepaths) == 1:
+        return [_verify_file(filepath) for filepath in filepaths]
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(filepaths))) as executor:
+        return list(executor.map(_verify_file, filepaths))
+
+if __name__ == "__main__":
+    import sys
+
+    levels_directory = sys.argv[1] if len(sys.argv) > 1 else "assets/levels"
+    started = time.perf_counter()
+    verdicts = verify_levels(levels_directory)
+    for verdict in verdicts:
+        print(f"{verdict}  ({verdict.expanded} states, {verdict.seconds * 1000:.1f} ms)")
+    print(f"Verified {len(verdicts)} levels in {time.perf_counter() - started:.2f}s")
@@ -1,4 +1,5 @@
 from config import Configurations
+from core.tile_rules import is_traversable
 
 config = Configurations()
 
@@ -18,9 +19,7 @@ class Player:
         return self.x, self.y
     
     def _is_tile_traversable(self, tile_char: str) -> bool:
-        if tile_char == self.WALL_CHAR:
-            return False
-        return tile_char in [config.START_TILE, config.DESTINATION_TILE] or tile_char.isdigit()
+        return is_traversable(tile_char)
 
     def update_state(self, game_map):
         map_height = len(game_map)
@@ -50,6 +49,14 @@ class Player:
         else:
             self.move_right = False
 
+    def update_state_from_mask(self, passable):
+        # same as update_state, but reads LevelData.passable instead of tile characters
+        map_height, map_width = passable.shape
+        self.move_up = self.y > 0 and bool(passable[self.y - 1, self.x])
+        self.move_down = self.y < map_height - 1 and bool(passable[self.y + 1, self.x])
+        self.move_left = self.x > 0 and bool(passable[self.y, self.x - 1])
+        self.move_right = self.x < map_width - 1 and bool(passable[self.y, self.x + 1])
+
     def move(self, direction_key: str) -> bool: # direction_key is 'w', 'a', 's', 'd'
         key = direction_key.lower()
         moved = False
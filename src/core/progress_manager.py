@@ -1,51 +1,141 @@
+import atexit
 import os
 import json
+import threading
+import time
+import weakref
+from config import Configurations
 
 SAVE_FILE = "save_file.json"
 DEFAULT_PROGRESS = 1
 
+config = Configurations()
+
+# Progress is read from disk once and then served from memory. Saves only update memory and
+# wake a background writer, which waits PROGRESS_FLUSH_DELAY so that saves in quick succession
+# share one write, then writes the latest progress to a temporary file, fsyncs it and renames
+# it over the save file. A crash at any point leaves either the old or the new save, never a
+# torn one. The writer thread only runs while there is something to write. flush() writes
+# pending progress right away and also runs at interpreter exit for every manager still alive.
+
+_live_managers = weakref.WeakSet() # held weakly, so exit flushing keeps no manager alive
+
+def _flush_live_managers():
+    for progress_manager in list(_live_managers):
+        progress_manager.flush()
+
+atexit.register(_flush_live_managers)
+
 class ProgressManager:
-    def __init__(self, save_file_path=None):
+    def __init__(self, save_file_path=None, flush_delay=None):
         if save_file_path is None:
             self.save_file_path = SAVE_FILE
         else:
             self.save_file_path = save_file_path
+        self.flush_delay = config.PROGRESS_FLUSH_DELAY if flush_delay is None else flush_delay
+        self._max_level = None # None until first loaded or saved
+        self._dirty = False # memory holds progress the save file doesn't have yet
+        self._state_lock = threading.Lock()
+        self._write_lock = threading.Lock() # one writer of the save file at a time
+        self._writer = None # the write-behind thread, while one runs
+        _live_managers.add(self)
     
     
     def load_progress(self):
+        with self._state_lock:
+            if self._max_level is not None:
+                return self._max_level
         print("[ProgressManager] load_progress() called")
         try:
             with open(self.save_file_path, 'r') as fp:
                 data = json.load(fp)
                 max_level = data.get('max_level_unlocked', DEFAULT_PROGRESS)
                 print(f"[ProgressManager] Progress loaded: Max level unlocked = {max_level}")
-                return max_level
         except FileNotFoundError:
             print(f"[ProgressManager] Save file {self.save_file_path} not found, returning default progress.")
             max_level = DEFAULT_PROGRESS
-            return max_level        
+        except ValueError as e:
+            print(f"[ProgressManager] Save file {self.save_file_path} unreadable ({e}), returning default progress.")
+            max_level = DEFAULT_PROGRESS
+        with self._state_lock:
+            if self._max_level is None: # unless a save got in first
+                self._max_level = max_level
+            return self._max_level
     
     def save_progress(self, max_level_unlocked):
+        # updates memory and returns; the writer thread puts it on disk
         print(f"[ProgressManager] save_progress({max_level_unlocked}) called")
-        data_to_save = {
-            'max_level_unlocked': max_level_unlocked
-        }
+        with self._state_lock:
+            self._max_level = max_level_unlocked
+            self._dirty = True
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_behind, name="progress-writer", daemon=True)
+                self._writer.start()
+
+    def _write_behind(self):
+        while True:
+            time.sleep(self.flush_delay)
+            written = self._flush()
+            with self._state_lock:
+                # after a failed write the next save, flush() or exit tries again, rather
+                # than this thread retrying every flush_delay
+                if not written or not self._dirty:
+                    self._writer = None
+                    return
+
+    def flush(self):
+        # writes progress saved since the last write, if any, before returning
+        self._flush()
+
+    def _flush(self) -> bool:
+        # False when the write failed and the progress is still only in memory
+        with self._write_lock:
+            with self._state_lock:
+                if not self._dirty:
+                    return True
+                data_to_save = {
+                    'max_level_unlocked': self._max_level
+                }
+                self._dirty = False
+            try:
+                self._write_atomically(data_to_save)
+                print(f"[ProgressManager] Progress saved to {self.save_file_path}")
+                return True
+            except OSError as e:
+                print(f"[ProgressManager] Error saving progress: {e}")
+                with self._state_lock:
+                    self._dirty = True # still unsaved, so the next flush writes it
+                return False
+
+    def _write_atomically(self, data):
+        temp_path = self.save_file_path + ".tmp"
+        with open(temp_path, 'w') as fp:
+            json.dump(data, fp)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(temp_path, self.save_file_path)
+        try: # makes the rename itself durable; directories can't be opened on Windows
+            directory_fd = os.open(os.path.dirname(os.path.abspath(self.save_file_path)), os.O_RDONLY)
+        except OSError:
+            return
         try:
-            with open(self.save_file_path, 'w') as fp:
-                json.dump(data_to_save, fp)
-            print(f"[ProgressManager] Progress saved to {self.save_file_path}")
-        except Exception as e:
-            print(f"[ProgressManager] Error saving progress: {e}")
+            os.fsync(directory_fd)
+        finally:
+            os.close(directory_fd)
         
 
     def reset_progress(self, deletion=False):
         print("[ProgressManager] reset_progress() called")
         if deletion:
-            try:
-                os.remove(self.save_file_path)
-                print(f"[ProgressManager] Save file {self.save_file_path} deleted.")
-            except FileNotFoundError:
-                print(f"[ProgressManager] Save file {self.save_file_path} not found, nothing to delete.")
+            with self._write_lock:
+                with self._state_lock:
+                    self._max_level = DEFAULT_PROGRESS
+                    self._dirty = False # a pending write would bring the file back
+                try:
+                    os.remove(self.save_file_path)
+                    print(f"[ProgressManager] Save file {self.save_file_path} deleted.")
+                except FileNotFoundError:
+                    print(f"[ProgressManager] Save file {self.save_file_path} not found, nothing to delete.")
         else: 
             self.save_progress(DEFAULT_PROGRESS)
 
@@ -59,9 +149,11 @@ if __name__ == "__main__":
     print("saving progress: 5")
     new_unlocked_level = 5
     pm.save_progress(new_unlocked_level)
+    pm.flush()
 
     current_max_level = pm.load_progress()
     print(f"   After saving, max level unlocked is: {current_max_level}")
+    print(f"   On disk: {ProgressManager(pm.save_file_path).load_progress()}")
 
     print("resetting progress:")
     pm.reset_progress()
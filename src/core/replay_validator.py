@@ -0,0 +1,177 @@
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import redirect_stdout
+from itertools import islice
+from core.level_loader import LevelLoader
+from core.simulation import SimulationLevel, SimulationResult, simulate
+from config import Configurations
+
+config = Configurations()
+
+# Checks recorded replays (a level id plus a string of 'w'/'a'/'s'/'d' moves, optionally
+# 'h' hint uses) by re-running them on the headless simulation across a process pool.
+# Replays go out in chunks and verdicts stream back as chunks finish, so millions of logs
+# can be validated without holding them all in memory.
+
+class ReplayVerdict:
+    def __init__(self, replay_id, level_id, result=None, claimed_outcome=None, error=None):
+        self.replay_id = replay_id
+        self.level_id = level_id
+        self.result = result                    # SimulationResult, None when the replay could not run
+        self.claimed_outcome = claimed_outcome  # outcome recorded with the log, if any
+        self.error = error
+
+    @property
+    def is_valid(self) -> bool:
+        if self.result is None:
+            return False
+        return self.claimed_outcome is None or self.claimed_outcome == self.result.outcome
+
+    def to_row(self):
+        # flat tuple sent between processes; pickling objects costs over ten times as much
+        result = self.result
+        if result is None:
+            return (self.replay_id, self.level_id, self.claimed_outcome, self.error)
+        return (self.replay_id, self.level_id, self.claimed_outcome, self.error, result.outcome, result.fuel,
+                result.battery, result.packages_left, result.position, result.delivered_mask, result.actions_used)
+
+    @classmethod
+    def from_row(cls, row):
+        result = SimulationResult(*row[4:]) if len(row) > 4 else None
+        return cls(row[0], row[1], result, row[2], row[3])
+
+    def __str__(self):
+        if self.error:
+            return f"ReplayVerdict({self.replay_id}, level {self.level_id}: {self.error})"
+        return (f"ReplayVerdict({self.replay_id}, level {self.level_id}: {self.result.outcome}, "
+                f"claimed {self.claimed_outcome}, valid: {self.is_valid})")
+
+# Per-process state: every worker loads each level once and keeps it for all its chunks.
+_worker_loader: LevelLoader | None = None
+_worker_levels: dict[int, SimulationLevel | None] = {}
+
+def _init_worker(levels_directory):
+    global _worker_loader
+    _worker_loader = LevelLoader(levels_directory, prepare_routing=False) # simulate() needs no hints
+    _worker_levels.clear()
+
+def _get_level(level_id):
+    if level_id not in _worker_levels:
+        with open(os.devnull, 'w') as quiet, redirect_stdout(quiet):
+            level_data = _worker_loader.load_level_by_number(level_id)
+        _worker_levels[level_id] = SimulationLevel(level_data) if level_data else None
+    return _worker_levels[level_id]
+
+def _validate_replay(replay_id, level_id, moves, claimed_outcome):
+    if level_id is None:
+        return ReplayVerdict(replay_id, level_id, claimed_outcome=claimed_outcome, error="Replay has no level_id.")
+    level = _get_level(level_id)
+    if level is None:
+        return ReplayVerdict(replay_id, level_id, claimed_outcome=claimed_outcome,
+                             error=f"Level {level_id} could not be loaded.")
+    return ReplayVerdict(replay_id, level_id, simulate(level, moves), claimed_outcome)
+
+def _validate_chunk(chunk):
+    # chunk is a list of (replay_id, level_id, moves, claimed_outcome).
+    # Returns (verdict rows, moves replayed, invalid replays).
+    rows = []
+    moves_replayed = 0
+    invalid = 0
+    for replay_id, level_id, moves, claimed_outcome in chunk:
+        # a malformed log gets an error verdict of its own instead of failing the chunk
+        try:
+            verdict = _validate_replay(replay_id, level_id, moves, claimed_outcome)
+        except Exception as e:
+            verdict = ReplayVerdict(replay_id, level_id, claimed_outcome=claimed_outcome,
+                                    error=f"Replay could not be run: {e!r}")
+        if verdict.result is not None:
+            moves_replayed += verdict.result.actions_used
+        if not verdict.is_valid:
+            invalid += 1
+        rows.append(verdict.to_row())
+    return rows, moves_replayed, invalid
+
+class ReplayValidator:
+    def __init__(self, levels_directory="assets/levels", max_workers=None, chunk_size=None):
+        self.levels_directory = levels_directory
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size or config.REPLAY_CHUNK_SIZE
+        self.stats = {"replays": 0, "moves": 0, "invalid": 0, "seconds": 0.0,
+                      "replays_per_second": 0.0, "moves_per_second": 0.0}
+
+    def _chunks(self, logs):
+        # logs yield dicts with "replay_id", "level_id", "moves" and optionally "outcome";
+        # anything missing is left for the worker to turn into an error verdict
+        logs = iter(logs)
+        while True:
+            chunk = [(log.get("replay_id"), log.get("level_id"), log.get("moves"), log.get("outcome"))
+                     if isinstance(log, dict) else (None, None, None, None)
+                     for log in islice(logs, self.chunk_size)]
+            if not chunk:
+                return
+            yield chunk
+
+    def validate(self, logs):
+        # yields a ReplayVerdict per log in completion order (not input order); self.stats
+        # is kept up to date while verdicts stream in
+        self.stats = {"replays": 0, "moves": 0, "invalid": 0, "seconds": 0.0,
+                      "replays_per_second": 0.0, "moves_per_second": 0.0}
+        started = time.perf_counter()
+        chunks = self._chunks(logs)
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                 initargs=(self.levels_directory,)) as executor:
+            # a couple of chunks queued per worker keeps them busy without reading every log up front
+            pending = {executor.submit(_validate_chunk, chunk)
+                       for chunk in islice(chunks, self.max_workers * 2)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    next_chunk = next(chunks, None)
+                    if next_chunk is not None:
+                        pending.add(executor.submit(_validate_chunk, next_chunk))
+
+                    rows, moves_replayed, invalid = future.result()
+                    self._count(len(rows), moves_replayed, invalid, started)
+                    for row in rows:
+                        yield ReplayVerdict.from_row(row)
+
+    def _count(self, replays, moves_replayed, invalid, started):
+        stats = self.stats
+        stats["replays"] += replays
+        stats["moves"] += moves_replayed
+        stats["invalid"] += invalid
+        stats["seconds"] = time.perf_counter() - started
+        if stats["seconds"] > 0:
+            stats["replays_per_second"] = stats["replays"] / stats["seconds"]
+            stats["moves_per_second"] = stats["moves"] / stats["seconds"]
+
+def read_replay_logs(filepath):
+    # one JSON object per line: {"replay_id": ..., "level_id": 1, "moves": "wwdd", "outcome": ...}
+    with open(filepath, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+if __name__ == "__main__":
+    import random
+    import sys
+
+    if len(sys.argv) > 1:
+        logs = read_replay_logs(sys.argv[1])
+    else:
+        rng = random.Random(0)
+        logs = ({"replay_id": i, "level_id": rng.randint(1, 5),
+                 "moves": "".join(rng.choice("wasd") for _ in range(200))} for i in range(20_000))
+
+    validator = ReplayValidator()
+    outcomes = {}
+    for verdict in validator.validate(logs):
+        key = verdict.result.outcome if verdict.result else "error"
+        outcomes[key] = outcomes.get(key, 0) + 1
+    print(f"Outcomes: {outcomes}")
+    print(f"{validator.stats['replays']} replays, {validator.stats['moves']} moves in "
+          f"{validator.stats['seconds']:.2f}s ({validator.stats['replays_per_second']:.0f} replays/s, "
+          f"{validator.stats['moves_per_second'] / 1e6:.2f}M moves/s) on {validator.max_workers} workers")
@@ -0,0 +1,230 @@
+import time
+from core.hint_provider import HintProvider
+from config import Configurations
+
+config = Configurations()
+
+INFINITE_COST = float('inf')
+
+# Plans the fuel-cheapest order for visiting every pending destination.
+# Coordinates are (x, y) like HintProvider. One planner lives for a whole level:
+# paths out of each destination and the ordering table only depend on the map,
+# so later hint requests reuse them until reset() is called.
+class RoutePlanner:
+    def __init__(self, hint_provider: HintProvider, time_budget=None, exact_limit=None):
+        self.hint_provider = hint_provider
+        self.time_budget = config.HINT_ROUTE_TIME_BUDGET if time_budget is None else time_budget
+        self.exact_limit = config.HINT_ROUTE_EXACT_LIMIT if exact_limit is None else exact_limit
+        self.reset()
+
+    def reset(self):
+        self._map_data = None
+        self._distance_fields = None
+        self._pool = []              # destinations known to this level, index = bit in masks
+        self._pool_index = {}
+        self._dest_fields = {}       # destination -> (costs, parents) out of that destination
+        self._order_costs = None     # Held-Karp table: _order_costs[mask][i]
+        self._order_choices = None
+        self._next_mask = 0          # first mask of the table not filled in yet
+        self._last_order = None      # last heuristic ordering, seeds the next one
+
+    def plan_route(self, map_data, start_coords, destinations, distance_fields=None) -> list[tuple[int, int]]:
+        # full path from start_coords through every reachable destination, cheapest order first.
+        # With the level's precomputed distance fields every leg is a table lookup/walk.
+        if map_data is not self._map_data or distance_fields is not self._distance_fields or \
+           not set(destinations) <= self._pool_index.keys():
+            self.reset()
+            self._map_data = map_data
+            if distance_fields is not None and all(dest in distance_fields for dest in destinations):
+                self._distance_fields = distance_fields
+            self._pool = list(dict.fromkeys(destinations))
+            self._pool_index = {dest: i for i, dest in enumerate(self._pool)}
+
+        start_parents = None
+        if self._distance_fields is not None:
+            first_leg = [self._distance_fields.cost(start_coords, dest) for dest in self._pool]
+            first_leg = [INFINITE_COST if cost is None else cost for cost in first_leg]
+        else:
+            start_costs, start_parents = self.hint_provider.get_cost_field(map_data, start_coords)
+            first_leg = [start_costs.get(dest, INFINITE_COST) for dest in self._pool]
+
+        pending = [self._pool_index[dest] for dest in dict.fromkeys(destinations)
+                   if first_leg[self._pool_index[dest]] != INFINITE_COST]
+        if not pending:
+            return []
+
+        matrix = self._get_cost_matrix()
+        # the budget caps the ordering work only, not the legs the matrix had to search
+        deadline = time.perf_counter() + self.time_budget
+
+        order = None
+        if len(self._pool) <= self.exact_limit and self._fill_order_table(matrix, deadline):
+            order = self._exact_order(first_leg, pending)
+        if order is None:
+            order = self._heuristic_order(first_leg, matrix, pending, deadline)
+            self._last_order = order
+
+        return self._build_path(start_coords, start_parents, order)
+
+    def _get_cost_matrix(self):
+        # matrix[i][j] = fuel to go from pool destination i to pool destination j
+        if self._distance_fields is not None:
+            matrix = [[self._distance_fields.cost(src, dst) for dst in self._pool] for src in self._pool]
+            return [[INFINITE_COST if cost is None else cost for cost in row] for row in matrix]
+
+        for dest in self._pool:
+            if dest not in self._dest_fields:
+                self._dest_fields[dest] = self.hint_provider.get_cost_field(self._map_data, dest)
+        return [[self._dest_fields[src][0].get(dst, INFINITE_COST) for dst in self._pool]
+                for src in self._pool]
+
+    def _fill_order_table(self, matrix, deadline) -> bool:
+        # backward Held-Karp over the whole pool: _order_costs[mask][i] is the cheapest way
+        # to visit every destination in mask starting from destination i (i not in mask).
+        # It does not depend on the player position, so it is built once per level and
+        # resumed across hints if a previous call ran out of time budget.
+        n = len(self._pool)
+        total_masks = 1 << n
+        if self._order_costs is None:
+            self._order_costs = [None] * total_masks
+            self._order_choices = [None] * total_masks
+            self._next_mask = 0
+
+        for mask in range(self._next_mask, total_masks):
+            if time.perf_counter() > deadline:
+                self._next_mask = mask
+                return False
+
+            row_costs = [INFINITE_COST] * n
+            row_choices = [None] * n
+            for i in range(n):
+                if mask & (1 << i):
+                    continue
+                if mask == 0:
+                    row_costs[i] = 0
+                    continue
+                best_cost = INFINITE_COST
+                best_next = None
+                for j in range(n):
+                    if not mask & (1 << j):
+                        continue
+                    cost = matrix[i][j] + self._order_costs[mask ^ (1 << j)][j]
+                    if cost < best_cost:
+                        best_cost = cost
+                        best_next = j
+                row_costs[i] = best_cost
+                row_choices[i] = best_next
+            self._order_costs[mask] = row_costs
+            self._order_choices[mask] = row_choices
+
+        self._next_mask = total_masks
+        return True
+
+    def _exact_order(self, first_leg, pending):
+        pending_mask = 0
+        for i in pending:
+            pending_mask |= 1 << i
+
+        best_cost = INFINITE_COST
+        best_first = None
+        for i in pending:
+            cost = first_leg[i] + self._order_costs[pending_mask ^ (1 << i)][i]
+            if cost < best_cost:
+                best_cost = cost
+                best_first = i
+
+        order = [best_first]
+        mask = pending_mask ^ (1 << best_first)
+        while mask:
+            next_dest = self._order_choices[mask][order[-1]]
+            order.append(next_dest)
+            mask ^= 1 << next_dest
+        return order
+
+    def _route_cost(self, first_leg, matrix, order):
+        cost = first_leg[order[0]]
+        for a, b in zip(order, order[1:]):
+            cost += matrix[a][b]
+        return cost
+
+    def _heuristic_order(self, first_leg, matrix, pending, deadline):
+        # seed from the previous ordering when there is one, otherwise nearest neighbour
+        pending_set = set(pending)
+        if self._last_order is not None and pending_set <= set(self._last_order):
+            order = [i for i in self._last_order if i in pending_set]
+        else:
+            order = []
+            remaining = set(pending)
+            current_costs = first_leg
+            while remaining:
+                next_dest = min(remaining, key=lambda i: current_costs[i])
+                order.append(next_dest)
+                remaining.remove(next_dest)
+                current_costs = matrix[next_dest]
+
+        # 2-opt: reverse segments while that makes the (asymmetric) route cheaper
+        best_cost = self._route_cost(first_leg, matrix, order)
+        improved = True
+        while improved:
+            improved = False
+            for i in range(len(order) - 1):
+                if time.perf_counter() > deadline:
+                    return order
+                for j in range(i + 1, len(order)):
+                    candidate = order[:i] + order[i:j + 1][::-1] + order[j + 1:]
+                    candidate_cost = self._route_cost(first_leg, matrix, candidate)
+                    if candidate_cost < best_cost:
+                        order = candidate
+                        best_cost = candidate_cost
+                        improved = True
+        return order
+
+    def _walk_parents(self, parents, end):
+        path = []
+        current = end
+        while current is not None:
+            path.append(current)
+            current = parents[current]
+        return path[::-1]
+
+    def _build_path(self, start_coords, start_parents, order):
+        if self._distance_fields is not None:
+            stops = [start_coords] + [self._pool[i] for i in order]
+            path = [start_coords]
+            for a, b in zip(stops, stops[1:]):
+                path.extend(self._distance_fields.path(a, b)[1:])
+            return path
+
+        path = self._walk_parents(start_parents, self._pool[order[0]])
+        for a, b in zip(order, order[1:]):
+            leg = self._walk_parents(self._dest_fields[self._pool[a]][1], self._pool[b])
+            path.extend(leg[1:])
+        return path
+
+if __name__ == "__main__":
+    from core.distance_field import compute_distance_fields
+
+    planner = RoutePlanner(HintProvider())
+
+    test_map = [
+        "D111111D",
+        "1WWWWWW1",
+        "111S1111",
+        "1WWWWWW1",
+        "D111111D",
+    ]
+    destinations = [(0, 0), (7, 0), (0, 4), (7, 4)]
+    path = planner.plan_route(test_map, (3, 2), destinations)
+    print(f"Route through {len(destinations)} destinations ({len(path) - 1} steps): {path}")
+
+    # second hint after delivering one package reuses the ordering table
+    path = planner.plan_route(test_map, (0, 1), destinations[1:])
+    print(f"Route through {len(destinations) - 1} destinations ({len(path) - 1} steps): {path}")
+
+    planner.exact_limit = 0
+    path = planner.plan_route(list(test_map), (3, 2), destinations)
+    print(f"Heuristic route ({len(path) - 1} steps): {path}")
+
+    fields = compute_distance_fields(test_map, destinations)
+    path = planner.plan_route(test_map, (3, 2), destinations, distance_fields=fields)
+    print(f"Route from distance fields ({len(path) - 1} steps): {path}")
@@ -0,0 +1,140 @@
+from array import array
+import numpy as np
+from core.level_loader import LevelData
+from core.tile_rules import DESTINATION_CODE
+from config import Configurations
+
+config = Configurations()
+
+HINT_ACTION = 'h' # replay character for using a hint (request + confirm)
+
+# Headless counterpart of GameManager + Player: no pygame, no printing, and a move loop
+# over flat tables so batch jobs (replay validation, level fuzzing) can step millions of
+# moves per second. Outcomes follow GameManager exactly:
+#   - a move is refused with game over when fuel <= 0 while packages are left
+#   - a blocked move changes nothing, and any other character counts as a blocked move
+#   - entering a tile costs its fuel, then a pending destination there is delivered
+#   - all packages delivered wins (checked before fuel < 0, which is game over)
+#   - once the level is won or lost the remaining actions are ignored
+#   - 'h' uses a hint while the battery allows it, costing HINT_BATTERY_COST_PER_USE
+
+class SimulationLevel:
+    # LevelData flattened for the move loop; tiles are addressed by y * width + x
+    def __init__(self, level_data: LevelData):
+        self.name = level_data.name
+        self.width = level_data.grid_width
+        self.height = level_data.grid_height
+        self.initial_fuel = level_data.initial_fuel
+        self.hint_battery = level_data.hint_battery
+        self.num_packages = level_data.num_packages_to_deliver
+        start_row, start_col = level_data.player_start_pos
+        self.start_index = start_row * self.width + start_col
+
+        passable = level_data.passable
+        width, height = self.width, self.height
+        indices = np.arange(width * height, dtype=np.int32).reshape(height, width)
+
+        # next tile for each move key, -1 where Player.move would refuse it
+        self.steps = {}
+        for key, (dx, dy) in ((config.PLAYER_ACTION_MOVE_UP, (0, -1)), (config.PLAYER_ACTION_MOVE_DOWN, (0, 1)),
+                              (config.PLAYER_ACTION_MOVE_LEFT, (-1, 0)), (config.PLAYER_ACTION_MOVE_RIGHT, (1, 0))):
+            step = np.full((height, width), -1, dtype=np.int32)
+            target_rows = slice(max(0, dy), height + min(0, dy))
+            target_cols = slice(max(0, dx), width + min(0, dx))
+            source_rows = slice(max(0, -dy), height + min(0, -dy))
+            source_cols = slice(max(0, -dx), width + min(0, -dx))
+            step[source_rows, source_cols] = np.where(passable[target_rows, target_cols],
+                                                      indices[target_rows, target_cols], -1)
+            table = array('i', step.tobytes())
+            self.steps[key] = table
+            self.steps[key.upper()] = table # Player.move lower-cases its key
+
+        self.costs = array('i', level_data.cost_grid.astype(np.int32).tobytes())
+
+        # delivered-mask bit of each destination tile index; bit i is destination_tiles[i] (row, col)
+        self.destination_bits = {}
+        self.destination_tiles = []
+        for bit, (row, col) in enumerate(level_data.destination_coords):
+            if level_data.terrain[row, col] == DESTINATION_CODE:
+                self.destination_bits[row * width + col] = 1 << bit
+            self.destination_tiles.append((row, col))
+
+class SimulationResult:
+    def __init__(self, outcome, fuel, battery, packages_left, position, delivered_mask, actions_used):
+        self.outcome = outcome            # config.GAME_STATE_PLAYING / LEVEL_COMPLETE / GAME_OVER
+        self.fuel = fuel
+        self.battery = battery
+        self.packages_left = packages_left
+        self.position = position          # (x, y) like Player.get_location
+        self.delivered_mask = delivered_mask # bit i set = destination_coords[i] delivered
+        self.actions_used = actions_used  # actions read before the level ended (or all of them)
+
+    def __eq__(self, other):
+        return isinstance(other, SimulationResult) and vars(self) == vars(other)
+
+    def __str__(self):
+        return (f"SimulationResult(Outcome: {self.outcome}, Fuel: {self.fuel}, Battery: {self.battery}, "
+                f"Packages left: {self.packages_left}, Position: {self.position}, Actions used: {self.actions_used})")
+
+def simulate(level, actions) -> SimulationResult:
+    # level is a LevelData or SimulationLevel; actions is a string (or iterable) of
+    # 'w'/'a'/'s'/'d' moves and 'h' hints
+    if not isinstance(level, SimulationLevel):
+        level = SimulationLevel(level)
+
+    fuel = level.initial_fuel
+    battery = level.hint_battery
+    packages_left = level.num_packages
+    position = level.start_index
+    delivered = 0
+    steps = level.steps
+    costs = level.costs
+    destination_bits = level.destination_bits
+    hint_cost = config.HINT_BATTERY_COST_PER_USE
+
+    outcome = config.GAME_STATE_PLAYING
+    actions_used = 0
+    if packages_left == 0:
+        outcome = config.GAME_STATE_LEVEL_COMPLETE
+    else:
+        for action in actions:
+            actions_used += 1
+            table = steps.get(action)
+            if table is None:
+                if action == HINT_ACTION:
+                    if battery >= hint_cost:
+                        battery -= hint_cost
+                    continue
+                if fuel <= 0:
+                    outcome = config.GAME_STATE_GAME_OVER
+                    break
+                continue
+            if fuel <= 0:
+                outcome = config.GAME_STATE_GAME_OVER
+                break
+            next_position = table[position]
+            if next_position < 0:
+                continue
+            position = next_position
+            fuel -= costs[position]
+            bit = destination_bits.get(position)
+            if bit is not None and not delivered & bit:
+                delivered |= bit
+                packages_left -= 1
+                if packages_left == 0:
+                    outcome = config.GAME_STATE_LEVEL_COMPLETE
+                    break
+            if fuel < 0:
+                outcome = config.GAME_STATE_GAME_OVER
+                break
+
+    return SimulationResult(outcome, fuel, battery, packages_left,
+                            (position % level.width, position // level.width), delivered, actions_used)
+
+if __name__ == "__main__":
+    from core.level_loader import LevelLoader
+
+    level_data = LevelLoader(prepare_routing=False).load_level_by_number(1)
+    level = SimulationLevel(level_data)
+    print(simulate(level, "wwwwdddd"))
+    print(simulate(level, "dh" * 100))
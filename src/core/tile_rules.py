@@ -0,0 +1,67 @@
+import numpy as np
+from config import Configurations
+
+config = Configurations()
+
+# Cheapest fuel charge any tile can have. Manhattan distance times this value
+# never overestimates the real fuel cost, so it is a safe A* heuristic.
+MIN_TILE_FUEL_COST = min(1, config.DEFAULT_FUEL_CONSUMPTION_PER_MOVE)
+
+# Tile characters as stored in LevelData.terrain (one uint8 per tile)
+WALL_CODE = ord(config.WALL_TILE)
+START_CODE = ord(config.START_TILE)
+DESTINATION_CODE = ord(config.DESTINATION_TILE)
+
+def get_fuel_cost(tile_char: str) -> int:
+    # fuel charged for entering a tile: road digits cost their value, everything else the default
+    if tile_char.isdigit():
+        cost = int(tile_char)
+        return cost if cost > 0 else config.DEFAULT_FUEL_CONSUMPTION_PER_MOVE
+    return config.DEFAULT_FUEL_CONSUMPTION_PER_MOVE
+
+def is_traversable(tile_char: str) -> bool:
+    if tile_char == config.WALL_TILE:
+        return False
+    return tile_char in [config.START_TILE, config.DESTINATION_TILE] or tile_char.isdigit()
+
+def _build_lookup_tables():
+    # indexed by tile code; only ASCII tiles can appear in a packed grid
+    passable = np.zeros(256, dtype=bool)
+    costs = np.zeros(256, dtype=np.uint8)
+    for code in range(128):
+        tile_char = chr(code)
+        if is_traversable(tile_char):
+            passable[code] = True
+            costs[code] = get_fuel_cost(tile_char)
+    return passable, costs
+
+# PASSABLE_LUT[code] -> can the player enter the tile
+# TILE_COST_LUT[code] -> fuel for entering it, 0 for tiles that cannot be entered
+PASSABLE_LUT, TILE_COST_LUT = _build_lookup_tables()
+
+# maps every non-zero tile cost to 1, for step-count searches over a cost table
+UNIT_COST_TABLE = bytes([0] + [1] * 255)
+
+def encode_grid(grid) -> np.ndarray:
+    # packs a list of row strings (or lists of tile characters) into a (height, width) uint8 array
+    height = len(grid)
+    width = len(grid[0]) if height > 0 else 0
+    try:
+        packed = "".join("".join(row) for row in grid).encode("ascii")
+    except UnicodeEncodeError:
+        raise ValueError("map_grid may only contain ASCII tile characters.")
+    if len(packed) != width * height:
+        raise ValueError("map_grid rows must all have the same length.")
+    return np.frombuffer(packed, dtype=np.uint8).reshape(height, width)
+
+def decode_grid(terrain: np.ndarray) -> list[str]:
+    return [row.tobytes().decode("ascii") for row in terrain]
+
+def get_cost_table(map_data):
+    # (width, height, flat costs) for a LevelData or a plain list of rows; the flat costs are
+    # indexed by row * width + col and hold 0 for tiles that cannot be entered
+    if hasattr(map_data, "flat_costs"):
+        return map_data.grid_width, map_data.grid_height, map_data.flat_costs
+    terrain = encode_grid(map_data)
+    height, width = terrain.shape
+    return width, height, TILE_COST_LUT[terrain].tobytes()
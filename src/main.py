@@ -1,15 +1,7 @@
 import pygame
 from screens.screen_manager import ScreenManager
-from screens.title_screen import TitleScreen
-from screens.tutorial_screen import TutorialScreen
-from screens.settings_screen import SettingsScreen
-from screens.main_menu_screen import MainMenuScreen
-from screens.game_play_screen import GamePlayScreen
-
-from core.progress_manager import ProgressManager
-from core.game_manager import GameManager
-from core.level_loader import LevelLoader
-from core.hint_provider import HintProvider
+from ui_elements.asset_manager import assets
+# Screens and the game modules behind them are imported when first built, see below
 
 pygame.init()
 
@@ -19,41 +11,68 @@ try:
     screen_width = config.SCREEN_WIDTH
     screen_height = config.SCREEN_HEIGHT
     fps = config.FPS
+    tile_size = config.tile_size
 except (ImportError, AttributeError):
     print("Warning: config.py not found or incomplete. Using default values.")
     screen_width = 800
     screen_height = 600
     fps = 60
+    tile_size = 40
 
 screen = pygame.display.set_mode((screen_width, screen_height))
 pygame.display.set_caption("apt-get packages")
 clock = pygame.time.Clock()
 
 # inits innit
-level_loader = LevelLoader()
-progress_manager = ProgressManager()
-hint_provider = HintProvider()
-game_manager = GameManager(level_loader, progress_manager, hint_provider) 
+game_manager = None
+
+def get_game_manager():
+    # the title screen doesn't need the game, so it is set up with the first screen that does
+    global game_manager
+    if game_manager is None:
+        from core.progress_manager import ProgressManager
+        from core.game_manager import GameManager
+        from core.level_loader import LevelLoader
+        from core.hint_provider import HintProvider
+        game_manager = GameManager(LevelLoader(), ProgressManager(), HintProvider())
+    return game_manager
+
 screen_manager = ScreenManager()
 
 
-# Screens Shenanigans
-title_screen = TitleScreen()
-tutorial_screen = TutorialScreen()
-settings_screen = SettingsScreen(game_manager)
-main_menu_screen = MainMenuScreen(game_manager) 
-game_play_screen = GamePlayScreen(game_manager)
+# Screens Shenanigans: each is built on first visit, or ahead of it in a frame with time
+# to spare while a screen that likely leads there is shown
+def title_screen():
+    from screens.title_screen import TitleScreen
+    return TitleScreen()
+
+def tutorial_screen():
+    from screens.tutorial_screen import TutorialScreen
+    return TutorialScreen()
+
+def settings_screen():
+    from screens.settings_screen import SettingsScreen
+    return SettingsScreen(get_game_manager())
 
-screen_manager.add_screen('title', title_screen)
-screen_manager.add_screen('tutorial', tutorial_screen)
-screen_manager.add_screen('settings', settings_screen)
-screen_manager.add_screen('main_menu', main_menu_screen)
-screen_manager.add_screen('game_play', game_play_screen)
+def main_menu_screen():
+    from screens.main_menu_screen import MainMenuScreen
+    return MainMenuScreen(get_game_manager())
+
+def game_play_screen():
+    from screens.game_play_screen import GamePlayScreen
+    return GamePlayScreen(get_game_manager())
+
+screen_manager.add_screen_factory('title', title_screen, likely_next=['main_menu', 'tutorial', 'settings'])
+screen_manager.add_screen_factory('tutorial', tutorial_screen)
+screen_manager.add_screen_factory('settings', settings_screen)
+screen_manager.add_screen_factory('main_menu', main_menu_screen, likely_next=['game_play'])
+screen_manager.add_screen_factory('game_play', game_play_screen)
 
 screen_manager.go_to_screen('title')
 
 # Main loop
 running = True
+assets_warming = False
 while running:
     dt = clock.tick(fps) / 1000.0  # Delta time in seconds
 
@@ -63,8 +82,23 @@ while running:
         screen_manager.handle_event(event) # ScreenManager handles event distribution
 
     screen_manager.update(dt)
-    screen_manager.render(screen) # Render current screen        
+    dirty_rects = screen_manager.render(screen) # Render current screen; None when all of it changed
+
+    if dirty_rects is None:
+        pygame.display.flip()
+    elif dirty_rects:
+        pygame.display.update(dirty_rects)
+
+    if not assets_warming:
+        # Screens fetch their images when first drawn; with the title up, decode and scale
+        # the others in the background
+        assets.warm(images=[(f"backgrounds/{name}.png", (screen_width, screen_height))
+                            for name in ("main_menu", "settings", "tutorial")],
+                    tile_sizes=[tile_size])
+        assets_warming = True
 
-    pygame.display.flip()
+    # a frame that took under half its time leaves room to build a screen ahead of use
+    if clock.get_rawtime() < 500 / fps:
+        screen_manager.prewarm_next()
 
 pygame.quit()
\ No newline at end of file
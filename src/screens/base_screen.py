@@ -1,11 +1,30 @@
 import pygame
+from ui_elements.asset_manager import assets
 
 class BaseScreen:
     def __init__(self):
         self.manager = None 
+        self._background = None # (image, rect) once fetched by background()
         self.screen_width = pygame.display.get_surface().get_width() if pygame.display.get_init() else 1280
         self.screen_height = pygame.display.get_surface().get_height() if pygame.display.get_init() else 720
 
+    def background(self, path, label):
+        # the screen-sized image at path from the shared assets, fetched on first use rather
+        # than when the screen is built; a grey placeholder naming the image if it won't load
+        if self._background is None:
+            try:
+                image = assets.scaled(path, (self.screen_width, self.screen_height))
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Error loading {label.lower()} image: {e}")
+                image = pygame.Surface((self.screen_width - 100, self.screen_height - 200))
+                image.fill((100, 100, 100))
+                error_font = pygame.font.Font(None, 36)
+                error_text = error_font.render(f"{label} Image Not Found!", True, (255, 0, 0))
+                error_rect = error_text.get_rect(center=(image.get_width()//2, image.get_height()//2))
+                image.blit(error_text, error_rect)
+            self._background = (image, image.get_rect(center=(self.screen_width // 2, self.screen_height // 2)))
+        return self._background
+
     def on_enter(self, **kwargs):
         # print(f"Entering {self.__class__.__name__} with args: {kwargs}")
         pass
@@ -20,4 +39,5 @@ class BaseScreen:
         raise NotImplementedError("Subclasses must implement update.")
 
     def render(self, surface):
+        # may return a list of the rects that changed for pygame.display.update; None means the whole surface
         raise NotImplementedError("Subclasses must implement render.")
\ No newline at end of file
@@ -0,0 +1,78 @@
+import pygame
+
+# Which tiles of a level are on screen. The view is a fixed rect of the screen; the camera
+# scrolls in whole tiles to keep the followed tile at least edge_margin tiles inside it,
+# and a map narrower or shorter than the view is centered in it instead.
+
+class Camera:
+    def __init__(self, view_rect, tile_size, edge_margin=0):
+        self.view_rect = pygame.Rect(view_rect)
+        self.tile_size = tile_size
+        self.edge_margin = edge_margin
+        self.map_cols = 0
+        self.map_rows = 0
+        self.col = 0 # top-left tile in view
+        self.row = 0
+
+    def set_map(self, map_cols, map_rows):
+        self.map_cols = map_cols
+        self.map_rows = map_rows
+        self.col = self.row = 0
+
+    def set_tile_size(self, tile_size):
+        self.tile_size = tile_size
+        self.col, self.row = self._clamp(self.col, self.row)
+
+    def view_tiles(self) -> tuple[int, int]:
+        # whole tiles that fit in the view
+        return self.view_rect.width // self.tile_size, self.view_rect.height // self.tile_size
+
+    def _clamp(self, col, row):
+        view_cols, view_rows = self.view_tiles()
+        return (max(0, min(col, self.map_cols - view_cols)),
+                max(0, min(row, self.map_rows - view_rows)))
+
+    def center_on(self, col, row):
+        view_cols, view_rows = self.view_tiles()
+        self.col, self.row = self._clamp(col - view_cols // 2, row - view_rows // 2)
+
+    def follow(self, col, row) -> bool:
+        # scrolls just enough to keep (col, row) away from the edges; True if the view moved
+        view_cols, view_rows = self.view_tiles()
+        new_col, new_row = self.col, self.row
+        margin = min(self.edge_margin, max(0, (view_cols - 1) // 2))
+        if col < new_col + margin:
+            new_col = col - margin
+        elif col > new_col + view_cols - 1 - margin:
+            new_col = col - (view_cols - 1 - margin)
+        margin = min(self.edge_margin, max(0, (view_rows - 1) // 2))
+        if row < new_row + margin:
+            new_row = row - margin
+        elif row > new_row + view_rows - 1 - margin:
+            new_row = row - (view_rows - 1 - margin)
+        new_col, new_row = self._clamp(new_col, new_row)
+        moved = (new_col, new_row) != (self.col, self.row)
+        self.col, self.row = new_col, new_row
+        return moved
+
+    def origin(self) -> tuple[int, int]:
+        # screen position of tile (0, 0), possibly far off screen
+        size = self.tile_size
+        x = self.view_rect.x - self.col * size
+        y = self.view_rect.y - self.row * size
+        if self.map_cols * size < self.view_rect.width:
+            x += (self.view_rect.width - self.map_cols * size) // 2
+        if self.map_rows * size < self.view_rect.height:
+            y += (self.view_rect.height - self.map_rows * size) // 2
+        return x, y
+
+    def visible_range(self) -> tuple[int, int, int, int]:
+        # (first col, first row, end col, end row) of the tiles at least partly in view
+        size = self.tile_size
+        end_col = min(self.map_cols, self.col + -(-self.view_rect.width // size))
+        end_row = min(self.map_rows, self.row + -(-self.view_rect.height // size))
+        return self.col, self.row, end_col, end_row
+
+    def tile_rect(self, col, row) -> pygame.Rect:
+        x, y = self.origin()
+        return pygame.Rect(x + col * self.tile_size, y + row * self.tile_size, self.tile_size, self.tile_size)
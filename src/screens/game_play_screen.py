@@ -1,8 +1,13 @@
+import numpy as np
 import pygame
 from screens.base_screen import BaseScreen # Assuming this is in src/screens/
+from screens.camera import Camera
 from ui_elements.button import Button   # Assuming this is in src/ui_elements/
 from ui_elements.dialog import Dialog     # Assuming this is in src/ui_elements/
+from ui_elements.asset_manager import assets
+from ui_elements.text_cache import render_text
 from config import Configurations       # Import Configurations
+from core.tile_rules import WALL_CODE, START_CODE, DESTINATION_CODE
 
 config = Configurations() # Create an instance to access constants
 
@@ -17,22 +22,40 @@ DEST_UNVISITED_COLOR = (255, 255, 100)
 DEST_VISITED_COLOR = (100, 255, 100)   
 PLAYER_COLOR = (55, 0, 223)
 HINT_PATH_COLOR = (50, 200, 255, 150)
+BACKGROUND_COLOR = (30, 30, 40)
+LOADING_BAR_COLOR = (100, 200, 100)
+LOADING_BAR_BORDER_COLOR = (200, 200, 200)
+ROAD_CODE_2 = ord(config.ROAD_TILE_2)
+ROAD_CODE_3 = ord(config.ROAD_TILE_3)
+HUD_LINE_Y = (620, 650, 680)
+UI_FONT_SIZE = 32
+LOADING_FONT_SIZE = 50
+MAP_VIEW_COLS = 24 # map area on screen, in tiles at TILE_SIZE
+MAP_VIEW_ROWS = 16
+
+# Tile atlas slots; tile codes map to a slot through TILE_KIND_LUT, unknown codes draw as road
+KIND_ROAD_1, KIND_ROAD_2, KIND_ROAD_3, KIND_WALL, KIND_START, KIND_DEST_UNVISITED, KIND_DEST_VISITED = range(7)
+TILE_KIND_LUT = np.full(256, KIND_ROAD_1, dtype=np.uint8)
+TILE_KIND_LUT[ROAD_CODE_2] = KIND_ROAD_2
+TILE_KIND_LUT[ROAD_CODE_3] = KIND_ROAD_3
+TILE_KIND_LUT[WALL_CODE] = KIND_WALL
+TILE_KIND_LUT[START_CODE] = KIND_START
+TILE_KIND_LUT[DESTINATION_CODE] = KIND_DEST_UNVISITED
 
 class GamePlayScreen(BaseScreen):
     def __init__(self, game_manager): # GameManager is essential
         super().__init__()
         self.game_manager = game_manager
-        self.font_ui = pygame.font.Font(None, 32)
         self.current_level_id = None
 
-        map_pixel_width = 24 * TILE_SIZE
-        map_pixel_height = 16 * TILE_SIZE
+        map_pixel_width = MAP_VIEW_COLS * TILE_SIZE
+        map_pixel_height = MAP_VIEW_ROWS * TILE_SIZE
         self.map_offset_x = (self.screen_width - map_pixel_width) // 2
         self.map_offset_y = (self.screen_height - map_pixel_height) // 2
-
-        self.tile_textures = {}
-        self.player_texture = None
-        self._load_textures()      
+        self.camera = Camera((self.map_offset_x, self.map_offset_y, map_pixel_width, map_pixel_height),
+                             TILE_SIZE, config.CAMERA_EDGE_MARGIN)
+        self.zoom_index = config.CAMERA_ZOOM_TILE_SIZES.index(TILE_SIZE)
+        self._tile_atlases = {} # tile size -> (atlas surface, area per kind, player texture)
 
         # --- UI Buttons ---
         def hint_action():
@@ -78,59 +101,51 @@ class GamePlayScreen(BaseScreen):
         
         self.active_dialog_key = None # Stores the key of the currently active dialog
 
-    def _load_textures(self):
-            """Loads all necessary textures for the game."""
-            base_path_tiles = "assets/images/tiles/" # Adjust path as needed
-            base_path_player = "assets/images/player/" # Adjust path as needed
-            
-            try:
-                self.tile_textures[config.WALL_TILE] = pygame.image.load(f"{base_path_tiles}wall.png").convert_alpha()
-                
-                # For destinations, we need two states
-                self.tile_textures['DEST_UNVISITED'] = pygame.image.load(f"{base_path_tiles}unvisited.png").convert_alpha()
-                self.tile_textures['DEST_VISITED'] = pygame.image.load(f"{base_path_tiles}visited.png").convert_alpha()
-
-                # Player Texture
-                self.player_texture = pygame.image.load(f"{base_path_player}player.png").convert_alpha()
-
-                # Scale textures if TILE_SIZE is not their native size
-                for key, texture in self.tile_textures.items():
-                    self.tile_textures[key] = pygame.transform.scale(texture, (TILE_SIZE, TILE_SIZE))
-                if self.player_texture:
-                    self.player_texture = pygame.transform.scale(self.player_texture, (TILE_SIZE, TILE_SIZE))
-
-                print("[GamePlayScreen] Textures loaded successfully.")
-
-            except pygame.error as e:
-                print(f"Error loading textures: {e}")
-                print("Ensure all texture paths are correct and files exist in assets/images/...")
-        
+        # What was last drawn, so render() only redraws what changed since
+        self._needs_full_redraw = True
+        self._baked_level = None
+        self._map_layer = pygame.Surface(self.camera.view_rect.size)
+        self._map_terrain = None
+        self._drawn_visited = set()
+        self._drawn_packages = None
+        self._drawn_player = None
+        self._drawn_hint = None
+        self._hint_layer = pygame.Surface(self.camera.view_rect.size, pygame.SRCALPHA) # markers of _drawn_hint
+        self._hint_shown = 0 # markers of _drawn_hint drawn so far
+        self._hint_progress = 0.0 # how far the reveal animation has got, in tiles
+        self._drawn_dialog = None
+        self._hud_lines = [None, None, None] # (text, surface, rect) per HUD line
+        self._button_looks = [None, None]
+
     def on_enter(self, **kwargs):
         super().on_enter(**kwargs)       
 
         self.current_level_id = kwargs.get('level_id')
         if self.current_level_id is not None:
-            self.game_manager.load_and_start_level(self.current_level_id)
-            if self.game_manager.get_game_state() == config.GAME_STATE_GAME_OVER:
-                 self.dialogs[config.GAME_STATE_GAME_OVER].message = "Out of Fuel!" # Or get specific reason
-            elif self.game_manager.get_game_state() == config.GAME_STATE_LEVEL_COMPLETE:
-                 self.dialogs[config.GAME_STATE_LEVEL_COMPLETE].message = f"Level {self.current_level_id} Complete!"
-
+            # loads in the background; update() starts the level once it is ready
+            self.game_manager.load_level_async(self.current_level_id)
         else:
             print("[GamePlayScreen] Error: No level_id provided on enter!")
             if self.manager: self.manager.go_to_screen('main_menu')
         
         self.active_dialog_key = None 
+        self._needs_full_redraw = True
         for dialog_key in self.dialogs:
             self.dialogs[dialog_key].is_active = False
             self.dialogs[dialog_key].result = None
 
+    def on_exit(self):
+        super().on_exit()
+        self.game_manager.cancel_level_load()
 
     def handle_event(self, event):
         if self.active_dialog_key and self.dialogs[self.active_dialog_key].is_active:
             self.dialogs[self.active_dialog_key].handle_event(event)
             return 
 
+        if event.type == pygame.MOUSEWHEEL and event.y:
+            self._set_zoom(self.zoom_index + (1 if event.y > 0 else -1))
+
         if event.type == pygame.KEYDOWN:
             action_handled_by_gm = False
             if event.key == pygame.K_w or event.key == pygame.K_UP:
@@ -151,6 +166,10 @@ class GamePlayScreen(BaseScreen):
             elif event.key == pygame.K_ESCAPE: 
                 self.game_manager.handle_player_action(action_type='pause_game')
                 action_handled_by_gm = True
+            elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                self._set_zoom(self.zoom_index + 1)
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                self._set_zoom(self.zoom_index - 1)
             
             # if action_handled_by_gm: # Clear hint path on any action that GM processes after a hint
             #     if self.game_manager.get_active_hint_path():
@@ -165,6 +184,14 @@ class GamePlayScreen(BaseScreen):
         # GameManager's state is updated via handle_player_action and its internal logic.
         # GamePlayScreen's update is primarily to react to GameManager's state for UI changes (dialogs).
 
+        if self.game_manager.is_loading():
+            self.game_manager.poll_level_load()
+            if self.game_manager.is_loading():
+                return
+
+        if self._drawn_hint and self._hint_progress < len(self._drawn_hint):
+            self._hint_progress += dt * config.HINT_REVEAL_TILES_PER_SECOND
+
         current_gm_state = self.game_manager.get_game_state()
 
         # Handle dialog results if one was just closed
@@ -214,113 +241,328 @@ class GamePlayScreen(BaseScreen):
             self.dialogs[self.active_dialog_key].is_active = False
             self.active_dialog_key = None
 
-    def _draw_map(self, surface):
-        map_data = self.game_manager.get_current_map_data()
-        player_pos_col_row = self.game_manager.get_player_position() # (col, row)
-        destinations_data = self.game_manager.get_destinations_data() # list of {'pos': (col,row), 'visited': bool}
-
-        if not map_data or player_pos_col_row is None:
-            loading_font = pygame.font.Font(None, 50)
-            text_surf = loading_font.render("Loading Level Data...", True, (200,200,200))
-            text_rect = text_surf.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
-            surface.blit(text_surf, text_rect)
+    def _tile_atlas(self, tile_size):
+        # every tile look drawn once at tile_size side by side, so baking the map is one blit
+        # per tile from a single surface; built on first use of each zoom level from the
+        # shared tile sheet, which falls back to plain colours for textures that didn't load
+        atlas = self._tile_atlases.get(tile_size)
+        if atlas is not None:
+            return atlas
+
+        sheet, sheet_areas = assets.tile_sheet(tile_size)
+        looks = {
+            KIND_ROAD_1: ROAD_COLOR_1,
+            KIND_ROAD_2: ROAD_COLOR_2,
+            KIND_ROAD_3: ROAD_COLOR_3,
+            KIND_WALL: sheet_areas.get("wall", WALL_COLOR),
+            KIND_START: START_COLOR,
+            KIND_DEST_UNVISITED: sheet_areas.get("unvisited", DEST_UNVISITED_COLOR),
+            KIND_DEST_VISITED: sheet_areas.get("visited", DEST_VISITED_COLOR),
+        }
+        surface = pygame.Surface((tile_size * len(looks), tile_size))
+        areas = []
+        for kind, look in sorted(looks.items()):
+            rect = pygame.Rect(kind * tile_size, 0, tile_size, tile_size)
+            if isinstance(look, pygame.Rect):
+                pygame.draw.rect(surface, BACKGROUND_COLOR, rect) # shows through transparent texture pixels
+                surface.blit(sheet, rect, look)
+            else:
+                pygame.draw.rect(surface, look, rect)
+            pygame.draw.rect(surface, (122,122,122), rect, 1) # Grid lines
+            areas.append(rect)
+
+        player = sheet.subsurface(sheet_areas["player"]) if "player" in sheet_areas else None
+        atlas = (surface, areas, player)
+        self._tile_atlases[tile_size] = atlas
+        return atlas
+
+    def _set_zoom(self, zoom_index):
+        zoom_index = max(0, min(zoom_index, len(config.CAMERA_ZOOM_TILE_SIZES) - 1))
+        if zoom_index == self.zoom_index:
+            return
+        self.zoom_index = zoom_index
+        self.camera.set_tile_size(config.CAMERA_ZOOM_TILE_SIZES[zoom_index])
+        if self._baked_level is not None:
+            player_pos = self.game_manager.get_player_position()
+            if player_pos is not None:
+                self.camera.center_on(*player_pos)
+            self._bake_map_layer()
+        self._needs_full_redraw = True
+
+    def _start_map(self):
+        self._map_terrain = self.game_manager.get_current_terrain() # tile character codes, see LevelData.terrain
+        map_height, map_width = self._map_terrain.shape
+        self.camera.set_map(map_width, map_height)
+        player_pos = self.game_manager.get_player_position()
+        if player_pos is not None:
+            self.camera.center_on(*player_pos)
+        self._drawn_visited = self._visited_destinations()
+        self._drawn_packages = self.game_manager.get_packages_remaining()
+        self._baked_level = self.game_manager.current_level_data
+        self._bake_map_layer()
+
+    def _bake_map_layer(self):
+        # Tiles never change during a level except destinations turning visited, so the ones in
+        # view are drawn into an off-screen layer that frames just blit. The whole layer is only
+        # redrawn for a new level or zoom; scrolling draws the tiles that came into view.
+        self._map_layer.fill(BACKGROUND_COLOR)
+        self._bake_tiles(*self.camera.visible_range())
+        self._rebuild_hint_layer()
+
+    def _bake_tiles(self, first_col, first_row, end_col, end_row):
+        # draws the tiles in [first, end) of the camera's visible range into the layer
+        atlas, areas, _ = self._tile_atlas(self.camera.tile_size)
+        size = self.camera.tile_size
+        origin_x, origin_y = self.camera.origin()
+        x0 = origin_x - self.camera.view_rect.x + first_col * size
+        y0 = origin_y - self.camera.view_rect.y + first_row * size
+
+        kinds = TILE_KIND_LUT[self._map_terrain[first_row:end_row, first_col:end_col]]
+        for col, row in self._drawn_visited:
+            if first_col <= col < end_col and first_row <= row < end_row:
+                kinds[row - first_row, col - first_col] = KIND_DEST_VISITED
+
+        self._map_layer.blits([(atlas, (x0 + c * size, y0 + r * size), areas[kind])
+                               for r, row_kinds in enumerate(kinds.tolist())
+                               for c, kind in enumerate(row_kinds)], doreturn=False)
+
+    def _scroll_map_layer(self, old_col, old_row):
+        # moves the baked tiles along with the camera and bakes only the strips it uncovered
+        d_col, d_row = self.camera.col - old_col, self.camera.row - old_row
+        view_cols, view_rows = self.camera.view_tiles()
+        if abs(d_col) >= view_cols or abs(d_row) >= view_rows:
+            self._bake_map_layer()
             return
 
-        dest_status_map = {tuple(d['pos']): d['visited'] for d in destinations_data}
-
-        for r_idx, row_str in enumerate(map_data): # map_data is list[str]
-            for c_idx, tile_char in enumerate(row_str):
-                screen_x = self.map_offset_x + (c_idx * TILE_SIZE)
-                screen_y = self.map_offset_y + (r_idx * TILE_SIZE)
-                rect = pygame.Rect(screen_x, screen_y, TILE_SIZE, TILE_SIZE)
-
-                texture_to_draw = None
-
-                color = ROAD_COLOR_1
-                if tile_char == config.WALL_TILE: 
-                    texture_to_draw = self.tile_textures[config.WALL_TILE]
-                elif tile_char == config.DESTINATION_TILE:
-                    is_visited = dest_status_map.get((c_idx, r_idx), False)
-                    texture_to_draw = self.tile_textures.get('DEST_VISITED') if is_visited else self.tile_textures.get('DEST_UNVISITED')
-                elif tile_char == config.ROAD_TILE_2: 
-                    # texture_to_draw = self.tile_textures.get(config.ROAD_TILE_2)
-                    color = ROAD_COLOR_2
-                elif tile_char == config.ROAD_TILE_3:
-                    color = ROAD_COLOR_3 
-                    # texture_to_draw = self.tile_textures.get(config.ROAD_TILE_3)
-                elif tile_char == config.START_TILE: color = START_COLOR
-                
-                if texture_to_draw:
-                    surface.blit(texture_to_draw, (screen_x, screen_y))
-                else:
-                    pygame.draw.rect(surface, color, rect)
-                
-                pygame.draw.rect(surface, (122,122,122), rect, 1) # Grid lines
-
-        player_screen_x = self.map_offset_x + (player_pos_col_row[0] * TILE_SIZE)
-        player_screen_y = self.map_offset_y + (player_pos_col_row[1] * TILE_SIZE)
-        player_rect = pygame.Rect(player_screen_x, player_screen_y, TILE_SIZE, TILE_SIZE)
-        surface.blit(self.player_texture, player_rect.topleft) 
-
-    def _draw_hint_path(self, surface):
-        hint_path = self.game_manager.get_active_hint_path() # Expects list of (col, row)
-        if not hint_path: return
-
-        for (col, row) in hint_path:
-            base_tile_screen_x = self.map_offset_x + (col * TILE_SIZE)
-            base_tile_screen_y = self.map_offset_y + (row * TILE_SIZE)
-            
-            tile_center_x = base_tile_screen_x + TILE_SIZE // 2
-            tile_center_y = base_tile_screen_y + TILE_SIZE // 2
-            
-            hint_marker_size = TILE_SIZE // 2
-            
-            blit_x = tile_center_x - hint_marker_size // 2
-            blit_y = tile_center_y - hint_marker_size // 2
-            
-            hint_surface = pygame.Surface((hint_marker_size, hint_marker_size), pygame.SRCALPHA)
-            hint_surface.fill(HINT_PATH_COLOR) 
-            surface.blit(hint_surface, (blit_x, blit_y))
-
-
-
-    def _draw_ui_overlay(self, surface):
-        fuel = self.game_manager.get_fuel()
-        battery = self.game_manager.get_battery()
-        packages = self.game_manager.get_packages_remaining()
-
-        fuel_text = self.font_ui.render(f"Fuel: {fuel}", True, (255, 255, 255))
-        battery_text = self.font_ui.render(f"Battery: {battery}", True, (255, 255, 255))
-        packages_text = self.font_ui.render(f"Packages: {packages}", True, (255, 255, 255))
-
-        surface.blit(fuel_text, (20, 620))
-        surface.blit(battery_text, (20, 650))
-        surface.blit(packages_text, (20, 680))
-
+        size = self.camera.tile_size
+        width, height = self._map_layer.get_size()
+        self._map_layer.scroll(-d_col * size, -d_row * size)
+        first_col, first_row, end_col, end_row = self.camera.visible_range()
+        origin_x, origin_y = self.camera.origin()
+        origin_x -= self.camera.view_rect.x
+        origin_y -= self.camera.view_rect.y
+        # a partly visible last column or row was cut off before, so it is drawn again too
+        strips = []
+        if d_col > 0:
+            first = max(first_col, end_col - d_col - 1)
+            strips.append(((first, first_row, end_col, end_row), (origin_x + first * size, 0, width, height)))
+        elif d_col < 0:
+            strips.append(((first_col, first_row, first_col - d_col, end_row), (0, 0, -d_col * size, height)))
+        if d_row > 0:
+            first = max(first_row, end_row - d_row - 1)
+            strips.append(((first_col, first, end_col, end_row), (0, origin_y + first * size, width, height)))
+        elif d_row < 0:
+            strips.append(((first_col, first_row, end_col, first_row - d_row), (0, 0, width, -d_row * size)))
+        for tiles, (left, top, right, bottom) in strips:
+            self._map_layer.fill(BACKGROUND_COLOR, pygame.Rect(left, top, right - left, bottom - top))
+            self._bake_tiles(*tiles)
+        self._rebuild_hint_layer()
+
+    def _draw_visited_tile(self, col, row):
+        first_col, first_row, end_col, end_row = self.camera.visible_range()
+        if first_col <= col < end_col and first_row <= row < end_row:
+            atlas, areas, _ = self._tile_atlas(self.camera.tile_size)
+            rect = self.camera.tile_rect(col, row).move(-self.camera.view_rect.x, -self.camera.view_rect.y)
+            self._map_layer.blit(atlas, rect, areas[KIND_DEST_VISITED])
+
+    def _visited_destinations(self):
+        return {tuple(d['pos']) for d in self.game_manager.get_destinations_data() if d['visited']}
+
+    def _draw_player(self, surface):
+        player_pos_col_row = self.game_manager.get_player_position() # (col, row)
+        player_texture = self._tile_atlas(self.camera.tile_size)[2]
+        if player_pos_col_row is not None and player_texture is not None:
+            surface.blit(player_texture, self.camera.tile_rect(*player_pos_col_row).topleft)
+
+    def _draw_hint_markers(self, start, end):
+        # draws markers start..end-1 of the hint path into the hint layer; returns their screen rects
+        size = self.camera.tile_size
+        marker_size = size // 2
+        first_col, first_row, end_col, end_row = self.camera.visible_range()
+        origin_x, origin_y = self.camera.origin()
+        offset = (size - marker_size) // 2 # centers the marker in its tile
+        rects = []
+        for (col, row) in self._drawn_hint[start:end]:
+            if not (first_col <= col < end_col and first_row <= row < end_row):
+                continue
+            rect = pygame.Rect(origin_x + col * size + offset, origin_y + row * size + offset, marker_size, marker_size)
+            # fill copies the colour's alpha into the layer; blending happens when the layer is blitted
+            self._hint_layer.fill(HINT_PATH_COLOR, rect.move(-self.camera.view_rect.x, -self.camera.view_rect.y))
+            rects.append(rect)
+        return rects
+
+    def _rebuild_hint_layer(self):
+        # markers are only drawn for tiles in view, so the layer is redrawn whenever the view changes
+        self._hint_layer.fill((0, 0, 0, 0))
+        if self._drawn_hint:
+            self._draw_hint_markers(0, self._hint_shown)
+
+    def _update_hud(self):
+        # re-renders HUD lines whose value changed; returns the screen areas they cover(ed)
         # Disable hint button if GM says hint cannot be used (e.g. no battery)
         # We assume GameManager's can_use_hint() is accurate based on current state
         # Player's can_use_hint() is for general state not specific to current game play state.
         self.hint_button.set_enabled(self.game_manager.can_use_hint() and self.game_manager.get_game_state() == config.GAME_STATE_PLAYING)
+
+        dirty = []
+        lines = (f"Fuel: {self.game_manager.get_fuel()}",
+                 f"Battery: {self.game_manager.get_battery()}",
+                 f"Packages: {self.game_manager.get_packages_remaining()}")
+        for i, (text, y) in enumerate(zip(lines, HUD_LINE_Y)):
+            old = self._hud_lines[i]
+            if old is not None and old[0] == text:
+                continue
+            text_surf = render_text(text, UI_FONT_SIZE, (255, 255, 255))
+            self._hud_lines[i] = (text, text_surf, text_surf.get_rect(topleft=(20, y)))
+            dirty.append(self._hud_lines[i][2] if old is None else self._hud_lines[i][2].union(old[2]))
+
+        for i, button in enumerate((self.hint_button, self.menu_button)):
+            look = (button.current_color, button.is_enabled, button.text)
+            if look != self._button_looks[i]:
+                self._button_looks[i] = look
+                dirty.append(button.rect)
+        return dirty
+
+    def _draw_ui_overlay(self, surface):
+        for line in self._hud_lines:
+            if line is not None:
+                surface.blit(line[1], line[2])
         self.hint_button.draw(surface)
         self.menu_button.draw(surface)
 
+    def _dialog_look(self):
+        if not self.active_dialog_key or not self.dialogs[self.active_dialog_key].is_active:
+            return None
+        dialog = self.dialogs[self.active_dialog_key]
+        return (self.active_dialog_key, dialog.message, tuple(button.current_color for button in dialog.buttons))
+
+    def _draw_loading(self, surface):
+        stage, fraction = self.game_manager.get_loading_progress()
+        center_x, center_y = self.screen_width // 2, self.screen_height // 2
+
+        title_surf = render_text(f"Loading Level {self.game_manager.current_level_id}...", LOADING_FONT_SIZE, (200,200,200))
+        surface.blit(title_surf, title_surf.get_rect(center=(center_x, center_y - 50)))
+
+        bar_rect = pygame.Rect(center_x - 200, center_y - 10, 400, 20)
+        fill_rect = bar_rect.copy()
+        fill_rect.width = int(bar_rect.width * max(0.0, min(1.0, fraction)))
+        pygame.draw.rect(surface, LOADING_BAR_COLOR, fill_rect)
+        pygame.draw.rect(surface, LOADING_BAR_BORDER_COLOR, bar_rect, 2)
+
+        stage_surf = render_text(stage, UI_FONT_SIZE, (200,200,200))
+        surface.blit(stage_surf, stage_surf.get_rect(center=(center_x, center_y + 40)))
+
+    def _find_dirty_rects(self):
+        # compares what is on screen with the game state and returns the areas to redraw
+        dirty = []
+        view = self.camera.view_rect
+
+        if self.game_manager.get_packages_remaining() != self._drawn_packages:
+            self._drawn_packages = self.game_manager.get_packages_remaining()
+            visited = self._visited_destinations()
+            for col, row in visited - self._drawn_visited:
+                self._draw_visited_tile(col, row)
+                dirty.append(self.camera.tile_rect(col, row))
+            self._drawn_visited = visited
+
+        player_pos = self.game_manager.get_player_position()
+        if player_pos != self._drawn_player:
+            old_col, old_row = self.camera.col, self.camera.row
+            if player_pos is not None and self.camera.follow(*player_pos):
+                self._scroll_map_layer(old_col, old_row)
+                dirty.append(view)
+            else:
+                if self._drawn_player is not None:
+                    dirty.append(self.camera.tile_rect(*self._drawn_player))
+                if player_pos is not None:
+                    dirty.append(self.camera.tile_rect(*player_pos))
+            self._drawn_player = player_pos
+
+        hint_path = self.game_manager.get_active_hint_path()
+        if hint_path is not self._drawn_hint:
+            old_path = self._drawn_hint[:self._hint_shown] if self._drawn_hint else None
+            if old_path:
+                # only the part of the path in view can have been drawn
+                bounds = self.camera.tile_rect(*old_path[0]).unionall([self.camera.tile_rect(*tile) for tile in old_path[1:]])
+                if bounds.colliderect(view):
+                    dirty.append(bounds.clip(view))
+            self._drawn_hint = hint_path
+            self._hint_layer.fill((0, 0, 0, 0))
+            self._hint_shown = 0
+            self._hint_progress = 0.0 if config.HINT_REVEAL_TILES_PER_SECOND > 0 else float(len(hint_path or ()))
+
+        if self._drawn_hint:
+            # markers the reveal animation has reached since the last frame
+            shown = min(len(self._drawn_hint), int(self._hint_progress))
+            if shown > self._hint_shown:
+                rects = self._draw_hint_markers(self._hint_shown, shown)
+                self._hint_shown = shown
+                if rects:
+                    dirty.append(rects[0].unionall(rects[1:]).clip(view))
+
+        dirty.extend(self._update_hud())
+
+        dialog_look = self._dialog_look()
+        if dialog_look != self._drawn_dialog:
+            for look in (self._drawn_dialog, dialog_look):
+                if look is not None:
+                    dirty.append(self.dialogs[look[0]].rect)
+            self._drawn_dialog = dialog_look
+
+        screen_rect = pygame.Rect(0, 0, self.screen_width, self.screen_height)
+        return [rect.clip(screen_rect) for rect in dirty if rect.colliderect(screen_rect)]
+
+    def _draw_scene(self, surface):
+        surface.fill(BACKGROUND_COLOR)
+        surface.blit(self._map_layer, self.camera.view_rect.topleft)
+
+        # map overlays stay inside the map view
+        clip = surface.get_clip()
+        surface.set_clip(clip.clip(self.camera.view_rect))
+        if self._hint_shown:
+            surface.blit(self._hint_layer, self.camera.view_rect.topleft)
+        self._draw_player(surface)
+        surface.set_clip(clip)
+
+        self._draw_ui_overlay(surface)
 
-    def render(self, surface):
-        surface.fill((30, 30, 40))  # Dark background
+        # Render active dialog on top
+        if self.active_dialog_key and self.dialogs[self.active_dialog_key].is_active:
+            self.dialogs[self.active_dialog_key].draw(surface)
 
-        if self.game_manager.is_level_loaded: # Only draw map if level is actually loaded
-            self._draw_map(surface)
-            self._draw_hint_path(surface)
-        else:
+    def render(self, surface):
+        # returns the changed screen areas for pygame.display.update, or None when all of it changed
+        if self.game_manager.is_loading():
+            surface.fill(BACKGROUND_COLOR)
+            self._draw_loading(surface)
+            self._needs_full_redraw = True
+            return None
+
+        if not self.game_manager.is_level_loaded or self.game_manager.get_current_terrain() is None:
+            surface.fill(BACKGROUND_COLOR)
             # Optionally, display a "Loading..." or "Level Failed to Load" message
-            font = pygame.font.Font(None, 50)
-            text_surf = font.render("No Level Loaded. Select from Main Menu.", True, (200,200,0))
+            text_surf = render_text("No Level Loaded. Select from Main Menu.", LOADING_FONT_SIZE, (200,200,0))
             text_rect = text_surf.get_rect(center=(self.screen_width//2, self.screen_height//2))
             surface.blit(text_surf, text_rect)
-
-
-        self._draw_ui_overlay(surface) # Always draw UI like buttons and stats
-
-        # Render active dialog on top
-        if self.active_dialog_key and self.dialogs[self.active_dialog_key].is_active:
-            self.dialogs[self.active_dialog_key].draw(surface)
\ No newline at end of file
+            self._update_hud()
+            self._draw_ui_overlay(surface) # Always draw UI like buttons and stats
+            if self.active_dialog_key and self.dialogs[self.active_dialog_key].is_active:
+                self.dialogs[self.active_dialog_key].draw(surface)
+            self._needs_full_redraw = True
+            return None
+
+        if self._baked_level is not self.game_manager.current_level_data:
+            self._start_map()
+            self._needs_full_redraw = True
+
+        dirty = self._find_dirty_rects()
+        if self._needs_full_redraw:
+            self._needs_full_redraw = False
+            self._draw_scene(surface)
+            return None
+
+        for rect in dirty:
+            surface.set_clip(rect)
+            self._draw_scene(surface)
+        surface.set_clip(None)
+        return dirty
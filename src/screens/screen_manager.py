@@ -1,8 +1,10 @@
-import pygame
+from ui_elements.text_cache import render_text
 
 class ScreenManager:
     def __init__(self):
-        self.screens = {}  
+        self.screens = {}  # screens built so far
+        self.screen_factories = {} # screens not built yet: name -> callable returning the screen
+        self.likely_next = {} # name -> screens worth building ahead while that one is shown
         self.current_screen_name = None
         self.current_screen = None
 
@@ -10,13 +12,36 @@ class ScreenManager:
         self.screens[screen_name] = screen_instance
         screen_instance.manager = self 
 
+    def add_screen_factory(self, screen_name, factory, likely_next=()):
+        # the screen is built by factory() on the first go_to_screen to it, or ahead of that by
+        # prewarm_next() while one of the screens naming it in likely_next is shown
+        self.screen_factories[screen_name] = factory
+        self.likely_next[screen_name] = list(likely_next)
+
+    def get_screen(self, screen_name):
+        # the named screen, built now if it was only registered as a factory; None if unknown
+        if screen_name not in self.screens and screen_name in self.screen_factories:
+            self.add_screen(screen_name, self.screen_factories.pop(screen_name)())
+            print(f"[ScreenManager] Built {screen_name}")
+        return self.screens.get(screen_name)
+
+    def prewarm_next(self):
+        # builds one not yet built screen the current one is likely to lead to; meant for
+        # frames with time to spare. Returns True if it built one.
+        for screen_name in self.likely_next.get(self.current_screen_name, ()):
+            if screen_name in self.screen_factories:
+                self.get_screen(screen_name)
+                return True
+        return False
+
     def go_to_screen(self, screen_name, **kwargs):
         if self.current_screen:
             self.current_screen.on_exit()
 
-        if screen_name in self.screens:
+        screen = self.get_screen(screen_name)
+        if screen is not None:
             self.current_screen_name = screen_name
-            self.current_screen = self.screens[screen_name]
+            self.current_screen = screen
             self.current_screen.on_enter(**kwargs) 
             print(f"[ScreenManager] Transitioned to {screen_name}")
         else:
@@ -33,12 +58,11 @@ class ScreenManager:
             self.current_screen.update(dt)
 
     def render(self, surface):
-        """Renders the current active screen."""
+        """Renders the current active screen. Returns the changed areas, or None if all of it changed."""
         if self.current_screen:
-            self.current_screen.render(surface)
+            return self.current_screen.render(surface)
         else:
             surface.fill((0, 0, 0))
-            font = pygame.font.Font(None, 36)
-            text_surf = font.render("No active screen", True, (255, 0, 0))
+            text_surf = render_text("No active screen", 36, (255, 0, 0))
             text_rect = text_surf.get_rect(center=(surface.get_width()//2, surface.get_height()//2))
             surface.blit(text_surf, text_rect)
\ No newline at end of file
@@ -1,33 +1,16 @@
-import pygame
 from screens.base_screen import BaseScreen
 from ui_elements.button import Button 
 from ui_elements.dialog import Dialog   
+from ui_elements.text_cache import render_text
+
+INFO_FONT_SIZE = 28
 
 class SettingsScreen(BaseScreen):
     def __init__(self, game_manager_ref=None): 
         super().__init__()
         self.game_manager = game_manager_ref 
-        self.font = pygame.font.Font(None, 48)
-        self.info_font = pygame.font.Font(None, 28)
         self.reset_feedback_message = ""
 
-        try:
-            self.settings_image = pygame.image.load("assets/images/backgrounds/settings.png").convert_alpha()
-            self.settings_image = pygame.transform.scale(self.settings_image, (self.screen_width, self.screen_height))
-
-            self.image_rect = self.settings_image.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
-
-        except pygame.error as e:
-            print(f"Error loading settings image: {e}")
-            self.settings_image = pygame.Surface((self.screen_width - 100, self.screen_height - 200))
-            self.settings_image.fill((100, 100, 100))
-            error_font = pygame.font.Font(None, 36)
-            error_text = error_font.render("Settings Image Not Found!", True, (255, 0, 0))
-            error_rect = error_text.get_rect(center=(self.settings_image.get_width()//2, self.settings_image.get_height()//2))
-            self.settings_image.blit(error_text, error_rect)
-            self.image_rect = self.settings_image.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
-
-
         # --- Callbacks ---
         def reset_progress_action():
             self.confirmation_dialog.message = "Really reset all progress? This cannot be undone."
@@ -92,7 +75,7 @@ class SettingsScreen(BaseScreen):
         surface.fill((70, 70, 100))  
 
         # Screen Title
-        surface.blit(self.settings_image, self.image_rect)
+        surface.blit(*self.background("backgrounds/settings.png", "Settings"))
 
         # Render buttons
         for button in self.buttons:
@@ -100,7 +83,7 @@ class SettingsScreen(BaseScreen):
         
         # Render feedback message
         if self.reset_feedback_message:
-            feedback_surf = self.info_font.render(self.reset_feedback_message, True, (200, 255, 200))
+            feedback_surf = render_text(self.reset_feedback_message, INFO_FONT_SIZE, (200, 255, 200))
             feedback_rect = feedback_surf.get_rect(center=(self.screen_width // 2, self.reset_button.rect.bottom + 40))
             surface.blit(feedback_surf, feedback_rect)
 
@@ -1,4 +1,3 @@
-import pygame
 from screens.base_screen import BaseScreen
 from ui_elements.button import Button 
 
@@ -6,20 +5,6 @@ class TutorialScreen(BaseScreen):
     def __init__(self):
         super().__init__()
         self.background_color = (60, 80, 60) 
-        try:
-            self.tutorial_image = pygame.image.load("assets/images/backgrounds/tutorial.png").convert_alpha()
-            self.tutorial_image = pygame.transform.scale(self.tutorial_image, (self.screen_width, self.screen_height))
-            self.image_rect = self.tutorial_image.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
-
-        except pygame.error as e:
-            print(f"Error loading tutorial image: {e}")
-            self.tutorial_image = pygame.Surface((self.screen_width - 100, self.screen_height - 200))
-            self.tutorial_image.fill((100, 100, 100))
-            error_font = pygame.font.Font(None, 36)
-            error_text = error_font.render("Tutorial Image Not Found!", True, (255, 0, 0))
-            error_rect = error_text.get_rect(center=(self.tutorial_image.get_width()//2, self.tutorial_image.get_height()//2))
-            self.tutorial_image.blit(error_text, error_rect)
-            self.image_rect = self.tutorial_image.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
 
 
         # --- Back Button ---
@@ -45,6 +30,6 @@ class TutorialScreen(BaseScreen):
     def render(self, surface):
         surface.fill(self.background_color)
 
-        surface.blit(self.tutorial_image, self.image_rect)
+        surface.blit(*self.background("backgrounds/tutorial.png", "Tutorial"))
 
         self.back_button.draw(surface)
\ No newline at end of file
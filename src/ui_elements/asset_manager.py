@@ -0,0 +1,126 @@
+import os
+import threading
+import pygame
+
+# Images shared by every screen. Each file is decoded once, and each size it is drawn at is
+# scaled once, no matter how many screens ask for it. Tile images are packed side by side
+# into one atlas surface, and each tile size gets its own scaled copy of the atlas.
+# warm() does the decoding and scaling on a background thread ahead of the first screen
+# that needs it. Surfaces handed out are shared: blit them, never draw onto them.
+
+IMAGE_DIRECTORY = "assets/images"
+# atlas slot name -> image file, relative to IMAGE_DIRECTORY
+TILE_IMAGES = {
+    "wall": "tiles/wall.png",
+    "unvisited": "tiles/unvisited.png",
+    "visited": "tiles/visited.png",
+    "player": "player/player.png",
+}
+
+class AssetManager:
+    def __init__(self, directory=IMAGE_DIRECTORY, tile_images=TILE_IMAGES):
+        self.directory = directory
+        self.tile_images = tile_images
+        self._images = {} # path -> decoded surface
+        self._scaled = {} # (path, size) -> scaled surface
+        self._tile_sheets = {} # tile size or None for native -> (atlas surface, {name: area})
+        self._lock = threading.RLock() # one decode or scale at a time, so no work is done twice
+        self.stats = {"loads": 0, "scales": 0, "hits": 0}
+
+    def image(self, path) -> pygame.Surface:
+        # the image at path (relative to the image directory) as decoded from disk; raises
+        # pygame.error or FileNotFoundError when it cannot be read, and tries again next call
+        with self._lock:
+            image = self._images.get(path)
+            if image is not None:
+                self.stats["hits"] += 1
+                return image
+            image = pygame.image.load(os.path.join(self.directory, path))
+            if pygame.display.get_surface() is not None: # converting needs a display mode
+                image = image.convert_alpha()
+            self.stats["loads"] += 1
+            self._images[path] = image
+            return image
+
+    def scaled(self, path, size) -> pygame.Surface:
+        size = tuple(size)
+        with self._lock:
+            image = self._scaled.get((path, size))
+            if image is not None:
+                self.stats["hits"] += 1
+                return image
+            image = self.image(path)
+            if image.get_size() != size:
+                image = pygame.transform.scale(image, size)
+                self.stats["scales"] += 1
+            self._scaled[(path, size)] = image
+            return image
+
+    def tile_sheet(self, tile_size=None) -> tuple[pygame.Surface, dict[str, pygame.Rect]]:
+        # every tile image in one surface at tile_size square, or at native size for None;
+        # tiles that fail to load are left out of the areas
+        with self._lock:
+            sheet = self._tile_sheets.get(tile_size)
+            if sheet is not None:
+                self.stats["hits"] += 1
+                return sheet
+            if tile_size is None:
+                sheet = self._pack_native_tiles()
+            else:
+                native, native_areas = self.tile_sheet(None)
+                surface = pygame.Surface((max(1, tile_size * len(native_areas)), tile_size), pygame.SRCALPHA, native)
+                areas = {}
+                for i, (name, area) in enumerate(native_areas.items()):
+                    areas[name] = pygame.Rect(i * tile_size, 0, tile_size, tile_size)
+                    pygame.transform.scale(native.subsurface(area), areas[name].size, surface.subsurface(areas[name]))
+                self.stats["scales"] += 1
+                sheet = (surface, areas)
+            self._tile_sheets[tile_size] = sheet
+            return sheet
+
+    def _pack_native_tiles(self):
+        images = {}
+        for name, path in self.tile_images.items():
+            try:
+                images[name] = self.image(path)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"[AssetManager] Error loading tile image {path}: {e}")
+        width = sum(image.get_width() for image in images.values())
+        height = max((image.get_height() for image in images.values()), default=1)
+        if images: # same pixel format as the images, so they can be copied in as they are
+            surface = pygame.Surface((width, height), pygame.SRCALPHA, next(iter(images.values())))
+        else:
+            surface = pygame.Surface((1, 1), pygame.SRCALPHA)
+        areas = {}
+        x = 0
+        for name, image in images.items():
+            areas[name] = pygame.Rect((x, 0), image.get_size())
+            # scaling to the same size into the atlas copies the pixels, alpha included, without blending
+            pygame.transform.scale(image, image.get_size(), surface.subsurface(areas[name]))
+            x += image.get_width()
+        return surface, areas
+
+    def warm(self, images=(), tile_sizes=()) -> threading.Thread:
+        # decodes and scales ahead of time on a daemon thread; images are (path, size or None)
+        def work():
+            for path, size in images:
+                try:
+                    if size is None:
+                        self.image(path)
+                    else:
+                        self.scaled(path, size)
+                except (pygame.error, FileNotFoundError):
+                    pass # reported by the screen that asks for it
+            for tile_size in tile_sizes:
+                self.tile_sheet(tile_size)
+        thread = threading.Thread(target=work, name="asset-warm", daemon=True)
+        thread.start()
+        return thread
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+            self._scaled.clear()
+            self._tile_sheets.clear()
+
+assets = AssetManager()
@@ -1,4 +1,5 @@
 import pygame
+from ui_elements.text_cache import render_text, text_cache
 
 pygame.font.init() 
 
@@ -15,7 +16,9 @@ class Button:
                  is_enabled=True):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
-        self.font = pygame.font.Font(font_name, font_size)
+        self.font_name = font_name
+        self.font_size = font_size
+        self.font = text_cache.font(font_name, font_size)
         self.text_color = text_color
         self.normal_color = normal_color
         self.hover_color = hover_color
@@ -87,7 +90,7 @@ class Button:
             pygame.draw.rect(surface, (0,0,0), self.rect, 2) 
 
         if self.text:
-            text_surface = self.font.render(self.text, True, self.text_color)
+            text_surface = render_text(self.text, self.font_size, self.text_color, self.font_name)
             text_rect = text_surface.get_rect(center=self.rect.center)
             surface.blit(text_surface, text_rect)
 
@@ -1,5 +1,6 @@
 import pygame
 from ui_elements.button import Button 
+from ui_elements.text_cache import render_text, text_cache
 
 pygame.font.init()
 
@@ -12,7 +13,9 @@ class Dialog:
                  button_font_size=24):
         self.rect = pygame.Rect(x, y, width, height)
         self.message = message
-        self.font = pygame.font.Font(font_name, font_size)
+        self.font_name = font_name
+        self.font_size = font_size
+        self.font = text_cache.font(font_name, font_size)
         self.text_color = text_color
         self.bg_color = bg_color
         self.border_color = border_color
@@ -69,7 +72,7 @@ class Dialog:
         pygame.draw.rect(surface, self.bg_color, self.rect)
         pygame.draw.rect(surface, self.border_color, self.rect, 3) 
 
-        text_surface = self.font.render(self.message, True, self.text_color)
+        text_surface = render_text(self.message, self.font_size, self.text_color, self.font_name)
         message_rect_center_y = self.rect.top + (self.rect.height - (self.buttons[0].rect.height if self.buttons else 0) - 20) / 2
         text_rect = text_surface.get_rect(center=(self.rect.centerx, message_rect_center_y))
         surface.blit(text_surface, text_rect)
@@ -0,0 +1,52 @@
+import pygame
+from collections import OrderedDict
+from config import Configurations
+
+pygame.font.init()
+
+config = Configurations()
+
+# Rendered text shared by every screen and widget. Labels and HUD values rarely change from
+# one frame to the next, so a surface is rasterized once per (font, size, text, colour,
+# antialias) and reused until it falls out of the least recently used TEXT_CACHE_SIZE.
+# Surfaces handed out are shared: blit them, never draw onto them.
+
+class TextCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries # 0 turns caching off
+        self._fonts = {}
+        self._surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def font(self, name, size) -> pygame.font.Font:
+        # one Font per (file name or None for the default font, size)
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = pygame.font.Font(name, size)
+        return font
+
+    def render(self, text, size, color, name=None, antialias=True) -> pygame.Surface:
+        key = (name, size, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.stats["hits"] += 1
+            return surface
+
+        self.stats["misses"] += 1
+        surface = self.font(name, size).render(text, antialias, color)
+        if self.max_entries > 0:
+            self._surfaces[key] = surface
+            while len(self._surfaces) > self.max_entries:
+                self._surfaces.popitem(last=False)
+                self.stats["evictions"] += 1
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+text_cache = TextCache(config.TEXT_CACHE_SIZE)
+
+def render_text(text, size, color, name=None, antialias=True) -> pygame.Surface:
+    return text_cache.render(text, size, color, name, antialias)